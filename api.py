@@ -3,18 +3,43 @@
 FastAPI REST API for SpaCy Mood Detective
 """
 
-from fastapi import FastAPI, HTTPException
+from fastapi import FastAPI, HTTPException, Query, Request, WebSocket, WebSocketDisconnect
 from fastapi.middleware.cors import CORSMiddleware
-from pydantic import BaseModel
-from typing import List, Dict, Any
-import spacy
-from mood_detector import create_mood_detector
+from fastapi.middleware.gzip import GZipMiddleware
+from fastapi.responses import PlainTextResponse, Response, StreamingResponse
+from pydantic import BaseModel, Field
+from starlette.concurrency import run_in_threadpool
+from starlette.requests import ClientDisconnect
+from typing import List, Dict, Any, Literal, Optional, Tuple
+import asyncio
+import json
+import os
+import time
+from contextlib import asynccontextmanager
+from functools import partial
+from mood_detector import load_pipeline, MoodEngine, metrics
+from mood_detector.batching import MicroBatcher
+from mood_detector.cache import cache_from_env
+from mood_detector.dedup import DedupCounter, Deduplicated
+from mood_detector.encoding import dumps_json, encode, negotiate
+from mood_detector.longdoc import DEFAULT_CHUNK_CHARS, analyze_long
+from mood_detector.pipeline import RESULT_FIELDS, SharedMemoryZone, instrument_pipeline, pipe_results
+from mood_detector.result import MoodResult
+from mood_detector.workers import WorkerPool, PoolSaturated
+
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    yield
+    pool.shutdown(wait=False)
+
 
 # Initialize FastAPI app
 app = FastAPI(
     title="SpaCy Mood Detective API",
     description="An NLP API that detects emotional chaos in text",
-    version="1.0.0"
+    version="1.0.0",
+    lifespan=lifespan,
 )
 
 # CORS middleware
@@ -26,19 +51,80 @@ app.add_middleware(
     allow_headers=["*"],
 )
 
-# Load spaCy model
-try:
-    nlp = spacy.load("en_core_web_sm")
-except OSError:
-    raise RuntimeError("spaCy model 'en_core_web_sm' not found. Run: python -m spacy download en_core_web_sm")
+# Responses of at least MOOD_GZIP_MIN_BYTES are gzipped for clients that
+# send Accept-Encoding: gzip. Level 1 gets most of level 9's size reduction
+# in a fraction of its time (benchmarks/bench_serialization.py).
+GZIP_MIN_BYTES = int(os.environ.get("MOOD_GZIP_MIN_BYTES", "1024"))
+GZIP_LEVEL = int(os.environ.get("MOOD_GZIP_LEVEL", "1"))
+app.add_middleware(GZipMiddleware, minimum_size=GZIP_MIN_BYTES, compresslevel=GZIP_LEVEL)
+
+# Analysis engine ("spacy" pipeline or the spaCy-free "fast" engine)
+ENGINE = os.environ.get("MOOD_ENGINE", "spacy")
+
+# Load spaCy pipeline ("lite" = tokenizer only, "full" = en_core_web_sm)
+PIPELINE_MODE = os.environ.get("MOOD_PIPELINE_MODE", "lite")
+
+# nlp.pipe settings for batch endpoints; requests may override the batch size
+BATCH_SIZE = int(os.environ.get("MOOD_BATCH_SIZE", "256"))
+N_PROCESS = int(os.environ.get("MOOD_N_PROCESS", "1"))
+
+# /analyze/stream: texts per pipeline chunk and the longest accepted line
+STREAM_CHUNK_SIZE = int(os.environ.get("MOOD_STREAM_CHUNK", "64"))
+MAX_LINE_BYTES = 1024 * 1024
+
+# /ws/analyze: messages a connection may have in flight before the server
+# stops reading from it
+WS_MAX_PENDING = int(os.environ.get("MOOD_WS_MAX_PENDING", "64"))
+
+if ENGINE == "fast":
+    nlp = None
+    engine = MoodEngine()
+else:
+    try:
+        # Per-component timings are only taken when MOOD_TIMING=1. With
+        # MOOD_N_PROCESS > 1 the attributes are computed eagerly so the work
+        # happens in the nlp.pipe worker processes.
+        nlp = instrument_pipeline(load_pipeline(PIPELINE_MODE, lazy=N_PROCESS <= 1))
+    except OSError:
+        raise RuntimeError("spaCy model 'en_core_web_sm' not found. Run: python -m spacy download en_core_web_sm")
+    engine = None
+
+# Worker threads share the pipeline, and memory zones are per vocab: they
+# all join one zone, which closes when the last of them leaves
+nlp_zone = SharedMemoryZone(nlp) if nlp is not None else None
+
+# Repeated texts are served from the result cache (MOOD_CACHE_SIZE=0 disables it)
+cache = cache_from_env()
+
+# Inference runs in a bounded worker pool so the event loop stays free
+pool = WorkerPool(
+    kind=os.environ.get("MOOD_WORKER_KIND", "thread"),
+    max_workers=int(os.environ.get("MOOD_WORKERS", "4")),
+    max_queue=int(os.environ.get("MOOD_MAX_QUEUE", "64")),
+    timeout=float(os.environ.get("MOOD_REQUEST_TIMEOUT", "30")),
+)
+
+
+# Prometheus metrics served on /metrics
+REQUESTS = metrics.CounterVec(("path", "method", "status"))
+ERRORS = metrics.CounterVec(("path", "status"))
+REQUEST_SECONDS = metrics.HistogramVec(("path",), metrics.LATENCY_BUCKETS)
+DOC_LENGTH = metrics.HistogramVec((), metrics.LENGTH_BUCKETS)
+DEDUP = DedupCounter()
+
+
+# Result fields a client can ask for; the others are not computed
+ResultField = Literal["mood", "vibe_score", "emotional_triggers", "emotional_spans"]
+FieldSet = Optional[Tuple[str, ...]]
 
-if "mood_detector" not in nlp.pipe_names:
-    nlp.add_pipe("mood_detector", last=True)
+# How batch texts are deduplicated before inference (see mood_detector.dedup)
+DedupMode = Literal["off", "exact", "normalized"]
 
 
 # Request/Response models
 class TextRequest(BaseModel):
     text: str
+    fields: Optional[List[ResultField]] = None
 
 
 class Trigger(BaseModel):
@@ -46,21 +132,264 @@ class Trigger(BaseModel):
     type: str
 
 
+# The response models document the API; responses are serialized straight
+# from MoodResult offsets without building them
 class MoodResponse(BaseModel):
+    # Fields the request left out are not in the JSON
     text: str
-    mood: str
-    vibe_score: int
-    emotional_triggers: List[Trigger]
-    emotional_spans: List[Dict[str, Any]]
+    mood: Optional[str] = None
+    vibe_score: Optional[int] = None
+    emotional_triggers: Optional[List[Trigger]] = None
+    emotional_spans: Optional[List[Dict[str, Any]]] = None
 
 
 class BatchTextRequest(BaseModel):
     texts: List[str]
+    batch_size: Optional[int] = Field(default=None, ge=1, le=10_000)
+    fields: Optional[List[ResultField]] = None
+    dedup: DedupMode = "exact"
 
 
 class BatchMoodResponse(BaseModel):
     results: List[MoodResponse]
     total_analyzed: int
+    unique_analyzed: int
+    dedup_ratio: float
+
+
+class LongTextRequest(BaseModel):
+    text: str
+    chunk_chars: Optional[int] = Field(default=None, ge=100, le=100_000)
+
+
+class ChunkMood(BaseModel):
+    start: int
+    end: int
+    mood: str
+    vibe_score: int
+
+
+class LongMoodResponse(BaseModel):
+    length: int
+    mood: str
+    vibe_score: int
+    label_counts: Dict[str, int]
+    chunks: List[ChunkMood]
+
+
+def field_set(fields: Optional[List[str]]) -> FieldSet:
+    """Canonical form of a request's ``fields``: None means every field."""
+    if not fields or set(fields) >= set(RESULT_FIELDS):
+        return None
+    return tuple(field for field in RESULT_FIELDS if field in fields)
+
+
+def analyze_many(
+    texts: List[str], batch_size: Optional[int] = None, fields: FieldSet = None
+) -> List[MoodResult]:
+    """Analyze texts in order into MoodResults, batching them through ``nlp.pipe``."""
+    if engine is not None:
+        return list(engine.analyze_results(texts, fields))
+    
+    results = pipe_results(
+        nlp, texts, batch_size or BATCH_SIZE, N_PROCESS, fields, compact=True, memory_zone=nlp_zone
+    )
+    results = list(results)
+    # Keep the caller's string (the Doc rebuilds an equal one)
+    for text, result in zip(texts, results):
+        result.text = text
+    return results
+
+
+def analyze_document(text: str, chunk_chars: Optional[int] = None) -> Dict[str, Any]:
+    """Chunk-by-chunk timeline and aggregate mood for a long text."""
+    chunk_chars = chunk_chars or DEFAULT_CHUNK_CHARS
+    if engine is not None:
+        return analyze_long(text, engine, chunk_chars)
+    return analyze_long(text, nlp, chunk_chars, memory_zone=nlp_zone)
+
+
+async def run_in_pool(fn, *args):
+    """Run inference in the worker pool, mapping pool errors to HTTP errors."""
+    try:
+        return await pool.run(fn, *args)
+    except PoolSaturated:
+        raise HTTPException(
+            status_code=503,
+            detail="Server busy, try again later",
+            headers={"Retry-After": "1"},
+        )
+    except asyncio.TimeoutError:
+        raise HTTPException(status_code=504, detail="Analysis timed out")
+
+
+async def in_cache(fn, *args):
+    """Call a cache method, in a thread when it may query the SQLite store (MOOD_CACHE_DB)."""
+    if cache.store is None:
+        return fn(*args)
+    return await run_in_threadpool(fn, *args)
+
+
+def store_results(texts: List[str], results: List[MoodResult]) -> None:
+    for text, result in zip(texts, results):
+        cache.put(text, result)
+
+
+async def compute_texts(
+    texts: List[str], batch_size: Optional[int] = None, fields: FieldSet = None
+) -> List[MoodResult]:
+    """Analyze texts in the worker pool and store full results in the cache."""
+    results = await run_in_pool(analyze_many, texts, batch_size, fields)
+    # Partial results can't answer later requests for other fields
+    if cache is not None and fields is None:
+        await in_cache(store_results, texts, results)
+    return results
+
+
+async def analyze_texts(
+    texts: List[str], batch_size: Optional[int] = None, fields: FieldSet = None
+) -> list:
+    """Analyze texts in order, computing only the ones missing from the cache.
+    
+    Cache hits are full results; ``to_response`` trims them to ``fields``.
+    """
+    if cache is None:
+        return await compute_texts(texts, batch_size, fields)
+    
+    results, missing = await in_cache(cache.partition, texts)
+    if missing:
+        computed = await compute_texts([texts[i] for i in missing], batch_size, fields)
+        for i, result in zip(missing, computed):
+            results[i] = result
+    return results
+
+
+async def analyze_deduplicated(
+    texts: List[str], batch_size: Optional[int] = None, fields: FieldSet = None, mode: str = "exact"
+) -> Tuple[List[Dict[str, Any]], Deduplicated]:
+    """Responses for ``texts`` in order, analyzing each distinct text once."""
+    batch = Deduplicated(texts, mode)
+    results = await analyze_texts(batch.unique, batch_size, fields)
+    DEDUP.add(batch)
+    return batch.expand_dicts([to_response(result, fields) for result in results]), batch
+
+
+# Concurrent /analyze calls are grouped into one nlp.pipe batch;
+# MOOD_MAX_BATCH=1 turns micro-batching off
+MAX_BATCH = int(os.environ.get("MOOD_MAX_BATCH", "32"))
+BATCH_WINDOW = float(os.environ.get("MOOD_BATCH_WINDOW_MS", "5")) / 1000
+batcher = MicroBatcher(compute_texts, max_batch_size=MAX_BATCH, max_wait=BATCH_WINDOW)
+
+# Requests for a subset of fields are batched separately, one batcher per subset
+field_batchers: Dict[Tuple[str, ...], MicroBatcher] = {}
+
+
+def get_batcher(fields: FieldSet) -> MicroBatcher:
+    if fields is None:
+        return batcher
+    if fields not in field_batchers:
+        process = partial(compute_texts, fields=fields)
+        field_batchers[fields] = MicroBatcher(process, max_batch_size=MAX_BATCH, max_wait=BATCH_WINDOW)
+    return field_batchers[fields]
+
+
+async def score_text(text: str, fields: FieldSet = None):
+    """One text's result from the cache, or from the next micro-batch."""
+    result = await in_cache(cache.get, text) if cache is not None else None
+    if result is None:
+        result = await get_batcher(fields).submit(text)
+    return result
+
+
+class BodyStreamingResponse(StreamingResponse):
+    """
+    StreamingResponse whose body iterator reads the request body itself.
+    
+    Starlette's StreamingResponse polls receive() for disconnects while
+    streaming, which would swallow request body chunks; here the iterator
+    is the only reader and a disconnect surfaces as ClientDisconnect.
+    """
+    
+    async def __call__(self, scope, receive, send):
+        try:
+            await self.stream_response(send)
+        except OSError:
+            raise ClientDisconnect()
+
+
+async def iter_lines(request: Request):
+    """Yield (line number, line) from the request body as it arrives."""
+    buffer = b""
+    line_no = 0
+    async for chunk in request.stream():
+        buffer += chunk
+        *lines, buffer = buffer.split(b"\n")
+        for line in lines:
+            line_no += 1
+            yield line_no, line
+        if len(buffer) > MAX_LINE_BYTES:
+            raise ValueError(f"line {line_no + 1} is longer than {MAX_LINE_BYTES} bytes")
+    if buffer:
+        yield line_no + 1, buffer
+
+
+def parse_stream_line(line: bytes) -> str:
+    """Read the text out of one NDJSON line: a JSON string or {"text": ...}."""
+    value = json.loads(line)
+    if isinstance(value, dict):
+        value = value.get("text")
+    if not isinstance(value, str):
+        raise ValueError('expected a JSON string or an object with a "text" field')
+    return value
+
+
+def to_response(result, fields: FieldSet = None) -> Dict[str, Any]:
+    """Serialize a MoodResult (or a result dict from the SQLite store) for the response."""
+    DOC_LENGTH.labels().observe(len(result.text if isinstance(result, MoodResult) else result["text"]))
+    if isinstance(result, MoodResult):
+        return result.to_json_dict(fields)
+    
+    response = {key: result[key] for key in ("text",) + (fields or RESULT_FIELDS)}
+    if "emotional_spans" in response:
+        response["emotional_spans"] = [
+            {"text": span[0], "label": span[1]}
+            for span in response["emotional_spans"]
+        ]
+    return response
+
+
+def dump_json(content: Any) -> str:
+    # Same encoding as JSONResponse
+    return dumps_json(content).decode("utf-8")
+
+
+def respond(request: Request, content: Any) -> Response:
+    """Encode ``content`` as the client's ``Accept`` header asks: JSON, or msgpack on request.
+    
+    Results are built internally, so they go straight to the encoder
+    without ``response_model`` validation.
+    """
+    media_type = negotiate(request.headers.get("accept"))
+    return Response(encode(content, media_type), media_type=media_type, headers={"Vary": "Accept"})
+
+
+@app.middleware("http")
+async def record_request_metrics(request: Request, call_next):
+    """Count requests and errors and time them, per route."""
+    start = time.perf_counter()
+    status = 500
+    try:
+        response = await call_next(request)
+        status = response.status_code
+        return response
+    finally:
+        # Label by route template so unknown URLs can't blow up cardinality
+        route = request.scope.get("route")
+        path = route.path if route is not None else "unmatched"
+        REQUESTS.inc(path, request.method, str(status))
+        REQUEST_SECONDS.labels(path).observe(time.perf_counter() - start)
+        if status >= 400:
+            ERRORS.inc(path, str(status))
 
 
 @app.get("/")
@@ -72,7 +401,13 @@ async def root():
         "endpoints": {
             "/analyze": "POST - Analyze single text",
             "/analyze/batch": "POST - Analyze multiple texts",
-            "/health": "GET - Health check"
+            "/analyze/stream": "POST - Analyze an NDJSON stream of texts",
+            "/analyze/long": "POST - Mood timeline and overall mood of a long document",
+            "/ws/analyze": "WebSocket - Analyze a stream of messages on one connection",
+            "/health": "GET - Health check",
+            "/pool": "GET - Worker pool statistics",
+            "/cache": "GET - Result cache statistics",
+            "/metrics": "GET - Prometheus metrics"
         }
     }
 
@@ -80,73 +415,291 @@ async def root():
 @app.get("/health")
 async def health():
     """Health check endpoint."""
-    return {"status": "healthy", "model_loaded": True}
+    return {"status": "healthy", "model_loaded": True, "engine": ENGINE, "pipeline_mode": PIPELINE_MODE}
+
+
+@app.get("/pool")
+async def pool_stats():
+    """Worker pool statistics: queue depth, active workers and wait times."""
+    return dict(pool.stats(), batching=batcher.stats())
+
+
+@app.get("/cache")
+async def cache_stats():
+    """Result cache statistics: size, hits, misses and evictions."""
+    if cache is None:
+        return {"enabled": False}
+    return dict(cache.stats(), enabled=True)
+
+
+@app.get("/metrics", response_class=PlainTextResponse)
+async def prometheus_metrics():
+    """Prometheus text exposition of request, cache, pool and stage metrics."""
+    lines = []
+    lines += metrics.render_counter("mood_requests_total", "HTTP requests by route, method and status.", REQUESTS)
+    lines += metrics.render_counter("mood_errors_total", "HTTP responses with status >= 400.", ERRORS)
+    lines += metrics.render_histogram("mood_request_seconds", "HTTP request latency.", REQUEST_SECONDS)
+    lines += metrics.render_histogram("mood_doc_length_chars", "Length of analyzed texts.", DOC_LENGTH)
+    
+    pool_stats = pool.stats()
+    lines += metrics.render_gauge("mood_pool_in_flight", "Requests running or queued in the worker pool.", pool_stats["in_flight"])
+    lines += metrics.render_gauge("mood_pool_active_workers", "Busy pool workers.", pool_stats["active_workers"])
+    lines += metrics.render_gauge("mood_pool_queue_depth", "Requests waiting for a pool worker.", pool_stats["queue_depth"])
+    lines += metrics.render_gauge("mood_pool_rejected_total", "Requests rejected with 503.", pool_stats["rejected"], "counter")
+    lines += metrics.render_gauge("mood_pool_timed_out_total", "Requests that hit the timeout.", pool_stats["timed_out"], "counter")
+    lines += metrics.render_gauge("mood_pool_wait_seconds_avg", "Mean time work waited for a worker.", pool_stats["wait_time"]["avg"])
+    
+    if cache is not None:
+        cache_stats = cache.stats()
+        lines += metrics.render_gauge("mood_cache_hits_total", "Result cache hits.", cache_stats["hits"], "counter")
+        lines += metrics.render_gauge("mood_cache_misses_total", "Result cache misses.", cache_stats["misses"], "counter")
+        lines += metrics.render_gauge("mood_cache_evictions_total", "Result cache evictions.", cache_stats["evictions"], "counter")
+        lines += metrics.render_gauge("mood_cache_entries", "Results held in memory.", cache_stats["entries"])
+        lines += metrics.render_gauge("mood_cache_bytes", "Approximate memory used by cached results.", cache_stats["bytes"])
+    
+    lines += metrics.render_gauge("mood_dedup_texts_total", "Texts received in batches and streams.", DEDUP.texts, "counter")
+    lines += metrics.render_gauge("mood_dedup_unique_total", "Texts analyzed after in-batch deduplication.", DEDUP.unique, "counter")
+    lines += metrics.render_gauge("mood_dedup_ratio", "Share of batch and stream texts that were duplicates.", DEDUP.ratio)
+    
+    lines += metrics.render_gauge("mood_stage_timing_enabled", "1 if per-stage timing is on (MOOD_TIMING=1).", int(metrics.STAGE_TIMINGS.enabled))
+    lines += metrics.render_histogram("mood_stage_seconds", "Per-document time spent in each pipeline stage.", metrics.STAGE_TIMINGS.histograms)
+    return "\n".join(lines) + "\n"
 
 
 @app.post("/analyze", response_model=MoodResponse)
-async def analyze_text(request: TextRequest):
+async def analyze_text(request: TextRequest, http_request: Request):
     """
     Analyze a single text for mood detection.
     
     - **text**: The text to analyze
+    - **fields**: Optional subset of result fields to compute (default: all)
     - Returns: Mood, vibe score, and emotional triggers
     """
     if not request.text.strip():
         raise HTTPException(status_code=400, detail="Text cannot be empty")
     
-    doc = nlp(request.text)
-    
-    return MoodResponse(
-        text=request.text,
-        mood=doc._.mood,
-        vibe_score=doc._.vibe_score,
-        emotional_triggers=[
-            Trigger(text=t["text"], type=t["type"])
-            for t in doc._.emotional_triggers
-        ],
-        emotional_spans=[
-            {"text": span[0], "label": span[1]}
-            for span in doc._.emotional_spans
-        ]
-    )
+    fields = field_set(request.fields)
+    result = await score_text(request.text, fields)
+    return respond(http_request, to_response(result, fields))
 
 
 @app.post("/analyze/batch", response_model=BatchMoodResponse)
-async def analyze_batch(request: BatchTextRequest):
+async def analyze_batch(request: BatchTextRequest, http_request: Request):
     """
     Analyze multiple texts in batch.
     
     - **texts**: List of texts to analyze
-    - Returns: List of mood detection results
+    - **batch_size**: Optional ``nlp.pipe`` batch size (defaults to MOOD_BATCH_SIZE)
+    - **fields**: Optional subset of result fields to compute (default: all)
+    - **dedup**: "exact" (default) analyzes repeated texts once, "normalized"
+      analyzes each text with its whitespace collapsed, so texts differing
+      only in whitespace are merged too, "off" analyzes every copy
+    - Returns: List of mood detection results, as JSON or, with
+      ``Accept: application/msgpack``, msgpack. ``dedup_ratio`` is the
+      share of texts that were duplicates.
     """
     if not request.texts:
         raise HTTPException(status_code=400, detail="Texts list cannot be empty")
     
-    results = []
-    for text in request.texts:
-        if not text.strip():
-            continue
+    # Empty texts are skipped; everything else keeps its input order
+    texts = [text for text in request.texts if text.strip()]
+    
+    fields = field_set(request.fields)
+    results, batch = await analyze_deduplicated(texts, request.batch_size, fields, request.dedup)
+    
+    return respond(http_request, {
+        "results": results,
+        "total_analyzed": len(results),
+        "unique_analyzed": len(batch.unique),
+        "dedup_ratio": batch.ratio,
+    })
+
+
+@app.post("/analyze/long", response_model=LongMoodResponse)
+async def analyze_long_text(request: LongTextRequest, http_request: Request):
+    """
+    Analyze a long document in chunks.
+    
+    - **text**: The document; it may be longer than spaCy's ``max_length``
+    - **chunk_chars**: Optional maximum characters per chunk (default: 2000)
+    - Returns: The document's mood, vibe score and label counts, plus a
+      ``chunks`` timeline of character offsets with each chunk's mood and
+      vibe score
+    """
+    if not request.text.strip():
+        raise HTTPException(status_code=400, detail="Text cannot be empty")
+    
+    DOC_LENGTH.labels().observe(len(request.text))
+    result = await run_in_pool(analyze_document, request.text, request.chunk_chars)
+    return respond(http_request, result)
+
+
+@app.post("/analyze/stream")
+async def analyze_stream(
+    request: Request,
+    chunk_size: int = Query(default=STREAM_CHUNK_SIZE, ge=1, le=10_000),
+    fields: Optional[List[ResultField]] = Query(default=None),
+    dedup: DedupMode = Query(default="exact"),
+):
+    """
+    Analyze a newline-delimited JSON stream of texts.
+    
+    - **body**: One JSON string or ``{"text": ...}`` object per line
+    - **chunk_size**: Texts sent through the pipeline at a time
+    - **fields**: Optional subset of result fields, e.g. ``?fields=mood``
+    - **dedup**: How repeated texts within a chunk are analyzed, as for
+      /analyze/batch
+    - Returns: NDJSON, one MoodResponse per text in input order. Blank
+      texts are skipped; unparseable lines yield ``{"line": n, "error": ...}``
+    
+    Texts are read, analyzed and written chunk by chunk, so memory stays
+    constant however long the stream is.
+    """
+    selected = field_set(fields)
+    
+    async def analyze_chunk(chunk):
+        texts = [text for _, text, _ in chunk if text is not None]
+        while True:
+            try:
+                responses, _ = await analyze_deduplicated(texts, chunk_size, selected, dedup) if texts else ([], None)
+                responses = iter(responses)
+                break
+            except HTTPException as exc:
+                if exc.status_code != 503:
+                    raise
+                # Pool saturated: wait for room instead of failing mid-stream
+                await asyncio.sleep(0.05)
         
-        doc = nlp(text)
-        results.append(MoodResponse(
-            text=text,
-            mood=doc._.mood,
-            vibe_score=doc._.vibe_score,
-            emotional_triggers=[
-                Trigger(text=t["text"], type=t["type"])
-                for t in doc._.emotional_triggers
-            ],
-            emotional_spans=[
-                {"text": span[0], "label": span[1]}
-                for span in doc._.emotional_spans
-            ]
-        ))
-    
-    return BatchMoodResponse(
-        results=results,
-        total_analyzed=len(results)
-    )
+        lines = []
+        for line_no, text, error in chunk:
+            if error is not None:
+                lines.append(json.dumps({"line": line_no, "error": error}))
+            elif text is not None:
+                lines.append(dump_json(next(responses)))
+        return "".join(line + "\n" for line in lines)
+    
+    async def generate():
+        chunk = []
+        try:
+            async for line_no, line in iter_lines(request):
+                if not line.strip():
+                    continue
+                try:
+                    text = parse_stream_line(line)
+                    chunk.append((line_no, text if text.strip() else None, None))
+                except ValueError as exc:
+                    chunk.append((line_no, None, str(exc)))
+                if len(chunk) >= chunk_size:
+                    yield await analyze_chunk(chunk)
+                    chunk = []
+            if chunk:
+                yield await analyze_chunk(chunk)
+        except (HTTPException, ValueError) as exc:
+            # The status line is already sent, so report the failure in-band
+            detail = exc.detail if isinstance(exc, HTTPException) else str(exc)
+            yield json.dumps({"error": detail}) + "\n"
+    
+    return BodyStreamingResponse(generate(), media_type="application/x-ndjson")
+
+
+def parse_ws_message(data: str) -> Tuple[str, Any]:
+    """Read ``(text, id)`` out of a WebSocket message: a JSON string or {"text": ..., "id": ...}.
+    
+    Raises ``ValueError`` with the id as its second argument if there's no text.
+    """
+    value = json.loads(data)
+    message_id = None
+    if isinstance(value, dict):
+        message_id = value.get("id")
+        value = value.get("text")
+    if not isinstance(value, str):
+        raise ValueError('expected a JSON string or an object with a "text" field', message_id)
+    if not value.strip():
+        raise ValueError("Text cannot be empty", message_id)
+    return value, message_id
+
 
+@app.websocket("/ws/analyze")
+async def analyze_websocket(
+    websocket: WebSocket,
+    fields: Optional[List[ResultField]] = Query(default=None),
+):
+    """
+    Analyze a stream of messages over one WebSocket connection.
+    
+    - **messages**: One JSON string or ``{"text": ..., "id": ...}`` object each
+    - **fields**: Optional subset of result fields, e.g. ``?fields=mood``
+    - Returns: One MoodResponse message per message, in the order they were
+      sent, with the ``id`` echoed if there was one. Bad messages get
+      ``{"error": ..., "id": ...}`` in their place.
+    
+    Messages are scored concurrently (and micro-batched with other
+    requests), but at most MOOD_WS_MAX_PENDING per connection: when a
+    client reads results slower than it sends, the server stops reading
+    from it until it catches up.
+    """
+    selected = field_set(fields)
+    await websocket.accept()
+    # FIFO of (received at, id, scoring task or error): results go out in order
+    pending: asyncio.Queue = asyncio.Queue(maxsize=WS_MAX_PENDING)
+    
+    async def score(text: str):
+        while True:
+            try:
+                return to_response(await score_text(text, selected), selected)
+            except HTTPException as exc:
+                if exc.status_code != 503:
+                    return {"error": exc.detail}
+                # Pool saturated: wait for room, as the stream endpoint does
+                await asyncio.sleep(0.05)
+    
+    async def read():
+        while True:
+            message = await websocket.receive()
+            if message["type"] == "websocket.disconnect":
+                return
+            data = message.get("text")
+            if data is None:
+                data = message.get("bytes", b"").decode("utf-8", "replace")
+            try:
+                text, message_id = parse_ws_message(data)
+                entry = asyncio.ensure_future(score(text))
+            except ValueError as exc:
+                message_id = exc.args[1] if len(exc.args) > 1 else None
+                entry = {"error": str(exc.args[0])}
+            # Blocks while the writer is WS_MAX_PENDING results behind
+            await pending.put((time.perf_counter(), message_id, entry))
+    
+    async def write():
+        while True:
+            start, message_id, entry = await pending.get()
+            response = await entry if isinstance(entry, asyncio.Future) else entry
+            if message_id is not None:
+                response = dict(response, id=message_id)
+            await websocket.send_text(dump_json(response))
+            status = "400" if "error" in response else "200"
+            REQUESTS.inc("/ws/analyze", "WS", status)
+            REQUEST_SECONDS.labels("/ws/analyze").observe(time.perf_counter() - start)
+            if status != "200":
+                ERRORS.inc("/ws/analyze", status)
+    
+    reader = asyncio.ensure_future(read())
+    writer = asyncio.ensure_future(write())
+    try:
+        # The reader ends when the client disconnects, the writer only if a send fails
+        done, _ = await asyncio.wait({reader, writer}, return_when=asyncio.FIRST_COMPLETED)
+        for task in done:
+            try:
+                task.result()
+            except WebSocketDisconnect:
+                pass
+    finally:
+        for task in (reader, writer):
+            task.cancel()
+        while not pending.empty():
+            entry = pending.get_nowait()[2]
+            if isinstance(entry, asyncio.Future):
+                entry.cancel()
 
 if __name__ == "__main__":
     import uvicorn
@@ -4,29 +4,39 @@ Streamlit web UI for SpaCy Mood Detective
 """
 
 import streamlit as st
-import spacy
-from mood_detector import create_mood_detector
+from mood_detector import load_pipeline
+from mood_detector.cache import cache_from_env
 import json
+import os
 from typing import Dict, Any
 
 
 @st.cache_resource
-def load_model():
-    """Load spaCy model with mood detector (cached)."""
+def load_model(mode: str = "lite"):
+    """Load spaCy pipeline with mood detector (cached)."""
     try:
-        nlp = spacy.load("en_core_web_sm")
+        return load_pipeline(mode)
     except OSError:
         st.error("❌ spaCy model 'en_core_web_sm' not found. Please run: `python -m spacy download en_core_web_sm`")
         st.stop()
-    
-    if "mood_detector" not in nlp.pipe_names:
-        nlp.add_pipe("mood_detector", last=True)
-    
-    return nlp
+
+
+@st.cache_resource
+def load_result_cache():
+    """Result cache shared by all sessions (configured via MOOD_CACHE_*)."""
+    return cache_from_env()
 
 
 def analyze_text(text: str, nlp) -> Dict[str, Any]:
     """Analyze text and return mood detection results."""
+    cache = load_result_cache()
+    if cache is not None:
+        return cache.get_or_compute(text, lambda t: run_analysis(t, nlp))
+    return run_analysis(text, nlp)
+
+
+def run_analysis(text: str, nlp) -> Dict[str, Any]:
+    """Run the pipeline on a single text."""
     doc = nlp(text)
     
     return {
@@ -81,8 +91,8 @@ def main():
     st.markdown("### *An NLP project that sniffs the emotional chaos inside any text.*")
     st.markdown("---")
     
-    # Load model
-    nlp = load_model()
+    # Load model ("lite" = tokenizer only, "full" = en_core_web_sm)
+    nlp = load_model(os.environ.get("MOOD_PIPELINE_MODE", "lite"))
     
     # Sidebar
     with st.sidebar:
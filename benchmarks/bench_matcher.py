@@ -0,0 +1,78 @@
+#!/usr/bin/env python3
+"""
+Benchmark: generic Matcher over every MOOD_PATTERN vs the lexeme-ID index.
+
+The "matcher" column is what MoodDetector used to do (every pattern in one
+spaCy Matcher, then match_id -> string through vocab.strings). The "index"
+column is MoodDetector._match: one pass over LOWER IDs that also resolves
+the multi-token phrases through an index of their first tokens.
+
+Usage:
+    python benchmarks/bench_matcher.py
+    python benchmarks/bench_matcher.py --tokens 1000 10000 100000
+"""
+
+import argparse
+import random
+import sys
+import time
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(ROOT))
+
+import spacy
+from spacy.matcher import Matcher
+
+from mood_detector import MoodDetector
+from mood_detector.patterns import MOOD_PATTERNS
+
+
+def long_text(n_words: int, rng: random.Random) -> str:
+    samples = (ROOT / "examples" / "sample_texts.txt").read_text().split()
+    return " ".join(rng.choice(samples) for _ in range(n_words))
+
+
+def best_of(repeat: int, func) -> float:
+    timings = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        func()
+        timings.append(time.perf_counter() - start)
+    return min(timings)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Matcher vs lexeme index benchmark")
+    parser.add_argument("--tokens", type=int, nargs="+", default=[1_000, 10_000, 100_000])
+    parser.add_argument("--repeat", type=int, default=5)
+    args = parser.parse_args()
+
+    nlp = spacy.blank("en")
+    nlp.max_length = 10 ** 8
+    detector = MoodDetector(nlp)
+
+    matcher = Matcher(nlp.vocab)
+    for pattern in MOOD_PATTERNS:
+        matcher.add(pattern["label"], [pattern["pattern"]])
+    strings = nlp.vocab.strings
+
+    def run_matcher(doc):
+        return [(strings[match_id], start, end) for match_id, start, end in matcher(doc)]
+
+    def run_index(doc):
+        labels = detector.labels
+        return [(labels[label_id], start, end) for end, start, _, label_id in detector._match(doc)]
+
+    rng = random.Random(0)
+    print(f"{'tokens':>8} {'matcher ms':>11} {'index ms':>9} {'speedup':>8}")
+    for n_words in args.tokens:
+        doc = nlp.make_doc(long_text(n_words, rng))
+        assert run_matcher(doc) == run_index(doc)
+        old = best_of(args.repeat, lambda: run_matcher(doc))
+        new = best_of(args.repeat, lambda: run_index(doc))
+        print(f"{len(doc):>8} {old * 1000:>11.2f} {new * 1000:>9.2f} {old / new:>7.1f}x")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,85 @@
+#!/usr/bin/env python3
+"""
+Benchmark: /analyze throughput and latency with and without micro-batching.
+
+Fires ``--requests`` single-text /analyze calls at the app in-process
+(httpx over ASGI, so no sockets are involved), ``--concurrency`` at a
+time, for each batch window / max batch size combination. The
+"unbatched" row uses a max batch size of 1, i.e. one nlp() call per
+request.
+
+Usage:
+    python benchmarks/bench_microbatch.py
+    python benchmarks/bench_microbatch.py --windows 0 2 5 10 --sizes 16 64
+"""
+
+import argparse
+import asyncio
+import statistics
+import sys
+import time
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(ROOT))
+
+import httpx
+
+import api
+from mood_detector.batching import MicroBatcher
+
+
+def load_texts():
+    lines = (ROOT / "examples" / "sample_texts.txt").read_text().splitlines()
+    return [line for line in lines if line.strip() and not line.startswith("#")]
+
+
+async def run_load(texts, n_requests: int, concurrency: int):
+    transport = httpx.ASGITransport(app=api.app)
+    semaphore = asyncio.Semaphore(concurrency)
+    latencies = []
+
+    async with httpx.AsyncClient(transport=transport, base_url="http://bench") as client:
+        async def one(i):
+            async with semaphore:
+                start = time.perf_counter()
+                response = await client.post("/analyze", json={"text": texts[i % len(texts)]})
+                latencies.append(time.perf_counter() - start)
+                response.raise_for_status()
+
+        start = time.perf_counter()
+        await asyncio.gather(*(one(i) for i in range(n_requests)))
+        elapsed = time.perf_counter() - start
+
+    latencies.sort()
+    p99 = latencies[min(len(latencies) - 1, int(len(latencies) * 0.99))]
+    return n_requests / elapsed, statistics.median(latencies), p99
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Micro-batching benchmark")
+    parser.add_argument("--requests", type=int, default=5000)
+    parser.add_argument("--concurrency", type=int, default=256)
+    parser.add_argument("--windows", type=float, nargs="+", default=[1, 5, 10], help="Batch windows in ms")
+    parser.add_argument("--sizes", type=int, nargs="+", default=[16, 64])
+    args = parser.parse_args()
+
+    texts = load_texts()
+    # Never reject requests, and measure inference rather than cache hits
+    api.pool.max_queue = args.concurrency
+    api.cache = None
+
+    configs = [("unbatched", 1, 0.0)]
+    configs += [(f"{window:g}ms / {size}", size, window) for window in args.windows for size in args.sizes]
+
+    print(f"engine={api.ENGINE} requests={args.requests} concurrency={args.concurrency}")
+    print(f"{'window / max batch':<20} {'req/s':>9} {'p50 ms':>8} {'p99 ms':>8} {'avg batch':>10}")
+    for name, size, window in configs:
+        api.batcher = MicroBatcher(api.compute_texts, max_batch_size=size, max_wait=window / 1000)
+        throughput, p50, p99 = asyncio.run(run_load(texts, args.requests, args.concurrency))
+        avg_batch = api.batcher.stats()["avg_batch_size"]
+        print(f"{name:<20} {throughput:>9.0f} {p50 * 1000:>8.2f} {p99 * 1000:>8.2f} {avg_batch:>10.1f}")
+
+
+if __name__ == "__main__":
+    main()
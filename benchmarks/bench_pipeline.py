@@ -0,0 +1,86 @@
+#!/usr/bin/env python3
+"""
+Benchmark: docs/sec and peak RSS for the "full" and "lite" pipeline modes.
+
+Usage:
+    python benchmarks/bench_pipeline.py
+    python benchmarks/bench_pipeline.py --docs 5000 --modes lite
+"""
+
+import argparse
+import json
+import resource
+import subprocess
+import sys
+import time
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parent.parent
+SAMPLES = ROOT / "examples" / "sample_texts.txt"
+
+
+def load_corpus(n_docs: int) -> list:
+    """Repeat the example texts until we have ``n_docs`` documents."""
+    texts = [line.strip() for line in SAMPLES.read_text().splitlines() if line.strip()]
+    return [texts[i % len(texts)] for i in range(n_docs)]
+
+
+def run_mode(mode: str, n_docs: int) -> dict:
+    """Load one pipeline mode and time it (run in a fresh process)."""
+    sys.path.insert(0, str(ROOT))
+    from mood_detector import load_pipeline
+    from mood_detector.pipeline import doc_to_result
+
+    start = time.perf_counter()
+    nlp = load_pipeline(mode)
+    load_seconds = time.perf_counter() - start
+
+    corpus = load_corpus(n_docs)
+    start = time.perf_counter()
+    # Read the results: the lazy detector only does its work when they're read
+    for text in corpus:
+        doc_to_result(nlp(text))
+    elapsed = time.perf_counter() - start
+
+    # ru_maxrss is KiB on Linux
+    rss_mb = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024
+    return {
+        "mode": mode,
+        "pipes": nlp.pipe_names,
+        "docs": n_docs,
+        "load_seconds": round(load_seconds, 3),
+        "docs_per_sec": round(n_docs / elapsed, 1),
+        "peak_rss_mb": round(rss_mb, 1),
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Compare full vs lite pipeline modes")
+    parser.add_argument("--docs", type=int, default=2000, help="Number of documents per mode")
+    parser.add_argument("--modes", nargs="+", default=["full", "lite"], help="Modes to benchmark")
+    parser.add_argument("--worker", help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.worker:
+        print(json.dumps(run_mode(args.worker, args.docs)))
+        return
+
+    # Each mode runs in its own process so RSS numbers don't bleed together
+    for mode in args.modes:
+        proc = subprocess.run(
+            [sys.executable, __file__, "--worker", mode, "--docs", str(args.docs)],
+            capture_output=True, text=True,
+        )
+        if proc.returncode != 0:
+            print(f"{mode:>5}: failed ({proc.stderr.strip().splitlines()[-1]})")
+            continue
+        result = json.loads(proc.stdout)
+        print(
+            f"{mode:>5}: {result['docs_per_sec']:>9.1f} docs/sec  "
+            f"peak RSS {result['peak_rss_mb']:>7.1f} MB  "
+            f"load {result['load_seconds']:.2f}s  pipes={result['pipes']}"
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,103 @@
+#!/usr/bin/env python3
+"""
+Benchmark: response serialization time per 10k results.
+
+Analyzes a seeded synthetic corpus once with the fast engine, then times
+turning the results into an ``/analyze/batch`` response body:
+
+- "pydantic": validating the response through ``BatchMoodResponse`` and
+  encoding it with FastAPI's ``jsonable_encoder`` + ``json.dumps``, as a
+  ``response_model`` does
+- "json" / "orjson" / "msgpack": the encoders ``api.respond`` uses,
+  straight from the result dicts
+- "orjson+gzip N": orjson output gzipped at level N, as GZipMiddleware does
+
+"dicts" is the ``to_response`` step every path starts from.
+
+Usage:
+    python benchmarks/bench_serialization.py
+    python benchmarks/bench_serialization.py --results 50000 --repeat 3
+"""
+
+import argparse
+import gzip
+import json
+import os
+import sys
+import time
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(ROOT))
+sys.path.insert(0, str(ROOT / "benchmarks"))
+
+from fastapi.encoders import jsonable_encoder
+
+from corpus import generate_corpus
+from mood_detector import MoodEngine
+from mood_detector import encoding
+from mood_detector.dedup import Deduplicated
+
+PER = 10_000
+
+
+def best_of(repeat: int, func):
+    best, output = float("inf"), None
+    for _ in range(repeat):
+        start = time.perf_counter()
+        output = func()
+        best = min(best, time.perf_counter() - start)
+    return best, output
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Response serialization benchmark")
+    parser.add_argument("--results", type=int, default=PER)
+    parser.add_argument("--repeat", type=int, default=5)
+    args = parser.parse_args()
+
+    # api builds its pipeline at import; the fast engine keeps this quick
+    os.environ.setdefault("MOOD_ENGINE", "fast")
+    import api
+
+    results = list(MoodEngine().analyze_results(generate_corpus(args.results)))
+    batch = Deduplicated([result.text for result in results])
+
+    def build():
+        return {
+            "results": [result.to_json_dict() for result in results],
+            "total_analyzed": len(results),
+            "unique_analyzed": len(batch.unique),
+            "dedup_ratio": batch.ratio,
+        }
+
+    content = build()
+    encoders = {
+        "dicts": build,
+        "pydantic": lambda: json.dumps(
+            jsonable_encoder(api.BatchMoodResponse.model_validate(content)),
+            ensure_ascii=False, separators=(",", ":"),
+        ).encode("utf-8"),
+        "json": lambda: json.dumps(content, ensure_ascii=False, separators=(",", ":")).encode("utf-8"),
+        "msgpack": lambda: encoding.dumps_msgpack(content),
+    }
+    if encoding.orjson is not None:
+        encoders["orjson"] = lambda: encoding.orjson.dumps(content)
+        for level in (1, 5, 9):
+            encoders[f"orjson+gzip {level}"] = lambda level=level: gzip.compress(
+                encoding.orjson.dumps(content), compresslevel=level
+            )
+    else:
+        print("orjson is not installed; skipping its rows")
+
+    scale = PER / len(results)
+    print(f"results={len(results)} (times scaled to per {PER:,})")
+    print(f"{'encoder':<16} {'ms/10k':>9} {'MB/10k':>8}")
+    for name, func in encoders.items():
+        seconds, output = best_of(args.repeat, func)
+        size = "" if name == "dicts" else f"{len(output) * scale / 1e6:>8.2f}"
+        print(f"{name:<16} {seconds * scale * 1000:>9.1f} {size:>8}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,99 @@
+#!/usr/bin/env python3
+"""
+Benchmark: compiling the lexicon from patterns.py vs loading a saved one.
+
+"component" times getting a ready MoodDetector in a warm process: compile
+(``CompiledLexicon.build`` on first use) vs ``from_bytes`` with the
+serialized lexicon. "process" times a fresh interpreter from start to the
+first analyzed doc: ``load_pipeline("lite")`` vs ``spacy.load`` of a
+pipeline saved with ``nlp.to_disk``, next to a bare ``import spacy`` for
+scale.
+
+Usage:
+    python benchmarks/bench_startup.py
+    python benchmarks/bench_startup.py --repeat 20 --processes 10
+"""
+
+import argparse
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(ROOT))
+
+import spacy
+
+from mood_detector import MoodDetector, load_pipeline
+from mood_detector.scoring import trigger_automaton
+
+FIRST_DOC = "I'm so happy and excited! This is amazing!!!"
+
+COMPILE_SCRIPT = f"""
+import sys; sys.path.insert(0, {str(ROOT)!r})
+from mood_detector import load_pipeline
+load_pipeline("lite")({FIRST_DOC!r})._.vibe_score
+"""
+
+LOAD_SCRIPT = """
+import sys; sys.path.insert(0, {root!r})
+import spacy, mood_detector.detector
+spacy.load({path!r})({doc!r})._.vibe_score
+"""
+
+
+def best_of(repeat: int, func) -> float:
+    timings = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        func()
+        timings.append(time.perf_counter() - start)
+    return min(timings)
+
+
+def median_process_time(script: str, runs: int) -> float:
+    timings = []
+    for _ in range(runs):
+        start = time.perf_counter()
+        subprocess.run([sys.executable, "-c", script], check=True)
+        timings.append(time.perf_counter() - start)
+    return statistics.median(timings)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Lexicon compile vs load startup benchmark")
+    parser.add_argument("--repeat", type=int, default=50, help="In-process repetitions (best of)")
+    parser.add_argument("--processes", type=int, default=5, help="Fresh interpreters per variant (median)")
+    args = parser.parse_args()
+
+    nlp = spacy.blank("en")
+    data = MoodDetector(nlp).to_bytes()
+
+    def compile_component():
+        # Drop the process-wide automaton so every run compiles from scratch
+        trigger_automaton.cache_clear()
+        MoodDetector(nlp).phrase_index
+
+    def load_component():
+        MoodDetector(nlp).from_bytes(data)
+
+    compiled = best_of(args.repeat, compile_component)
+    loaded = best_of(args.repeat, load_component)
+    print(f"{'':>10} {'compile ms':>11} {'load ms':>8} {'speedup':>8}")
+    print(f"{'component':>10} {compiled * 1000:>11.2f} {loaded * 1000:>8.2f} {compiled / loaded:>7.1f}x")
+
+    with tempfile.TemporaryDirectory() as tmp:
+        load_pipeline("lite").to_disk(tmp)
+        load_script = LOAD_SCRIPT.format(root=str(ROOT), path=tmp, doc=FIRST_DOC)
+        compiled = median_process_time(COMPILE_SCRIPT, args.processes)
+        loaded = median_process_time(load_script, args.processes)
+    print(f"{'process':>10} {compiled * 1000:>11.2f} {loaded * 1000:>8.2f} {compiled / loaded:>7.1f}x")
+    bare = median_process_time("import spacy", args.processes)
+    print(f"import spacy alone: {bare * 1000:.2f} ms")
+
+
+if __name__ == "__main__":
+    main()
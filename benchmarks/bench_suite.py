@@ -0,0 +1,224 @@
+#!/usr/bin/env python3
+"""
+Benchmark suite: MoodDetector stages, whole pipelines and the API.
+
+Runs every benchmark over the same seeded synthetic corpus (see
+corpus.py) and reports docs/sec. Results can be saved as JSON and later
+compared against that baseline; a benchmark that got slower by more than
+``--threshold`` percent is flagged and the exit status is 1.
+
+Benchmarks:
+    stage.tokenize          nlp.make_doc
+    stage.detector          MoodDetector.__call__ on pre-tokenized docs, results read
+    stage.match             MoodDetector._match
+    stage.compute_mood      MoodDetector._compute_mood
+    stage.features          MoodDetector._vibe_features (token-level vibe features)
+    stage.vibe_score        MoodDetector._compute_vibe_score
+    stage.vibe_score_batch  MoodScorer.compute_vibe_scores (vectorized, one batch)
+    stage.triggers          MoodDetector._extract_emotional_triggers
+    pipeline.lite           pipe_results with the tokenizer-only pipeline
+    pipeline.full           pipe_results with en_core_web_sm (skipped if missing)
+    pipeline.fast_engine    MoodEngine.analyze_many
+    api.analyze             POST /analyze, one request per text
+    api.batch               POST /analyze/batch, 64 texts per request
+
+Usage:
+    python benchmarks/bench_suite.py --output baseline.json
+    python benchmarks/bench_suite.py --compare baseline.json
+    python benchmarks/bench_suite.py --only stage --docs 500
+"""
+
+import argparse
+import json
+import os
+import platform
+import sys
+import time
+from datetime import datetime, timezone
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(ROOT))
+
+from corpus import generate_corpus
+
+
+def best_of(repeat: int, func) -> float:
+    timings = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        func()
+        timings.append(time.perf_counter() - start)
+    return min(timings)
+
+
+def stage_benchmarks(corpus, nlp):
+    """Each MoodDetector stage over pre-computed inputs for that stage."""
+    from mood_detector.detector import _TOKEN_ATTRS
+    from mood_detector.pipeline import doc_to_result
+    from mood_detector.scoring import scan_text
+
+    detector = nlp.get_pipe("mood_detector")
+    docs = [nlp.make_doc(text) for text in corpus]
+    matches = [detector._match(doc) for doc in docs]
+    counts = [detector.scorer.count(m[3] for m in found) for found in matches]
+    match_data = [
+        [(detector.labels[label_id], start, end) for end, start, _, label_id in found]
+        for found in matches
+    ]
+    hits = [scan_text(doc.text) for doc in docs]
+    columns = [doc.to_array(_TOKEN_ATTRS).T.tolist() for doc in docs]
+    features = [detector._vibe_features(doc, *cols) for doc, cols in zip(docs, columns)]
+    inputs = list(zip(docs, counts, match_data, hits))
+
+    return {
+        "stage.tokenize": lambda: [nlp.make_doc(text) for text in corpus],
+        # The detector is lazy: without reading the results it does no work
+        "stage.detector": lambda: [doc_to_result(detector(doc)) for doc in docs],
+        "stage.match": lambda: [detector._match(doc) for doc in docs],
+        "stage.compute_mood": lambda: [detector._compute_mood(c, d) for d, c, _, _ in inputs],
+        "stage.features": lambda: [detector._vibe_features(d, *cols) for d, cols in zip(docs, columns)],
+        "stage.vibe_score": lambda: [detector._compute_vibe_score(c, d) for d, c, _, _ in inputs],
+        "stage.vibe_score_batch": lambda: detector.scorer.compute_vibe_scores(counts, features),
+        "stage.triggers": lambda: [detector._extract_emotional_triggers(d, m, h) for d, _, m, h in inputs],
+    }
+
+
+def pipeline_benchmarks(corpus, lite):
+    from mood_detector import MoodEngine, load_pipeline
+    from mood_detector.pipeline import pipe_results
+
+    engine = MoodEngine()
+    benchmarks = {
+        "pipeline.lite": lambda: list(pipe_results(lite, corpus, batch_size=256)),
+        "pipeline.fast_engine": lambda: list(engine.analyze_many(corpus)),
+    }
+    try:
+        full = load_pipeline("full")
+    except OSError:
+        print("   (pipeline.full skipped: en_core_web_sm is not installed)", file=sys.stderr)
+    else:
+        benchmarks["pipeline.full"] = lambda: list(pipe_results(full, corpus, batch_size=256))
+    return benchmarks
+
+
+def api_benchmarks(corpus):
+    import asyncio
+
+    import httpx
+
+    # Measure inference, not cache hits across repeats
+    os.environ["MOOD_CACHE_SIZE"] = "0"
+    import api
+
+    async def post_all(requests):
+        transport = httpx.ASGITransport(app=api.app)
+        async with httpx.AsyncClient(transport=transport, base_url="http://bench") as client:
+            for path, payload in requests:
+                response = await client.post(path, json=payload)
+                response.raise_for_status()
+
+    singles = [("/analyze", {"text": text}) for text in corpus]
+    batches = [("/analyze/batch", {"texts": corpus[i:i + 64]}) for i in range(0, len(corpus), 64)]
+    return {
+        "api.analyze": lambda: asyncio.run(post_all(singles)),
+        "api.batch": lambda: asyncio.run(post_all(batches)),
+    }
+
+
+def run_suite(args) -> dict:
+    from mood_detector import load_pipeline
+
+    corpus = generate_corpus(args.docs, seed=args.seed)
+    lite = load_pipeline("lite")
+
+    groups = {
+        "stage": lambda: stage_benchmarks(corpus, lite),
+        "pipeline": lambda: pipeline_benchmarks(corpus, lite),
+        "api": lambda: api_benchmarks(corpus),
+    }
+    benchmarks = {}
+    for group, build in groups.items():
+        # Only set up (and import) what --only asks for
+        if not args.only or any(prefix.split(".")[0] == group for prefix in args.only):
+            benchmarks.update(build())
+
+    results = {}
+    for name, func in benchmarks.items():
+        if args.only and not any(name.startswith(prefix) for prefix in args.only):
+            continue
+        func()  # warm-up
+        seconds = best_of(args.repeat, func)
+        results[name] = {
+            "seconds": round(seconds, 6),
+            "docs_per_sec": round(len(corpus) / seconds, 1),
+            "us_per_doc": round(seconds / len(corpus) * 1e6, 2),
+        }
+        print(f"{name:<22} {results[name]['docs_per_sec']:>12,.0f} docs/sec "
+              f"{results[name]['us_per_doc']:>10.1f} us/doc", file=sys.stderr)
+
+    import spacy
+    from mood_detector.lexicon import pattern_set_version
+
+    return {
+        "meta": {
+            "timestamp": datetime.now(timezone.utc).isoformat(timespec="seconds"),
+            "python": platform.python_version(),
+            "spacy": spacy.__version__,
+            "platform": platform.platform(),
+            "pattern_version": pattern_set_version(),
+            "docs": args.docs,
+            "seed": args.seed,
+            "repeat": args.repeat,
+        },
+        "results": results,
+    }
+
+
+def compare(current: dict, baseline: dict, threshold: float) -> bool:
+    """Print a per-benchmark comparison; return True if anything regressed."""
+    regressed = False
+    print(f"\n{'benchmark':<22} {'baseline':>12} {'current':>12} {'change':>8}")
+    for name, result in current["results"].items():
+        old = baseline["results"].get(name)
+        if old is None:
+            print(f"{name:<22} {'-':>12} {result['docs_per_sec']:>12,.0f} {'new':>8}")
+            continue
+        change = (result["docs_per_sec"] - old["docs_per_sec"]) / old["docs_per_sec"] * 100
+        flag = ""
+        if change < -threshold:
+            flag = "  REGRESSION"
+            regressed = True
+        print(f"{name:<22} {old['docs_per_sec']:>12,.0f} {result['docs_per_sec']:>12,.0f} "
+              f"{change:>+7.1f}%{flag}")
+    if baseline["meta"].get("docs") != current["meta"]["docs"]:
+        print("\n⚠️  corpus size differs from the baseline; numbers are not directly comparable")
+    return regressed
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Mood detector benchmark suite")
+    parser.add_argument("--docs", type=int, default=2000, help="Synthetic corpus size")
+    parser.add_argument("--seed", type=int, default=0, help="Corpus seed")
+    parser.add_argument("--repeat", type=int, default=3, help="Take the best of N runs")
+    parser.add_argument("--only", nargs="+", help="Only run benchmarks with these name prefixes")
+    parser.add_argument("--output", "-o", help="Write results as JSON to this file")
+    parser.add_argument("--compare", "-c", help="Baseline JSON to compare against")
+    parser.add_argument("--threshold", type=float, default=10.0,
+                        help="Slowdown in percent that counts as a regression (default: 10)")
+    args = parser.parse_args()
+
+    current = run_suite(args)
+    if args.output:
+        Path(args.output).write_text(json.dumps(current, indent=2) + "\n")
+    else:
+        print(json.dumps(current, indent=2))
+
+    if args.compare:
+        baseline = json.loads(Path(args.compare).read_text())
+        if compare(current, baseline, args.threshold):
+            sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,76 @@
+#!/usr/bin/env python3
+"""
+Benchmark: per-substring scans vs the single-pass PhraseAutomaton.
+
+Grows the trigger/modifier phrase list with synthetic phrases and reports the
+per-document cost of both approaches.
+
+Usage:
+    python benchmarks/bench_triggers.py
+"""
+
+import argparse
+import random
+import string
+import sys
+import time
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(ROOT))
+
+from mood_detector.automaton import PhraseAutomaton
+from mood_detector.patterns import (
+    EMOTIONAL_TRIGGERS, INTENSITY_WORDS, CASUAL_WORDS, EMOJI_WORDS, AMPLIFIER_WORDS,
+)
+
+
+def base_phrases() -> list:
+    phrases = [w for words in EMOTIONAL_TRIGGERS.values() for w in words]
+    phrases += INTENSITY_WORDS + CASUAL_WORDS + EMOJI_WORDS + AMPLIFIER_WORDS
+    return list(dict.fromkeys(phrases))
+
+
+def synthetic_phrases(n: int, rng: random.Random) -> list:
+    return ["".join(rng.choice(string.ascii_lowercase) for _ in range(rng.randint(4, 10))) for _ in range(n)]
+
+
+def naive_scan(phrases: list, text_lower: str) -> dict:
+    """What the detector used to do: one ``in`` and one ``find`` per phrase."""
+    return {p: text_lower.find(p) for p in phrases if p in text_lower}
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Trigger/modifier scanning benchmark")
+    parser.add_argument("--docs", type=int, default=2000)
+    parser.add_argument("--doc-words", type=int, default=40)
+    args = parser.parse_args()
+
+    rng = random.Random(0)
+    base = base_phrases()
+    vocab = base + ["the", "deploy", "backend", "today", "meeting", "coffee"] * 10
+    docs = [
+        " ".join(rng.choice(vocab) for _ in range(args.doc_words)).lower()
+        for _ in range(args.docs)
+    ]
+
+    print(f"{'phrases':>8} {'naive us/doc':>13} {'automaton us/doc':>17}")
+    for factor in (1, 4, 16, 64):
+        phrases = base + synthetic_phrases(len(base) * (factor - 1), rng)
+        automaton = PhraseAutomaton(phrases)
+
+        start = time.perf_counter()
+        for doc in docs:
+            naive_scan(phrases, doc)
+        naive = (time.perf_counter() - start) / len(docs) * 1e6
+
+        start = time.perf_counter()
+        for doc in docs:
+            automaton.first_occurrences(doc)
+        compiled = (time.perf_counter() - start) / len(docs) * 1e6
+
+        print(f"{len(phrases):>8} {naive:>13.1f} {compiled:>17.1f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,136 @@
+#!/usr/bin/env python3
+"""
+Load test: per-message latency over /ws/analyze vs POST /analyze.
+
+Starts the API with uvicorn on a local port (the result cache is off, so
+every message is analyzed) and sends ``--messages`` texts, one at a time
+and waiting for each result, over:
+
+- "http new conn": a fresh connection per request, like a gateway that
+  opens a request per message
+- "http keep-alive": one reused HTTP connection
+- "websocket": one WebSocket connection
+
+then ``--clients`` concurrent WebSocket and keep-alive HTTP clients doing
+the same, for throughput.
+
+Usage:
+    python benchmarks/bench_websocket.py
+    python benchmarks/bench_websocket.py --messages 5000 --clients 32
+"""
+
+import argparse
+import asyncio
+import json
+import os
+import socket
+import statistics
+import subprocess
+import sys
+import time
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parent.parent
+
+import httpx
+from websockets.asyncio.client import connect
+
+
+def load_texts():
+    lines = (ROOT / "examples" / "sample_texts.txt").read_text().splitlines()
+    return [line for line in lines if line.strip() and not line.startswith("#")]
+
+
+def free_port() -> int:
+    with socket.socket() as sock:
+        sock.bind(("127.0.0.1", 0))
+        return sock.getsockname()[1]
+
+
+def start_server(port: int) -> subprocess.Popen:
+    env = dict(os.environ, MOOD_CACHE_SIZE="0")
+    server = subprocess.Popen(
+        [sys.executable, "-m", "uvicorn", "api:app", "--port", str(port), "--log-level", "warning"],
+        cwd=ROOT,
+        env=env,
+    )
+    deadline = time.monotonic() + 60
+    while time.monotonic() < deadline:
+        try:
+            httpx.get(f"http://127.0.0.1:{port}/health").raise_for_status()
+            return server
+        except httpx.HTTPError:
+            time.sleep(0.1)
+    server.kill()
+    raise RuntimeError("the API server did not start")
+
+
+def summarize(latencies):
+    latencies = sorted(latencies)
+    p99 = latencies[min(len(latencies) - 1, int(len(latencies) * 0.99))]
+    return statistics.median(latencies), p99
+
+
+async def http_client(base_url: str, texts, reuse: bool):
+    latencies = []
+    # Without keep-alive every request opens (and closes) its own connection
+    limits = httpx.Limits(max_keepalive_connections=None if reuse else 0)
+    async with httpx.AsyncClient(base_url=base_url, limits=limits) as client:
+        for text in texts:
+            start = time.perf_counter()
+            response = await client.post("/analyze", json={"text": text})
+            response.raise_for_status()
+            latencies.append(time.perf_counter() - start)
+    return latencies
+
+
+async def websocket_client(ws_url: str, texts):
+    latencies = []
+    async with connect(ws_url) as websocket:
+        for i, text in enumerate(texts):
+            start = time.perf_counter()
+            await websocket.send(json.dumps({"text": text, "id": i}))
+            result = json.loads(await websocket.recv())
+            assert result["id"] == i
+            latencies.append(time.perf_counter() - start)
+    return latencies
+
+
+async def run(kind: str, port: int, texts, clients: int):
+    base_url, ws_url = f"http://127.0.0.1:{port}", f"ws://127.0.0.1:{port}/ws/analyze"
+    per_client = [texts[i::clients] for i in range(clients)]
+    if kind == "websocket":
+        runs = [websocket_client(ws_url, chunk) for chunk in per_client]
+    else:
+        runs = [http_client(base_url, chunk, reuse=kind == "http keep-alive") for chunk in per_client]
+    start = time.perf_counter()
+    latencies = [latency for result in await asyncio.gather(*runs) for latency in result]
+    return len(latencies) / (time.perf_counter() - start), *summarize(latencies)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="WebSocket vs HTTP per-message latency")
+    parser.add_argument("--messages", type=int, default=2000)
+    parser.add_argument("--clients", type=int, default=16, help="Concurrent clients in the second round")
+    args = parser.parse_args()
+
+    samples = load_texts()
+    texts = [samples[i % len(samples)] for i in range(args.messages)]
+    port = free_port()
+    server = start_server(port)
+    try:
+        print(f"messages={args.messages}")
+        print(f"{'path':<16} {'clients':>7} {'msg/s':>9} {'p50 ms':>8} {'p99 ms':>8}")
+        for clients in (1, args.clients):
+            for kind in ("http new conn", "http keep-alive", "websocket"):
+                if kind == "http new conn" and clients > 1:
+                    continue
+                throughput, p50, p99 = asyncio.run(run(kind, port, texts, clients))
+                print(f"{kind:<16} {clients:>7} {throughput:>9.0f} {p50 * 1000:>8.2f} {p99 * 1000:>8.2f}")
+    finally:
+        server.terminate()
+        server.wait()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,128 @@
+#!/usr/bin/env python3
+"""
+Reproducible synthetic corpus for benchmarks.
+
+Texts mix mood vocabulary drawn from MOOD_PATTERNS (including the
+multi-token phrases) with filler words, vibe modifiers, emoji, shouting
+and punctuation. Every knob is seeded, so the same arguments always give
+the same corpus.
+
+Usage:
+    python benchmarks/corpus.py --docs 1000 --seed 0 > corpus.txt
+"""
+
+import argparse
+import random
+import sys
+from pathlib import Path
+from typing import List
+
+ROOT = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(ROOT))
+
+from mood_detector.patterns import (
+    AMPLIFIER_WORDS,
+    CASUAL_WORDS,
+    EMOJI_WORDS,
+    INTENSITY_WORDS,
+    MOOD_PATTERNS,
+)
+
+FILLER = (
+    "the a to and of it in that is was for on with as at this but we they you "
+    "deploy backend meeting ticket build server today yesterday code review "
+    "team coffee weekend monday project release bug fix email call docs"
+).split()
+
+# (min words, max words, share of the corpus)
+LENGTHS = {
+    "short": (3, 12, 0.6),
+    "medium": (20, 60, 0.3),
+    "long": (150, 400, 0.1),
+}
+
+
+def mood_phrases() -> List[str]:
+    """Every concrete phrase MOOD_PATTERNS can match, e.g. "not happy"."""
+    phrases = []
+    for pattern in MOOD_PATTERNS:
+        options = [[]]
+        for spec in pattern["pattern"]:
+            value = spec["LOWER"]
+            values = value["IN"] if isinstance(value, dict) else [value]
+            options = [prefix + [word] for prefix in options for word in values]
+        phrases.extend(" ".join(words) for words in options)
+    return sorted(set(phrases))
+
+
+def generate_text(
+    rng: random.Random,
+    n_words: int,
+    mood_density: float = 0.25,
+    emoji_density: float = 0.03,
+    caps_density: float = 0.05,
+    phrases: List[str] = None,
+) -> str:
+    """One synthetic message of roughly ``n_words`` words."""
+    phrases = phrases or mood_phrases()
+    modifiers = INTENSITY_WORDS + CASUAL_WORDS + AMPLIFIER_WORDS
+    words = []
+    for _ in range(n_words):
+        roll = rng.random()
+        if roll < mood_density:
+            word = rng.choice(phrases)
+        elif roll < mood_density + 0.08:
+            word = rng.choice(modifiers)
+        elif roll < mood_density + 0.08 + emoji_density:
+            word = rng.choice(EMOJI_WORDS)
+        else:
+            word = rng.choice(FILLER)
+        if rng.random() < caps_density:
+            word = word.upper()
+        words.append(word)
+        if rng.random() < 0.06:
+            words[-1] += rng.choice([".", ",", "!", "!!", "?", "..."])
+    if rng.random() < 0.3:
+        words[-1] += rng.choice(["!", "!!!", "?", "?!"])
+    return " ".join(words)
+
+
+def generate_corpus(
+    n_docs: int,
+    seed: int = 0,
+    mood_density: float = 0.25,
+    emoji_density: float = 0.03,
+    caps_density: float = 0.05,
+    lengths: dict = LENGTHS,
+) -> List[str]:
+    """``n_docs`` synthetic texts with short/medium/long lengths mixed per ``lengths``."""
+    rng = random.Random(seed)
+    phrases = mood_phrases()
+    buckets = list(lengths.values())
+    weights = [share for _, _, share in buckets]
+    corpus = []
+    for _ in range(n_docs):
+        low, high, _ = rng.choices(buckets, weights)[0]
+        corpus.append(generate_text(
+            rng, rng.randint(low, high), mood_density, emoji_density, caps_density, phrases
+        ))
+    return corpus
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Generate a synthetic mood corpus")
+    parser.add_argument("--docs", type=int, default=1000)
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--mood-density", type=float, default=0.25)
+    parser.add_argument("--emoji-density", type=float, default=0.03)
+    parser.add_argument("--caps-density", type=float, default=0.05)
+    args = parser.parse_args()
+
+    for text in generate_corpus(
+        args.docs, args.seed, args.mood_density, args.emoji_density, args.caps_density
+    ):
+        print(text)
+
+
+if __name__ == "__main__":
+    main()
@@ -5,45 +5,379 @@ SpaCy Mood Detective - CLI runner
 Usage:
     python detective.py "Your text here"
     python detective.py --file examples/sample_texts.txt
+    python detective.py --mode full "Your text here"
+    python detective.py --engine fast "Your text here"
+    python detective.py --cache-db ~/.mood-cache.sqlite "Your text here"
+    python detective.py --batch --file chat.log --output moods.jsonl
+    cat events.jsonl | python detective.py --batch --format jsonl --text-field message
+    python detective.py --batch --file big.log --workers 8 --unordered
+    python detective.py --batch --file chat.log --output /dev/null --profile
+    python detective.py --batch --file alerts.log --dedup normalized
+    python detective.py --long --file novel.txt      # per-chunk mood timeline
+    python detective.py --daemon &          # keep a warm pipeline for later calls
+    python detective.py --daemon-stop
+
+While a daemon is running, single-text calls are answered by it (same
+engine and mode flags) instead of loading a pipeline; without one they run
+in-process as usual. --no-daemon always runs in-process.
 """
 
+import csv
 import json
+import os
 import sys
+import time
 import argparse
+from collections import deque
+from itertools import islice
 from pathlib import Path
+from typing import TYPE_CHECKING, Iterable, Iterator, TextIO
+
+# Only light modules at import time, so --help and argument errors return
+# at once; the engine, spaCy and the cache are imported where they're used.
+from mood_detector.dedup import DEDUP_MODES, DedupCounter, Deduplicated
+from mood_detector.metrics import STAGE_TIMINGS
+from mood_detector.pipeline import ENGINES, PIPELINE_MODES, instrument_pipeline, load_pipeline, pipe_results
 
-import spacy
-from mood_detector import create_mood_detector
+if TYPE_CHECKING:
+    from mood_detector.cache import ResultCache
 
 
-def load_nlp_model():
-    """Load spaCy model and add mood detector component."""
+def load_nlp_model(mode: str = "lite"):
+    """Load spaCy pipeline with the mood detector component."""
     try:
-        nlp = spacy.load("en_core_web_sm")
+        # Component timings are only recorded under --profile
+        return instrument_pipeline(load_pipeline(mode))
     except OSError:
         print("❌ Error: spaCy model 'en_core_web_sm' not found.")
         print("   Please run: python -m spacy download en_core_web_sm")
+        print("   Or use the tokenizer-only pipeline: --mode lite")
         sys.exit(1)
-    
-    # Add the mood detector component
-    if "mood_detector" not in nlp.pipe_names:
-        nlp.add_pipe("mood_detector", last=True)
-    
-    return nlp
 
 
-def analyze_text(text: str, nlp) -> dict:
-    """Analyze text and return mood detection results."""
+def load_engine():
+    from mood_detector.engine import MoodEngine
+
+    return MoodEngine()
+
+
+def run_analysis(text: str, nlp) -> dict:
+    """Run the engine or pipeline and return the full result, spans included."""
+    if hasattr(nlp, "analyze_many"):
+        return nlp.analyze(text)
+    
     doc = nlp(text)
     
-    result = {
+    return {
         "text": text,
         "mood": doc._.mood,
         "vibe_score": doc._.vibe_score,
         "emotional_triggers": doc._.emotional_triggers,
+        "emotional_spans": doc._.emotional_spans,
     }
+
+
+INPUT_FORMATS = ("lines", "jsonl", "csv")
+
+
+def read_texts(stream: TextIO, fmt: str = "lines", text_field: str = "text") -> Iterator[str]:
+    """Lazily yield the texts in an input stream, skipping blank ones."""
+    if fmt == "csv":
+        reader = csv.DictReader(stream)
+        if reader.fieldnames is None:
+            return
+        if text_field not in reader.fieldnames:
+            raise ValueError(f"CSV has no {text_field!r} column (columns: {', '.join(reader.fieldnames)})")
+        records = ((reader.line_num, row[text_field]) for row in reader)
+    elif fmt == "jsonl":
+        records = _jsonl_texts(stream, text_field)
+    else:
+        records = ((line_no, line.rstrip("\r\n")) for line_no, line in enumerate(stream, 1))
     
-    return result
+    for line_no, text in records:
+        if text is None:
+            print(f"⚠️  line {line_no}: no {text_field!r} text, skipped", file=sys.stderr)
+        elif text.strip():
+            yield text
+
+
+def _jsonl_texts(stream: TextIO, text_field: str):
+    for line_no, line in enumerate(stream, 1):
+        if not line.strip():
+            continue
+        try:
+            record = json.loads(line)
+        except ValueError as e:
+            print(f"⚠️  line {line_no}: invalid JSON ({e}), skipped", file=sys.stderr)
+            continue
+        text = record.get(text_field) if isinstance(record, dict) else record
+        yield line_no, text if isinstance(text, str) else None
+
+
+def analyze_stream(
+    texts: Iterable[str],
+    nlp,
+    batch_size: int = 256,
+    cache: "ResultCache" = None,
+    dedup: str = "exact",
+    dedup_counter: DedupCounter = None,
+) -> Iterator[dict]:
+    """
+    Lazily analyze texts in order, batching them through ``nlp.pipe``.
+    
+    Each chunk of ``batch_size`` texts is deduplicated first (see
+    ``mood_detector.dedup``), so repeated texts are analyzed once per chunk;
+    ``dedup_counter`` (if given) tallies how many were.
+    """
+    texts = iter(texts)
+    while True:
+        chunk = list(islice(texts, batch_size))
+        if not chunk:
+            return
+        batch = Deduplicated(chunk, dedup)
+        if dedup_counter is not None:
+            dedup_counter.add(batch)
+        if cache is not None:
+            results = cache.map(batch.unique, lambda missing: _analyze_many(missing, nlp, batch_size))
+        else:
+            results = list(_analyze_many(batch.unique, nlp, batch_size))
+        yield from batch.expand_dicts(results)
+
+
+def _analyze_many(texts: Iterable[str], nlp, batch_size: int) -> Iterator[dict]:
+    if hasattr(nlp, "analyze_many"):
+        yield from nlp.analyze_many(texts)
+        return
+    
+    yield from pipe_results(nlp, texts, batch_size)
+
+
+# Set in each worker process by _init_worker
+_worker_nlp = None
+
+
+def _init_worker(engine: str, mode: str):
+    """Load the engine or pipeline once per worker process."""
+    global _worker_nlp
+    _worker_nlp = load_engine() if engine == "fast" else load_pipeline(mode)
+
+
+def _analyze_chunk(texts, batch_size: int):
+    start = time.perf_counter()
+    results = list(_analyze_many(texts, _worker_nlp, batch_size))
+    return os.getpid(), results, time.perf_counter() - start
+
+
+def analyze_parallel(
+    texts: Iterable[str],
+    workers: int,
+    engine: str = "spacy",
+    mode: str = "lite",
+    batch_size: int = 256,
+    ordered: bool = True,
+    cache: "ResultCache" = None,
+    stats: dict = None,
+    dedup: str = "exact",
+    dedup_counter: DedupCounter = None,
+) -> Iterator[tuple]:
+    """
+    Analyze texts in ``workers`` processes, yielding (index, result) pairs.
+    
+    Input is split into chunks of ``batch_size`` texts, and at most two
+    chunks per worker are in flight, so memory stays bounded. Results come
+    back in input order unless ``ordered`` is False, in which case each
+    chunk is yielded as soon as it finishes. ``stats`` (if given) collects
+    ``{pid: [docs, busy seconds]}`` per worker. Only each chunk's distinct
+    texts are sent to the workers, as in ``analyze_stream``.
+    """
+    from concurrent.futures import FIRST_COMPLETED, ProcessPoolExecutor, wait
+
+    texts = iter(texts)
+    pending = deque()
+    next_index = 0
+    
+    with ProcessPoolExecutor(workers, initializer=_init_worker, initargs=(engine, mode)) as pool:
+        def submit() -> bool:
+            nonlocal next_index
+            chunk = list(islice(texts, batch_size))
+            if not chunk:
+                return False
+            batch = Deduplicated(chunk, dedup)
+            if dedup_counter is not None:
+                dedup_counter.add(batch)
+            unique = batch.unique
+            results, missing = cache.partition(unique) if cache is not None else ([None] * len(unique), range(len(unique)))
+            future = pool.submit(_analyze_chunk, [unique[i] for i in missing], batch_size) if missing else None
+            pending.append((next_index, batch, results, missing, future))
+            next_index += len(chunk)
+            return True
+        
+        def collect(entry):
+            start, batch, results, missing, future = entry
+            if future is not None:
+                pid, computed, seconds = future.result()
+                if stats is not None:
+                    worker = stats.setdefault(pid, [0, 0.0])
+                    worker[0] += len(computed)
+                    worker[1] += seconds
+                for i, result in zip(missing, computed):
+                    if cache is not None:
+                        cache.put(batch.unique[i], result)
+                    results[i] = result
+            return enumerate(batch.expand_dicts(results), start)
+        
+        while len(pending) < 2 * workers and submit():
+            pass
+        
+        while pending:
+            if ordered:
+                entry = pending.popleft()
+            else:
+                ready = [e for e in pending if e[4] is None or e[4].done()]
+                if not ready:
+                    wait([e[4] for e in pending], return_when=FIRST_COMPLETED)
+                    ready = [e for e in pending if e[4].done()]
+                entry = ready[0]
+                pending.remove(entry)
+            yield from collect(entry)
+            submit()
+
+
+def report_worker_stats(stats: dict, total_docs: int, elapsed: float, workers: int):
+    """Print docs/sec per worker and overall to stderr."""
+    for n, (pid, (docs, seconds)) in enumerate(sorted(stats.items()), 1):
+        rate = docs / seconds if seconds else 0.0
+        print(f"⚙️  worker {n} (pid {pid}): {docs:,} docs, {rate:,.0f} docs/sec", file=sys.stderr)
+    rate = total_docs / elapsed if elapsed else 0.0
+    print(
+        f"⚙️  total: {total_docs:,} docs in {elapsed:.2f}s, {rate:,.0f} docs/sec "
+        f"across {workers} workers",
+        file=sys.stderr,
+    )
+
+
+def report_dedup(counter: DedupCounter):
+    """Print how many of the batch's texts were duplicates to stderr."""
+    print(
+        f"🔁 dedup: {counter.texts:,} texts, {counter.unique:,} analyzed "
+        f"({counter.ratio:.1%} duplicates)",
+        file=sys.stderr,
+    )
+
+
+def print_profile(elapsed: float):
+    """Print the per-stage timing summary collected under --profile to stderr."""
+    rows = STAGE_TIMINGS.summary()
+    docs = max((row["count"] for row in rows), default=0)
+    print(f"\n⏱️  Stage timings ({docs:,} docs, {elapsed:.2f}s wall):", file=sys.stderr)
+    print(f"   {'stage':<20} {'calls':>8} {'total ms':>10} {'mean us':>9} {'p50 us':>8} {'p95 us':>8}", file=sys.stderr)
+    for row in rows:
+        print(
+            f"   {row['stage']:<20} {row['count']:>8,} {row['total_seconds'] * 1e3:>10.1f} "
+            f"{row['mean_seconds'] * 1e6:>9.1f} {row['p50_seconds'] * 1e6:>8.1f} "
+            f"{row['p95_seconds'] * 1e6:>8.1f}",
+            file=sys.stderr,
+        )
+    note = "p50/p95 are histogram bucket upper bounds"
+    if any(row["stage"].startswith("detector.") for row in rows):
+        note += "; detector.* stages run when results are read, after mood_detector"
+    print(f"   ({note})", file=sys.stderr)
+
+
+def run_batch(args, cache: "ResultCache" = None) -> int:
+    """Analyze one text per input record, writing one JSON result per line."""
+    from concurrent.futures.process import BrokenProcessPool
+
+    source = args.file or "-"
+    if source != "-" and not Path(source).exists():
+        print(f"❌ Error: File not found: {source}", file=sys.stderr)
+        return 1
+    
+    if args.workers is None:
+        nlp = load_engine() if args.engine == "fast" else load_nlp_model(args.mode)
+    input_stream = sys.stdin if source == "-" else open(source, encoding="utf-8", newline="")
+    output_stream = sys.stdout if args.output in (None, "-") else open(args.output, "w", encoding="utf-8")
+    
+    dedup = DedupCounter()
+    try:
+        texts = read_texts(input_stream, args.format, args.text_field)
+        if args.workers is None:
+            for result in analyze_stream(texts, nlp, args.batch_size, cache, args.dedup, dedup):
+                del result["emotional_spans"]
+                output_stream.write(json.dumps(result, ensure_ascii=False) + "\n")
+        else:
+            stats = {}
+            start = time.perf_counter()
+            total = 0
+            results = analyze_parallel(
+                texts, args.workers, args.engine, args.mode, args.batch_size,
+                ordered=not args.unordered, cache=cache, stats=stats,
+                dedup=args.dedup, dedup_counter=dedup,
+            )
+            for index, result in results:
+                del result["emotional_spans"]
+                if args.unordered:
+                    # Unordered output carries the record's position in the input
+                    result = dict(index=index, **result)
+                output_stream.write(json.dumps(result, ensure_ascii=False) + "\n")
+                total += 1
+            report_worker_stats(stats, total, time.perf_counter() - start, args.workers)
+        if args.dedup != "off" and dedup.texts:
+            report_dedup(dedup)
+    except ValueError as exc:
+        print(f"❌ Error: {exc}", file=sys.stderr)
+        return 1
+    except BrokenProcessPool:
+        print("❌ Error: a worker process failed to start or crashed (see above)", file=sys.stderr)
+        return 1
+    finally:
+        if input_stream is not sys.stdin:
+            input_stream.close()
+        if output_stream is not sys.stdout:
+            output_stream.close()
+    return 0
+
+
+def run_daemon(args) -> int:
+    """Serve analyses on the daemon socket until stopped, with --engine/--mode preloaded."""
+    import signal
+    
+    from mood_detector.daemon import MoodDaemon
+    
+    daemon = MoodDaemon(args.socket)
+    try:
+        daemon.bind()
+    except RuntimeError as exc:
+        print(f"❌ Error: {exc}", file=sys.stderr)
+        return 1
+    try:
+        if args.engine == "fast":
+            daemon.analyzer("fast")
+        else:
+            try:
+                daemon.analyzer("spacy", args.mode)
+            except OSError:
+                daemon.close()
+                load_nlp_model(args.mode)  # prints the model hint and exits
+        # SIGTERM stops the daemon like Ctrl+C, removing the socket
+        signal.signal(signal.SIGTERM, lambda signum, frame: sys.exit(0))
+        print(f"🕵️‍♂️  Mood daemon listening on {daemon.socket_path} (pid {os.getpid()})", file=sys.stderr)
+        daemon.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        daemon.close()
+    return 0
+
+
+def stop_daemon(socket_path: str = None) -> int:
+    """Ask a running daemon to shut down."""
+    from mood_detector.daemon import request
+    
+    if request({"op": "shutdown"}, socket_path, timeout=5.0) is None:
+        print("❌ Error: no mood daemon is running", file=sys.stderr)
+        return 1
+    return 0
 
 
 def format_output(result: dict, json_output: bool = False) -> str:
@@ -94,6 +428,28 @@ def format_output(result: dict, json_output: bool = False) -> str:
     return "\n".join(output)
 
 
+def format_long_output(result: dict, json_output: bool = False) -> str:
+    """Format a long-document analysis: the aggregate, then the chunk timeline."""
+    if json_output:
+        return json.dumps(result, indent=2)
+    
+    output = []
+    output.append("\n" + "=" * 60)
+    output.append("🕵️‍♂️  SPA CY MOOD DETECTIVE REPORT (LONG DOCUMENT)")
+    output.append("=" * 60)
+    output.append(f"\n📝 Length: {result['length']} characters in {len(result['chunks'])} chunks")
+    output.append(f"\n🎭 Overall Mood: {result['mood']}")
+    output.append(f"\n📊 Overall Vibe Score™: {result['vibe_score']}/10")
+    if result["chunks"]:
+        output.append("\n🕰️  Timeline:")
+        for chunk in result["chunks"]:
+            span = f"{chunk['start']}-{chunk['end']}"
+            output.append(f"   {span:>15}  {chunk['vibe_score']:>3}  {chunk['mood']}")
+    output.append("\n" + "=" * 60 + "\n")
+    
+    return "\n".join(output)
+
+
 def main():
     """Main CLI entry point."""
     parser = argparse.ArgumentParser(
@@ -114,8 +470,135 @@ def main():
         action="store_true",
         help="Output results as JSON"
     )
+    parser.add_argument(
+        "--mode", "-m",
+        choices=PIPELINE_MODES,
+        default="lite",
+        help="Pipeline mode: 'lite' (tokenizer only, fast) or 'full' (en_core_web_sm)"
+    )
+    parser.add_argument(
+        "--engine", "-e",
+        choices=ENGINES,
+        default="spacy",
+        help="Analysis engine: 'spacy' pipeline or the spaCy-free 'fast' engine"
+    )
+    parser.add_argument(
+        "--cache-db",
+        default=os.environ.get("MOOD_CACHE_DB"),
+        help="SQLite file caching results across runs (default: $MOOD_CACHE_DB)"
+    )
+    
+    parser.add_argument(
+        "--batch", "-b",
+        action="store_true",
+        help="Analyze every record of --file (or stdin) and write one JSON result per line"
+    )
+    parser.add_argument(
+        "--format",
+        choices=INPUT_FORMATS,
+        default="lines",
+        help="Batch input format: plain 'lines', 'jsonl' or 'csv' (default: lines)"
+    )
+    parser.add_argument(
+        "--text-field",
+        default="text",
+        help="JSONL field / CSV column holding the text (default: text)"
+    )
+    parser.add_argument(
+        "--output", "-o",
+        help="Batch output file (default: stdout)"
+    )
+    parser.add_argument(
+        "--batch-size",
+        type=int,
+        default=256,
+        help="Texts per nlp.pipe batch (default: 256)"
+    )
+    parser.add_argument(
+        "--dedup",
+        choices=DEDUP_MODES,
+        default="exact",
+        help="With --batch, analyze repeated texts once per batch: 'exact' copies, "
+             "'normalized' with whitespace collapsed first, or 'off' (default: exact)"
+    )
+    parser.add_argument(
+        "--workers", "-w",
+        type=int,
+        help="Run batch mode in N worker processes, each loading the pipeline once"
+    )
+    parser.add_argument(
+        "--unordered",
+        action="store_true",
+        help="With --workers, write results as soon as they are ready (adds an 'index' field)"
+    )
+    parser.add_argument(
+        "--long", "-l",
+        action="store_true",
+        help="Analyze the text in chunks and report a per-chunk mood timeline plus an overall mood"
+    )
+    parser.add_argument(
+        "--chunk-chars",
+        type=int,
+        default=None,
+        help="With --long, maximum characters per chunk (default: 2000)"
+    )
+    parser.add_argument(
+        "--profile",
+        action="store_true",
+        help="Time each pipeline stage and print a summary to stderr"
+    )
+    
+    parser.add_argument(
+        "--daemon",
+        action="store_true",
+        help="Serve analyses from a warm pipeline on a local Unix socket until stopped"
+    )
+    parser.add_argument(
+        "--daemon-stop",
+        action="store_true",
+        help="Stop a running daemon"
+    )
+    parser.add_argument(
+        "--no-daemon",
+        action="store_true",
+        help="Analyze in-process even if a daemon is running"
+    )
+    parser.add_argument(
+        "--socket",
+        default=None,
+        help="Daemon socket path (default: $MOOD_DAEMON_SOCKET or a per-user socket)"
+    )
     
     args = parser.parse_args()
+    if args.workers is not None and args.workers < 1:
+        parser.error("--workers must be at least 1")
+    if args.profile and args.workers is not None:
+        parser.error("--profile times the current process; run it without --workers")
+    if args.chunk_chars is not None and args.chunk_chars < 1:
+        parser.error("--chunk-chars must be at least 1")
+    if args.long and args.batch:
+        parser.error("--long analyzes one document; it can't be combined with --batch")
+    if args.daemon and args.daemon_stop:
+        parser.error("--daemon and --daemon-stop are mutually exclusive")
+    if args.daemon_stop:
+        sys.exit(stop_daemon(args.socket))
+    if args.daemon:
+        sys.exit(run_daemon(args))
+    if args.profile:
+        STAGE_TIMINGS.enable()
+    started = time.perf_counter()
+    
+    cache = None
+    if args.cache_db:
+        from mood_detector.cache import ResultCache, SQLiteStore
+        
+        cache = ResultCache(store=SQLiteStore(args.cache_db))
+    
+    if args.batch:
+        status = run_batch(args, cache)
+        if args.profile:
+            print_profile(time.perf_counter() - started)
+        sys.exit(status)
     
     # Get input text
     if args.file:
@@ -140,13 +623,38 @@ def main():
             print("❌ No text provided.")
             sys.exit(1)
     
-    # Load model and analyze
-    nlp = load_nlp_model()
-    result = analyze_text(text, nlp)
+    if args.long:
+        # Chunks stream through an in-process pipeline; only the timeline is kept
+        from mood_detector.longdoc import DEFAULT_CHUNK_CHARS, analyze_long
+        
+        nlp = load_engine() if args.engine == "fast" else load_nlp_model(args.mode)
+        result = analyze_long(text, nlp, args.chunk_chars or DEFAULT_CHUNK_CHARS)
+        print(format_long_output(result, json_output=args.json))
+        if args.profile:
+            print_profile(time.perf_counter() - started)
+        return
+    
+    # Ask the daemon, or load the model and analyze; on a cache hit neither
+    # happens. --profile times this process, so it never uses the daemon.
+    result = cache.get(text) if cache is not None else None
+    if result is None and not (args.no_daemon or args.profile):
+        from mood_detector.daemon import remote_analyze
+        
+        result = remote_analyze(text, args.engine, args.mode, args.socket)
+        if result is not None and cache is not None:
+            cache.put(text, result)
+    if result is None:
+        nlp = load_engine() if args.engine == "fast" else load_nlp_model(args.mode)
+        result = run_analysis(text, nlp)
+        if cache is not None:
+            cache.put(text, result)
+    del result["emotional_spans"]
     
     # Output results
     output = format_output(result, json_output=args.json)
     print(output)
+    if args.profile:
+        print_profile(time.perf_counter() - started)
 
 
 if __name__ == "__main__":
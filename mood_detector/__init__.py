@@ -2,7 +2,42 @@
 SpaCy Mood Detective - A fun NLP project that detects emotional chaos in text.
 """
 
-from .detector import MoodDetector, create_mood_detector
+from .pipeline import load_pipeline, PIPELINE_MODES, ENGINES, RESULT_FIELDS
 
-__all__ = ["MoodDetector", "create_mood_detector"]
+__all__ = [
+    "MoodDetector",
+    "create_mood_detector",
+    "load_pipeline",
+    "PIPELINE_MODES",
+    "ENGINES",
+    "RESULT_FIELDS",
+    "MoodEngine",
+    "MoodResult",
+    "analyze",
+    "analyze_many",
+    "ConversationMood",
+]
 
+# Everything but the pipeline constants is imported on first use: the
+# spaCy-backed names so that the fast-path engine can be used without paying
+# for ``import spacy``, and the engine so that CLI startup (``--help``, or a
+# call answered by the daemon) doesn't compile the lexicon.
+_LAZY_ATTRS = {
+    "MoodDetector": ".detector",
+    "create_mood_detector": ".detector",
+    "MoodEngine": ".engine",
+    "analyze": ".engine",
+    "analyze_many": ".engine",
+    "MoodResult": ".result",
+    "ConversationMood": ".conversation",
+}
+
+
+def __getattr__(name):
+    if name in _LAZY_ATTRS:
+        from importlib import import_module
+
+        value = getattr(import_module(_LAZY_ATTRS[name], __name__), name)
+        globals()[name] = value
+        return value
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
@@ -0,0 +1,67 @@
+"""
+Aho-Corasick automaton for finding many phrases in one pass over a text.
+"""
+
+from collections import deque
+from typing import Dict, Iterable, List, Tuple
+
+
+class PhraseAutomaton:
+    """Multi-phrase substring matcher.
+
+    The trie's failure links are folded into a full transition table at build
+    time, so ``first_occurrences`` does a single dictionary lookup per
+    character no matter how many phrases were compiled in.
+    """
+
+    def __init__(self, phrases: Iterable[str]):
+        self.phrases: List[str] = list(dict.fromkeys(p for p in phrases if p))
+
+        # Build the trie
+        goto: List[Dict[str, int]] = [{}]
+        outputs: List[List[str]] = [[]]
+        for phrase in self.phrases:
+            state = 0
+            for char in phrase:
+                next_state = goto[state].get(char)
+                if next_state is None:
+                    next_state = len(goto)
+                    goto[state][char] = next_state
+                    goto.append({})
+                    outputs.append([])
+                state = next_state
+            outputs[state].append(phrase)
+
+        # Breadth-first pass: compute failure links and fold them into the
+        # transition table so matching never has to follow them
+        fail = [0] * len(goto)
+        delta: List[Dict[str, int]] = [dict(goto[0])]
+        delta.extend({} for _ in range(len(goto) - 1))
+        queue = deque(goto[0].values())
+        while queue:
+            state = queue.popleft()
+            outputs[state].extend(outputs[fail[state]])
+            transitions = dict(delta[fail[state]])
+            for char, next_state in goto[state].items():
+                fail[next_state] = delta[fail[state]].get(char, 0) if state else 0
+                transitions[char] = next_state
+                queue.append(next_state)
+            delta[state] = transitions
+
+        self._delta = delta
+        self._outputs: List[Tuple[str, ...]] = [tuple(out) for out in outputs]
+
+    def first_occurrences(self, text: str) -> Dict[str, int]:
+        """Return ``{phrase: start index of its first occurrence}`` for every phrase found."""
+        delta = self._delta
+        outputs = self._outputs
+        first: Dict[str, int] = {}
+        state = 0
+        for end, char in enumerate(text, 1):
+            state = delta[state].get(char, 0)
+            found = outputs[state]
+            if found:
+                for phrase in found:
+                    if phrase not in first:
+                        first[phrase] = end - len(phrase)
+        return first
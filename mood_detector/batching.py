@@ -0,0 +1,106 @@
+"""
+Micro-batching of concurrent single-item requests.
+
+Requests that arrive within a short window are grouped and handed to one
+batch function (e.g. a single ``nlp.pipe`` call), and each caller gets its
+own result back. This trades a small bounded delay for far fewer
+per-call overheads under load.
+"""
+
+import asyncio
+from typing import Any, Awaitable, Callable, Dict, List
+
+
+class MicroBatcher:
+    """
+    Collect items submitted concurrently and process them in batches.
+
+    A batch is dispatched when ``max_batch_size`` items are waiting or
+    ``max_wait`` seconds after its first item arrived, whichever comes
+    first. With ``adaptive`` set, an item that arrives while no batch is
+    running is dispatched at once, so the window only adds latency when
+    the server is already busy.
+
+    ``process`` receives a list of items and must return a list of results
+    in the same order. If it raises, every caller in that batch gets the
+    exception.
+    """
+
+    def __init__(
+        self,
+        process: Callable[[List[Any]], Awaitable[List[Any]]],
+        max_batch_size: int = 32,
+        max_wait: float = 0.005,
+        adaptive: bool = True,
+    ):
+        if max_batch_size < 1 or max_wait < 0:
+            raise ValueError("max_batch_size must be >= 1 and max_wait >= 0")
+
+        self.process = process
+        self.max_batch_size = max_batch_size
+        self.max_wait = max_wait
+        self.adaptive = adaptive
+
+        self._pending = []
+        self._timer = None
+        self._running = 0
+        self._batches = 0
+        self._items = 0
+        self._largest = 0
+
+    async def submit(self, item: Any) -> Any:
+        """Queue ``item`` for the next batch and wait for its result."""
+        loop = asyncio.get_running_loop()
+        future = loop.create_future()
+        self._pending.append((item, future))
+
+        if len(self._pending) >= self.max_batch_size:
+            self._flush()
+        elif self.adaptive and not self._running:
+            self._flush()
+        elif self._timer is None:
+            self._timer = loop.call_later(self.max_wait, self._flush)
+
+        return await future
+
+    def _flush(self) -> None:
+        if self._timer is not None:
+            self._timer.cancel()
+            self._timer = None
+
+        while self._pending:
+            batch = self._pending[:self.max_batch_size]
+            del self._pending[:self.max_batch_size]
+            self._running += 1
+            asyncio.ensure_future(self._run(batch))
+
+    async def _run(self, batch) -> None:
+        self._batches += 1
+        self._items += len(batch)
+        self._largest = max(self._largest, len(batch))
+        try:
+            results = await self.process([item for item, _ in batch])
+        except Exception as exc:
+            for _, future in batch:
+                if not future.done():
+                    future.set_exception(exc)
+        else:
+            for (_, future), result in zip(batch, results):
+                if not future.done():
+                    future.set_result(result)
+        finally:
+            self._running -= 1
+
+    def stats(self) -> Dict[str, Any]:
+        """Batching counters, for sizing the window and batch size."""
+        return {
+            "max_batch_size": self.max_batch_size,
+            "max_wait": self.max_wait,
+            "adaptive": self.adaptive,
+            "pending": len(self._pending),
+            "running_batches": self._running,
+            "batches": self._batches,
+            "items": self._items,
+            "avg_batch_size": self._items / self._batches if self._batches else 0.0,
+            "largest_batch": self._largest,
+        }
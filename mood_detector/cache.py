@@ -0,0 +1,265 @@
+"""
+Content-addressed cache for analysis results.
+
+Results are keyed by a hash of the text plus the pattern-set version, so
+a change to any pattern table invalidates old entries. The
+in-memory cache is LRU with an optional TTL and a memory budget; a SQLite
+file can sit behind it so results survive restarts.
+
+Texts are keyed exactly as given. Case, whitespace and punctuation change
+the mood and vibe score, and even texts that differ only in Unicode form
+(NFC vs NFD) have different tokens and offsets, so a hit always returns
+the caller's own text.
+"""
+
+import hashlib
+import json
+import os
+import sqlite3
+import threading
+import time
+from collections import OrderedDict
+from typing import Any, Callable, Dict, Iterable, List, Optional, Union
+
+from .lexicon import pattern_set_version
+from .result import MoodResult
+
+# A result dict, or a MoodResult (kept as is in memory, stored as a dict)
+Result = Union[Dict[str, Any], MoodResult]
+
+
+def cache_key(text: str, version: Optional[str] = None) -> str:
+    """Hash of the text under a pattern-set version."""
+    version = version or pattern_set_version()
+    digest = hashlib.blake2b(digest_size=16)
+    digest.update(version.encode("ascii"))
+    digest.update(b"\0")
+    digest.update(text.encode("utf-8"))
+    return digest.hexdigest()
+
+
+def _result_size(result: Result) -> int:
+    """Rough memory footprint of a result in bytes."""
+    if isinstance(result, MoodResult):
+        return result.nbytes()
+    size = 400 + 2 * len(result["text"])
+    for trigger in result["emotional_triggers"]:
+        size += 250 + 2 * len(trigger["text"])
+    for span in result.get("emotional_spans", ()):
+        size += 150 + 2 * len(span[0])
+    return size
+
+
+def _copy(result: Result) -> Result:
+    # Callers may add or delete keys (the CLI drops emotional_spans);
+    # MoodResults are never modified after they're built
+    if isinstance(result, MoodResult):
+        return result
+    return dict(result)
+
+
+class SQLiteStore:
+    """Persistent key -> result store in a single SQLite table."""
+
+    def __init__(self, path: str):
+        self.path = path
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(path, check_same_thread=False)
+        with self._lock, self._conn:
+            self._conn.execute(
+                "CREATE TABLE IF NOT EXISTS results ("
+                "key TEXT PRIMARY KEY, value TEXT NOT NULL, created REAL NOT NULL)"
+            )
+
+    def get(self, key: str, ttl: Optional[float] = None) -> Optional[Result]:
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT value, created FROM results WHERE key = ?", (key,)
+            ).fetchone()
+        if row is None or (ttl is not None and time.time() - row[1] > ttl):
+            return None
+        result = json.loads(row[0])
+        if "emotional_spans" in result:
+            result["emotional_spans"] = [tuple(span) for span in result["emotional_spans"]]
+        return result
+
+    def put(self, key: str, result: Result) -> None:
+        if isinstance(result, MoodResult):
+            result = result.to_dict()
+        value = json.dumps(result, ensure_ascii=False)
+        with self._lock, self._conn:
+            self._conn.execute(
+                "INSERT OR REPLACE INTO results (key, value, created) VALUES (?, ?, ?)",
+                (key, value, time.time()),
+            )
+
+    def clear(self) -> None:
+        with self._lock, self._conn:
+            self._conn.execute("DELETE FROM results")
+
+    def close(self) -> None:
+        self._conn.close()
+
+
+class ResultCache:
+    """
+    Thread-safe LRU cache of analysis results.
+
+    Entries are evicted least-recently-used first once either
+    ``max_entries`` or ``max_bytes`` is exceeded, and expire after ``ttl``
+    seconds when a TTL is set. ``store`` (e.g. a SQLiteStore) is consulted
+    on a memory miss and written through on every put.
+    """
+
+    def __init__(
+        self,
+        max_entries: int = 10_000,
+        max_bytes: int = 64 * 1024 * 1024,
+        ttl: Optional[float] = None,
+        store: Optional[SQLiteStore] = None,
+    ):
+        self.max_entries = max_entries
+        self.max_bytes = max_bytes
+        self.ttl = ttl
+        self.store = store
+        self.version = pattern_set_version()
+
+        self._entries = OrderedDict()  # key -> (result, size, created)
+        self._lock = threading.Lock()
+        self._bytes = 0
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.expirations = 0
+        self.store_hits = 0
+
+    def key(self, text: str) -> str:
+        return cache_key(text, self.version)
+
+    def get(self, text: str) -> Optional[Result]:
+        """Return a copy of the cached result for ``text``, or None."""
+        key = self.key(text)
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None:
+                if self.ttl is not None and time.time() - entry[2] > self.ttl:
+                    self._remove(key)
+                    self.expirations += 1
+                else:
+                    self._entries.move_to_end(key)
+                    self.hits += 1
+                    return _copy(entry[0])
+
+        result = self.store.get(key, self.ttl) if self.store is not None else None
+        with self._lock:
+            if result is None:
+                self.misses += 1
+                return None
+            self.hits += 1
+            self.store_hits += 1
+            self._insert(key, result)
+        return _copy(result)
+
+    def put(self, text: str, result: Result) -> None:
+        key = self.key(text)
+        result = _copy(result)
+        with self._lock:
+            self._insert(key, result)
+        if self.store is not None:
+            self.store.put(key, result)
+
+    def get_or_compute(self, text: str, compute: Callable[[str], Result]) -> Result:
+        result = self.get(text)
+        if result is None:
+            result = compute(text)
+            self.put(text, result)
+        return result
+
+    def partition(self, texts: List[str]):
+        """
+        Look up every text; return the results (None for misses) and the
+        indices of the misses.
+        """
+        results = [self.get(text) for text in texts]
+        missing = [i for i, result in enumerate(results) if result is None]
+        return results, missing
+
+    def map(self, texts: Iterable[str], compute_many: Callable[[List[str]], Iterable[Result]]) -> List[Result]:
+        """
+        Analyze ``texts`` in order, computing only the misses.
+
+        ``compute_many`` gets the missing texts as one list (so they can go
+        through a single ``nlp.pipe`` call) and returns results in order.
+        """
+        texts = list(texts)
+        results, missing = self.partition(texts)
+        if missing:
+            computed = compute_many([texts[i] for i in missing])
+            for i, result in zip(missing, computed):
+                self.put(texts[i], result)
+                results[i] = result
+        return results
+
+    def _insert(self, key: str, result: Result) -> None:
+        if key in self._entries:
+            self._remove(key)
+        size = _result_size(result)
+        if size > self.max_bytes or self.max_entries < 1:
+            return
+        self._entries[key] = (result, size, time.time())
+        self._bytes += size
+        while len(self._entries) > self.max_entries or self._bytes > self.max_bytes:
+            self._remove(next(iter(self._entries)))
+            self.evictions += 1
+
+    def _remove(self, key: str) -> None:
+        _, size, _ = self._entries.pop(key)
+        self._bytes -= size
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+            self._bytes = 0
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                "pattern_version": self.version,
+                "entries": len(self._entries),
+                "bytes": self._bytes,
+                "max_entries": self.max_entries,
+                "max_bytes": self.max_bytes,
+                "ttl": self.ttl,
+                "hits": self.hits,
+                "misses": self.misses,
+                "hit_rate": self.hits / lookups if lookups else 0.0,
+                "evictions": self.evictions,
+                "expirations": self.expirations,
+                "store_hits": self.store_hits,
+                "store": self.store.path if self.store is not None else None,
+            }
+
+
+def cache_from_env(environ=None) -> Optional[ResultCache]:
+    """
+    Build a ResultCache from MOOD_CACHE_* environment variables.
+
+    MOOD_CACHE_SIZE (entries, 0 disables the cache), MOOD_CACHE_MB,
+    MOOD_CACHE_TTL (seconds) and MOOD_CACHE_DB (SQLite path).
+    """
+    environ = os.environ if environ is None else environ
+    max_entries = int(environ.get("MOOD_CACHE_SIZE", "10000"))
+    if max_entries <= 0:
+        return None
+    ttl = environ.get("MOOD_CACHE_TTL")
+    db_path = environ.get("MOOD_CACHE_DB")
+    return ResultCache(
+        max_entries=max_entries,
+        max_bytes=int(float(environ.get("MOOD_CACHE_MB", "64")) * 1024 * 1024),
+        ttl=float(ttl) if ttl else None,
+        store=SQLiteStore(db_path) if db_path else None,
+    )
@@ -0,0 +1,112 @@
+"""
+The compiled lexicon as one serializable artifact.
+
+``CompiledLexicon`` bundles everything the scorers build from patterns.py:
+the label and token indexes (``CompiledPatterns``), the weight and
+combination tables (``MoodScorer``) and the trigger automaton. It
+round-trips through msgpack bytes tagged with the ``pattern_set_version()``
+it was built from, so a saved pipeline can't silently score with tables
+that no longer match the code.
+"""
+
+from pathlib import Path
+from typing import Any, Dict, Optional, Sequence, Union
+
+import srsly
+
+from .automaton import PhraseAutomaton
+from .lexicon import CompiledPatterns, pattern_set_version
+from .scoring import TRIGGER_PHRASES, MoodScorer, trigger_automaton
+
+# File name inside a component directory written by ``MoodDetector.to_disk``
+LEXICON_FILE = "lexicon.msgpack"
+
+
+def msgpack_loads(data: bytes) -> Any:
+    """Unpack msgpack bytes with arrays as tuples, which is what the tables hold.
+
+    Unlike ``srsly.msgpack_loads`` this skips srsly's registered decoders
+    (numpy arrays and the like), which would run on every map and take most
+    of the load time.
+    """
+    return srsly.msgpack.loads(data, raw=False, use_list=False, object_pairs_hook=None)
+
+
+class CompiledLexicon:
+    """Compiled patterns, scorer tables and trigger automaton, with their version.
+
+    The trigger automaton is only built when first used, since documents
+    that never ask for triggers don't need it.
+    """
+
+    def __init__(
+        self,
+        patterns: CompiledPatterns,
+        scorer: MoodScorer,
+        trigger_phrases: Sequence[str] = TRIGGER_PHRASES,
+        version: Optional[str] = None,
+    ):
+        self.patterns = patterns
+        self.scorer = scorer
+        self.trigger_phrases = tuple(trigger_phrases)
+        self.version = version or pattern_set_version()
+        self._triggers: Optional[PhraseAutomaton] = None
+
+    @classmethod
+    def build(cls) -> "CompiledLexicon":
+        """Compile the tables in patterns.py."""
+        patterns = CompiledPatterns()
+        return cls(patterns, MoodScorer(patterns))
+
+    @property
+    def triggers(self) -> PhraseAutomaton:
+        if self._triggers is None:
+            if self.trigger_phrases == TRIGGER_PHRASES:
+                # The installed phrases: share the automaton scan_text uses
+                self._triggers = trigger_automaton()
+            else:
+                self._triggers = PhraseAutomaton(self.trigger_phrases)
+        return self._triggers
+
+    def to_dict(self) -> Dict[str, Any]:
+        """The tables as plain lists and dicts, tagged with their version (for msgpack)."""
+        return {
+            "version": self.version,
+            "patterns": self.patterns.to_dict(),
+            "scorer": self.scorer.to_dict(),
+            # Building the automaton from its phrases is faster than
+            # unpacking its full transition table
+            "trigger_phrases": self.trigger_phrases,
+        }
+
+    @classmethod
+    def from_dict(cls, msg: Dict[str, Any]) -> "CompiledLexicon":
+        """Rebuild from ``to_dict`` output.
+
+        Raises ``ValueError`` if it was built from different pattern tables
+        or scoring rules than the installed ones.
+        """
+        version = msg.get("version")
+        if version != pattern_set_version():
+            raise ValueError(
+                f"Compiled lexicon version {version!r} does not match the installed patterns "
+                f"({pattern_set_version()!r}); re-save the pipeline with this version"
+            )
+        patterns = CompiledPatterns.from_dict(msg["patterns"])
+        scorer = MoodScorer.from_dict(patterns, msg["scorer"])
+        return cls(patterns, scorer, msg["trigger_phrases"], version)
+
+    def to_bytes(self) -> bytes:
+        return srsly.msgpack_dumps(self.to_dict())
+
+    @classmethod
+    def from_bytes(cls, data: bytes) -> "CompiledLexicon":
+        """Load ``to_bytes`` output; raises ``ValueError`` like ``from_dict``."""
+        return cls.from_dict(msgpack_loads(data))
+
+    def to_disk(self, path: Union[str, Path]) -> None:
+        Path(path).write_bytes(self.to_bytes())
+
+    @classmethod
+    def from_disk(cls, path: Union[str, Path]) -> "CompiledLexicon":
+        return cls.from_bytes(Path(path).read_bytes())
@@ -0,0 +1,126 @@
+"""
+Incremental mood of a growing conversation.
+
+``ConversationMood`` keeps the running label counts, vibe modifier keys and
+character counts of the messages so far, so each ``append`` only analyzes
+the new message instead of the whole conversation again. With a
+``window`` only the last N messages count; the oldest one's counts are
+subtracted when it falls out, in time independent of the conversation's
+length.
+
+The result always equals analyzing the (windowed) messages joined with
+newlines as one text.
+"""
+
+from array import array
+from collections import Counter, deque
+from contextlib import nullcontext
+from typing import Any, Deque, Dict, Optional, Tuple
+
+from .scoring import LabelCounts, MoodCounts
+
+# Messages are scored as if joined with this separator
+SEPARATOR = "\n"
+
+
+class ConversationMood:
+    """Running mood and vibe score of a conversation, one message at a time.
+
+    ``analyzer`` is a ``MoodEngine`` or a pipeline with the mood_detector
+    component. ``window`` keeps only the last N messages.
+    """
+
+    def __init__(self, analyzer, window: Optional[int] = None):
+        if window is not None and window < 1:
+            raise ValueError("window must be >= 1")
+        if hasattr(analyzer, "mood_counts"):
+            self.scorer, self.vibe_lexicon = analyzer.scorer, analyzer.vibe_lexicon
+            self._count = analyzer.mood_counts
+            self._zone = None
+        else:
+            detector = analyzer.get_pipe("mood_detector")
+            self.scorer, self.vibe_lexicon = detector.scorer, detector.vibe_lexicon
+            self._count = lambda text: detector.mood_counts(analyzer(text))
+            # Strings interned for each message are freed again (spaCy >= 3.8)
+            self._zone = getattr(analyzer, "memory_zone", None)
+        self.window = window
+        self._label_counts = array("I", bytes(4 * len(self.scorer.labels)))
+        # label ID -> (message number, rank among the message's labels) of
+        # each windowed message it occurs in; without a window only the first
+        self._positions: Dict[int, Deque[Tuple[int, int]]] = {}
+        # modifier key -> number of messages containing it
+        self._modifiers: Counter = Counter()
+        self._chars = [0, 0, 0, 0]  # message lengths, uppercase, "!", "?"
+        self._messages: Deque[Tuple[int, MoodCounts]] = deque()
+        self._appended = 0
+
+    def __len__(self) -> int:
+        """Number of messages currently counted."""
+        return min(self._appended, self.window) if self.window is not None else self._appended
+
+    def append(self, text: str) -> Dict[str, Any]:
+        """Add a message (evicting the oldest beyond the window) and return ``result()``."""
+        with self._zone() if self._zone is not None else nullcontext():
+            counts = self._count(text)
+        seq = self._appended
+        self._appended += 1
+
+        label_counts = self._label_counts
+        for rank, label_id in enumerate(counts.labels.order):
+            label_counts[label_id] += counts.labels.counts[label_id]
+            positions = self._positions.setdefault(label_id, deque())
+            if self.window is not None or not positions:
+                positions.append((seq, rank))
+        self._modifiers.update(counts.modifiers)
+        self._add_chars(counts, 1)
+
+        if self.window is not None:
+            self._messages.append((seq, counts))
+            if len(self._messages) > self.window:
+                self._evict()
+        return self.result()
+
+    def _evict(self) -> None:
+        seq, counts = self._messages.popleft()
+        label_counts = self._label_counts
+        for label_id in counts.labels.order:
+            label_counts[label_id] -= counts.labels.counts[label_id]
+            positions = self._positions[label_id]
+            positions.popleft()
+            if not positions:
+                del self._positions[label_id]
+        self._modifiers.subtract(counts.modifiers)
+        for key in counts.modifiers:
+            if not self._modifiers[key]:
+                del self._modifiers[key]
+        self._add_chars(counts, -1)
+
+    def _add_chars(self, counts: MoodCounts, sign: int) -> None:
+        chars = self._chars
+        chars[0] += sign * counts.text_len
+        chars[1] += sign * counts.upper_chars
+        chars[2] += sign * counts.exclamations
+        chars[3] += sign * counts.questions
+
+    def counts(self) -> MoodCounts:
+        """The current window's ``MoodCounts``."""
+        labels = LabelCounts(len(self.scorer.labels), ())
+        labels.counts = array("I", self._label_counts)
+        # Labels in order of first occurrence in the window
+        labels.order = sorted(self._positions, key=lambda label_id: self._positions[label_id][0])
+        labels.mask = sum(1 << label_id for label_id in labels.order)
+        text_len, upper_chars, exclamations, questions = self._chars
+        # Every message but the first is preceded by a separator
+        text_len += len(SEPARATOR) * max(len(self) - 1, 0)
+        return MoodCounts(labels, frozenset(self._modifiers), text_len, upper_chars, exclamations, questions)
+
+    def result(self) -> Dict[str, Any]:
+        """``{"messages", "mood", "vibe_score", "label_counts"}`` of the current window."""
+        counts = self.counts()
+        labels = counts.labels
+        return {
+            "messages": len(self),
+            "mood": self.scorer.compute_mood(labels),
+            "vibe_score": self.scorer.compute_vibe_score(labels, counts.features(self.vibe_lexicon)),
+            "label_counts": {self.scorer.labels[label_id]: labels.counts[label_id] for label_id in labels.order},
+        }
@@ -0,0 +1,200 @@
+"""
+Warm analysis daemon behind a local Unix socket.
+
+``MoodDaemon`` keeps loaded pipelines (and fast engines) in memory and
+answers newline-delimited JSON requests, one response line per request:
+
+    {"text": "...", "engine": "spacy", "mode": "lite"}  -> {"result": {...}}
+    {"op": "ping"}                                       -> {"ok": true, "pid": ...}
+    {"op": "shutdown"}                                   -> {"ok": true}
+
+Errors come back as ``{"error": "..."}``. The client side (``request`` and
+``remote_analyze``) only needs ``socket`` and ``json``, so a CLI call that
+finds a running daemon never imports spaCy; when no daemon answers they
+return None and the caller analyzes in-process.
+"""
+
+import json
+import os
+import socket
+import socketserver
+import tempfile
+import threading
+from typing import Any, Dict, Optional, Tuple
+
+# Seconds a client waits for a response; loading a model the daemon hasn't
+# got yet happens inside a request, so this is generous
+DEFAULT_TIMEOUT = 30.0
+
+
+def default_socket_path() -> str:
+    """``$MOOD_DAEMON_SOCKET``, else a per-user socket in the runtime or temp dir."""
+    path = os.environ.get("MOOD_DAEMON_SOCKET")
+    if path:
+        return path
+    runtime_dir = os.environ.get("XDG_RUNTIME_DIR")
+    if runtime_dir:
+        return os.path.join(runtime_dir, "mood-detective.sock")
+    return os.path.join(tempfile.gettempdir(), f"mood-detective-{os.getuid()}.sock")
+
+
+def request(
+    message: Dict[str, Any], socket_path: Optional[str] = None, timeout: float = DEFAULT_TIMEOUT
+) -> Optional[Dict[str, Any]]:
+    """Send one request to the daemon and return its response.
+
+    Returns None if no daemon is listening on ``socket_path`` or the
+    connection fails midway.
+    """
+    path = socket_path or default_socket_path()
+    if not hasattr(socket, "AF_UNIX") or not os.path.exists(path):
+        return None
+    try:
+        with socket.socket(socket.AF_UNIX, socket.SOCK_STREAM) as sock:
+            sock.settimeout(timeout)
+            sock.connect(path)
+            sock.sendall(json.dumps(message, ensure_ascii=False).encode("utf-8") + b"\n")
+            with sock.makefile("rb") as stream:
+                line = stream.readline()
+    except OSError:
+        return None
+    if not line:
+        return None
+    return json.loads(line)
+
+
+def remote_analyze(
+    text: str, engine: str = "spacy", mode: str = "lite", socket_path: Optional[str] = None
+) -> Optional[Dict[str, Any]]:
+    """The daemon's full result dict for ``text`` (spans included), or None."""
+    response = request({"text": text, "engine": engine, "mode": mode}, socket_path)
+    if response is None:
+        return None
+    return response.get("result")
+
+
+class _Handler(socketserver.StreamRequestHandler):
+    def handle(self):
+        for line in self.rfile:
+            if not line.strip():
+                continue
+            message = None
+            try:
+                message = json.loads(line)
+                response = self.server.mood_daemon.handle(message)
+            except Exception as exc:  # one bad request must not take the daemon down
+                response = {"error": f"{type(exc).__name__}: {exc}"}
+            self.wfile.write(json.dumps(response, ensure_ascii=False).encode("utf-8") + b"\n")
+            self.wfile.flush()
+            if isinstance(message, dict) and message.get("op") == "shutdown":
+                # shutdown() waits for serve_forever, which runs in another thread
+                threading.Thread(target=self.server.shutdown, daemon=True).start()
+                return
+
+
+class _Server(socketserver.ThreadingMixIn, socketserver.UnixStreamServer):
+    daemon_threads = True
+    # A client's connect() fails outright once the backlog is full
+    request_queue_size = 64
+
+
+class MoodDaemon:
+    """Serve analyses from warm pipelines on a Unix socket.
+
+    Analyzers are loaded on first request for each ``(engine, mode)`` and
+    kept. Each connection is served by its own thread, and like the API's
+    workers they call a shared pipeline concurrently, through one
+    SharedMemoryZone per pipeline.
+    """
+
+    def __init__(self, socket_path: Optional[str] = None):
+        self.socket_path = socket_path or default_socket_path()
+        self._analyzers: Dict[Tuple[str, str], Any] = {}
+        self._zones: Dict[Tuple[str, str], Any] = {}
+        # Only loading is serialized, so a model is loaded once
+        self._load_lock = threading.Lock()
+        self._server: Optional[_Server] = None
+
+    def analyzer(self, engine: str = "spacy", mode: str = "lite"):
+        """The loaded MoodEngine or pipeline for ``(engine, mode)``, loading it if needed."""
+        key = (engine, mode)
+        analyzer = self._analyzers.get(key)
+        if analyzer is not None:
+            return analyzer
+        with self._load_lock:
+            analyzer = self._analyzers.get(key)
+            if analyzer is None:
+                from .pipeline import ENGINES
+
+                if engine not in ENGINES:
+                    raise ValueError(f"Unknown engine {engine!r}, expected one of {ENGINES}")
+                if engine == "fast":
+                    from .engine import MoodEngine
+
+                    analyzer = MoodEngine()
+                else:
+                    from .pipeline import SharedMemoryZone, load_pipeline
+
+                    analyzer = load_pipeline(mode)
+                    self._zones[key] = SharedMemoryZone(analyzer)
+                self._analyzers[key] = analyzer
+        return analyzer
+
+    def handle(self, message: Dict[str, Any]) -> Dict[str, Any]:
+        """Answer one decoded request."""
+        op = message.get("op", "analyze")
+        if op == "ping":
+            return {"ok": True, "pid": os.getpid()}
+        if op == "shutdown":
+            # The handler stops the server once this is sent
+            return {"ok": True}
+        if op != "analyze":
+            return {"error": f"Unknown op {op!r}"}
+        text = message.get("text")
+        if not isinstance(text, str):
+            return {"error": 'expected a JSON object with a "text" string'}
+        key = (message.get("engine", "spacy"), message.get("mode", "lite"))
+        analyzer = self.analyzer(*key)
+        if hasattr(analyzer, "analyze"):
+            result = analyzer.analyze(text)
+        else:
+            from .pipeline import doc_to_result
+
+            with self._zones[key]():
+                result = doc_to_result(analyzer(text))
+        return {"result": result}
+
+    def bind(self) -> None:
+        """Create the socket, replacing a stale one no daemon answers on.
+
+        Raises ``RuntimeError`` if another daemon is already listening.
+        """
+        if os.path.exists(self.socket_path):
+            if request({"op": "ping"}, self.socket_path, timeout=1.0) is not None:
+                raise RuntimeError(f"A mood daemon is already listening on {self.socket_path}")
+            os.unlink(self.socket_path)
+        # Only the owner may talk to the daemon, from the moment the socket exists
+        umask = os.umask(0o177)
+        try:
+            self._server = _Server(self.socket_path, _Handler)
+        finally:
+            os.umask(umask)
+        self._server.mood_daemon = self
+
+    def serve_forever(self) -> None:
+        """Serve until a shutdown request (or an exception) and remove the socket."""
+        if self._server is None:
+            self.bind()
+        try:
+            self._server.serve_forever()
+        finally:
+            self.close()
+
+    def close(self) -> None:
+        if self._server is not None:
+            self._server.server_close()
+            self._server = None
+            try:
+                os.unlink(self.socket_path)
+            except FileNotFoundError:
+                pass
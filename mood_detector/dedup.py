@@ -0,0 +1,94 @@
+"""
+In-batch deduplication: analyze each distinct text of a batch once.
+
+``Deduplicated`` finds the distinct texts of a batch and fans their
+results back out to every position in the original order. "exact" mode
+(the default) only merges identical strings, so results are unchanged.
+"normalized" analyzes each text with its whitespace runs collapsed to one
+space and stripped, so texts that differ only in whitespace are analyzed
+once; every position gets the analysis of its normalized text, with its
+own ``text``. Case is left alone, since scoring depends on it (shouting).
+"""
+
+from typing import Any, Dict, List, Sequence
+
+DEDUP_MODES = ("off", "exact", "normalized")
+
+
+def dedup_key(text: str) -> str:
+    """The "normalized" mode key and analyzed text: whitespace runs collapsed and stripped."""
+    return " ".join(text.split())
+
+
+class Deduplicated:
+    """A batch's distinct texts, and which one each input position maps to."""
+
+    __slots__ = ("texts", "unique", "index")
+
+    def __init__(self, texts: Sequence[str], mode: str = "exact"):
+        if mode not in DEDUP_MODES:
+            raise ValueError(f"Unknown dedup mode {mode!r}, expected one of {DEDUP_MODES}")
+        self.texts = texts
+        if mode == "off":
+            self.unique = list(texts)
+            self.index = range(len(texts))
+            return
+        first: Dict[str, int] = {}
+        unique: List[str] = []
+        index: List[int] = []
+        for text in texts:
+            key = dedup_key(text) if mode == "normalized" else text
+            position = first.get(key)
+            if position is None:
+                position = first[key] = len(unique)
+                unique.append(key)
+            index.append(position)
+        self.unique = unique
+        self.index = index
+
+    @property
+    def duplicates(self) -> int:
+        return len(self.texts) - len(self.unique)
+
+    @property
+    def ratio(self) -> float:
+        """Share of the batch's texts that were duplicates (0.0 to 1.0)."""
+        return self.duplicates / len(self.texts) if self.texts else 0.0
+
+    def expand(self, results: Sequence[Any]) -> List[Any]:
+        """One result per input text, from one result per unique text."""
+        return [results[i] for i in self.index]
+
+    def expand_dicts(self, results: Sequence[Dict[str, Any]]) -> List[Dict[str, Any]]:
+        """Like ``expand`` for result dicts, with each position's own ``text``.
+
+        Repeats get shallow copies, so callers may edit each dict's keys.
+        """
+        expanded = []
+        used = [False] * len(results)
+        for text, i in zip(self.texts, self.index):
+            result = results[i]
+            if used[i] or result.get("text", text) != text:
+                result = dict(result, text=text)
+            used[i] = True
+            expanded.append(result)
+        return expanded
+
+
+class DedupCounter:
+    """Running totals of texts seen and texts analyzed across batches."""
+
+    __slots__ = ("texts", "unique")
+
+    def __init__(self):
+        self.texts = 0
+        self.unique = 0
+
+    def add(self, batch: Deduplicated) -> None:
+        self.texts += len(batch.texts)
+        self.unique += len(batch.unique)
+
+    @property
+    def ratio(self) -> float:
+        """Share of all texts so far that were duplicates."""
+        return (self.texts - self.unique) / self.texts if self.texts else 0.0
@@ -3,220 +3,512 @@ Custom spaCy component for mood detection.
 """
 
 from spacy import Language
-from spacy.matcher import Matcher
+from spacy.attrs import LOWER, ORTH, SPACY
 from spacy.tokens import Doc
-from typing import List, Tuple, Dict, Any
+from spacy.vocab import Vocab
+from spacy.util import minibatch
+import srsly
+from functools import partial
+from pathlib import Path
+from time import perf_counter
+import weakref
+from typing import Any, Dict, Iterable, Iterator, List, Optional, Tuple, Union
 
-from .patterns import MOOD_PATTERNS, EMOTIONAL_TRIGGERS, VIBE_WEIGHTS, MOOD_LABELS
+from .compiled import LEXICON_FILE, CompiledLexicon, msgpack_loads
+from .lexicon import sort_matches
+from .metrics import STAGE_TIMINGS
+from .pipeline import RESULT_FIELDS
+from .result import MoodResult
+from .scoring import (
+    LabelCounts,
+    MoodCounts,
+    VibeFeatures,
+    VibeLexicon,
+    char_features,
+    extract_emotional_triggers,
+    find_triggers,
+    scan_text,
+)
+
+
+# Per-doc match state shared by the lazy extension getters. Docs are keyed
+# weakly so the state goes away with the doc, and nothing unserializable
+# ends up in doc.user_data.
+_ANALYSES: "weakref.WeakKeyDictionary[Doc, _DocAnalysis]" = weakref.WeakKeyDictionary()
+
+# vocab id -> detector, for docs that come back from Doc.from_bytes (e.g.
+# nlp.pipe with n_process > 1) carrying only the "processed" marker
+_DETECTORS: "weakref.WeakValueDictionary[int, MoodDetector]" = weakref.WeakValueDictionary()
+
+_PROCESSED_KEY = ("mood_detector", "processed")
+
+# Span and trigger offsets for doc._.mood_result, stored by eager pipelines
+# so docs coming back from nlp.pipe workers aren't matched and scanned again
+_SPAN_OFFSETS_KEY = ("mood_detector", "span_offsets")
+_TRIGGER_OFFSETS_KEY = ("mood_detector", "trigger_offsets")
+
+# Token columns read in one doc.to_array call: matching uses LOWER, the vibe
+# features use all three
+_TOKEN_ATTRS = [LOWER, ORTH, SPACY]
+
+# The lexicon is compiled on first use, which may be inside nlp.memory_zone()
+# (spaCy >= 3.8); its strings must not be freed with the zone's
+_PERMANENT = {"allow_transient": False} if hasattr(Vocab, "memory_zone") else {}
+
+
+class _DocAnalysis:
+    """Match result for one doc, computed on first use and shared by all getters."""
+    
+    __slots__ = (
+        "detector", "text", "columns", "counts", "match_data", "spans", "offsets", "hits", "features",
+        "__weakref__",
+    )
+    
+    def __init__(self, detector: "MoodDetector"):
+        self.detector = detector
+        # doc.text joins every token, so it's built once per doc
+        self.text: Optional[str] = None
+        # (lowers, orths, spaces), one list per _TOKEN_ATTRS column
+        self.columns: Optional[List[List[int]]] = None
+        self.counts: Optional[LabelCounts] = None
+        self.match_data: Optional[List[Tuple[str, int, int]]] = None
+        self.spans: Optional[List[Tuple[str, str]]] = None
+        self.offsets: Optional[List[Tuple[int, int, int]]] = None
+        self.hits: Optional[Dict[str, int]] = None
+        self.features: Optional[VibeFeatures] = None
+    
+    def get_text(self, doc: Doc) -> str:
+        if self.text is None:
+            self.text = doc.text
+        return self.text
+    
+    def get_columns(self, doc: Doc) -> List[List[int]]:
+        if self.columns is None:
+            self.columns = doc.to_array(_TOKEN_ATTRS).T.tolist()
+        return self.columns
+    
+    def matches(self, doc: Doc, clock=None):
+        if self.match_data is None:
+            matches = self.detector._match(doc, self.get_columns(doc)[0])
+            # Count labels once; mood and vibe score both work from the counts
+            self.counts = self.detector.scorer.count(label_id for _, _, _, label_id in matches)
+            labels = self.detector.labels
+            self.match_data = [(labels[label_id], start, end) for end, start, _, label_id in matches]
+            if clock:
+                clock.lap("detector.match")
+        return self.counts, self.match_data
+    
+    def get_spans(self, doc: Doc, clock=None) -> List[Tuple[str, str]]:
+        if self.spans is None:
+            _, match_data = self.matches(doc, clock)
+            self.spans = [(doc[start:end].text, label) for label, start, end in match_data]
+        return self.spans
+    
+    def get_offsets(self, doc: Doc, clock=None) -> List[Tuple[int, int, int]]:
+        # (start_char, end_char, label_id) per span, for MoodResult
+        if self.offsets is None:
+            _, match_data = self.matches(doc, clock)
+            label_ids = self.detector.patterns.label_ids
+            self.offsets = []
+            for label, start, end in match_data:
+                span = doc[start:end]
+                self.offsets.append((span.start_char, span.end_char, label_ids[label]))
+        return self.offsets
+    
+    def scan(self, doc: Doc, clock=None) -> Dict[str, int]:
+        # Every trigger phrase, found in one pass over the text
+        if self.hits is None:
+            self.hits = scan_text(self.get_text(doc), self.detector.lexicon.triggers)
+            if clock:
+                clock.lap("detector.scan")
+        return self.hits
+    
+    def get_features(self, doc: Doc, clock=None) -> VibeFeatures:
+        if self.features is None:
+            lowers, orths, spaces = self.get_columns(doc)
+            self.features = self.detector._vibe_features(doc, lowers, orths, spaces)
+            if clock:
+                clock.lap("detector.features")
+        return self.features
+
+
+def _analysis_for(doc: Doc) -> Optional[_DocAnalysis]:
+    analysis = _ANALYSES.get(doc)
+    if analysis is None and doc.user_data.get(_PROCESSED_KEY):
+        detector = _DETECTORS.get(id(doc.vocab))
+        if detector is not None:
+            analysis = _ANALYSES[doc] = _DocAnalysis(detector)
+    return analysis
+
+
+def _compute_mood(analysis: _DocAnalysis, doc: Doc, clock) -> str:
+    counts, _ = analysis.matches(doc, clock)
+    return analysis.detector.scorer.compute_mood(counts)
+
+
+def _compute_vibe_score(analysis: _DocAnalysis, doc: Doc, clock) -> int:
+    counts, _ = analysis.matches(doc, clock)
+    features = analysis.get_features(doc, clock)
+    return analysis.detector.scorer.compute_vibe_score(counts, features)
+
+
+def _compute_emotional_spans(analysis: _DocAnalysis, doc: Doc, clock) -> List[Tuple[str, str]]:
+    # A copy, so editing doc._.emotional_spans can't change the triggers
+    return list(analysis.get_spans(doc, clock))
+
+
+def _compute_emotional_triggers(analysis: _DocAnalysis, doc: Doc, clock) -> List[Dict[str, Any]]:
+    spans = analysis.get_spans(doc, clock)
+    hits = analysis.scan(doc, clock)
+    return extract_emotional_triggers(analysis.get_text(doc), spans, hits)
+
+
+def _stored_offsets(doc: Doc, key, compute) -> List[Tuple[int, int, int]]:
+    offsets = doc.user_data.get(key)
+    if offsets is None:
+        return compute()
+    # Doc.to_bytes round-trips user_data through msgpack, which makes tuples lists
+    return [tuple(offset) for offset in offsets]
+
+
+def _mood_result(doc: Doc, fields=None) -> Optional[MoodResult]:
+    """``doc._.mood_result(fields=None)``: the doc's analysis as a compact MoodResult.
+    
+    Returns None for docs the component never processed.
+    """
+    analysis = _analysis_for(doc)
+    if analysis is None:
+        return None
+    wanted = fields or RESULT_FIELDS
+    result = MoodResult(analysis.get_text(doc), analysis.detector.patterns)
+    if "mood" in wanted:
+        result.mood = doc._.mood
+    if "vibe_score" in wanted:
+        result.vibe_score = doc._.vibe_score
+    if "emotional_triggers" in wanted or "emotional_spans" in wanted:
+        result.spans = _stored_offsets(doc, _SPAN_OFFSETS_KEY, lambda: analysis.get_offsets(doc))
+    if "emotional_triggers" in wanted:
+        result.triggers = _stored_offsets(doc, _TRIGGER_OFFSETS_KEY, lambda: find_triggers(analysis.scan(doc)))
+    return result
+
+
+def _spans_as_tuples(spans) -> List[Tuple[str, str]]:
+    # Doc.to_bytes round-trips user_data through msgpack, which makes tuples lists
+    if spans and not isinstance(spans[0], tuple):
+        return [tuple(span) for span in spans]
+    return spans
+
+
+def _lazy_getter(key, stage: str, compute, default, restore, doc: Doc):
+    user_data = doc.user_data
+    if key in user_data:
+        value = user_data[key]
+        if restore is not None:
+            value = user_data[key] = restore(value)
+        return value
+    analysis = _analysis_for(doc)
+    if analysis is None:
+        return default() if callable(default) else default
+    # None unless stage timing is switched on. The shared match, scan and
+    # feature stages lap on the same clock, so each is only counted once.
+    clock = STAGE_TIMINGS.clock()
+    value = user_data[key] = compute(analysis, doc, clock)
+    if clock:
+        clock.lap(stage)
+    return value
+
+
+def _lazy_setter(key, doc: Doc, value) -> None:
+    doc.user_data[key] = value
+
+
+def _lazy_extension(name: str, stage: str, compute, default, restore=None):
+    """Register ``doc._.<name>`` as a getter memoized in ``doc.user_data``.
+    
+    The value is computed the first time it is read and stored as plain
+    data, so it survives ``Doc.to_bytes``. Assigning to the attribute
+    overrides it. Docs the component never saw read ``default``.
+    ``restore`` fixes up a memoized value read back from bytes.
+    
+    The getter and setter are partials of module-level functions, so the
+    extensions can be pickled into ``nlp.pipe(n_process>1)`` workers
+    started with spawn.
+    """
+    key = ("mood_detector", name)
+    getter = partial(_lazy_getter, key, stage, compute, default, restore)
+    setter = partial(_lazy_setter, key)
+    Doc.set_extension(name, getter=getter, setter=setter, force=True)
+    return key
+
+
+# MoodDetector attributes set up by _load from the compiled lexicon
+_LEXICON_ATTRS = frozenset(
+    ("lexicon", "patterns", "labels", "scorer", "lexeme_index", "vibe_lexicon", "_orth_features",
+     "phrase_index", "lexeme_ids")
+)
 
 
 # Register custom extension attributes
-Doc.set_extension("mood", default=None, force=True)
-Doc.set_extension("vibe_score", default=0, force=True)
-Doc.set_extension("emotional_spans", default=[], force=True)
-Doc.set_extension("emotional_triggers", default=[], force=True)
+_FIELD_KEYS = {
+    "mood": _lazy_extension("mood", "detector.mood", _compute_mood, None),
+    "vibe_score": _lazy_extension("vibe_score", "detector.vibe_score", _compute_vibe_score, 0),
+    "emotional_spans": _lazy_extension(
+        "emotional_spans", "detector.spans", _compute_emotional_spans, list, _spans_as_tuples
+    ),
+    "emotional_triggers": _lazy_extension(
+        "emotional_triggers", "detector.triggers", _compute_emotional_triggers, list
+    ),
+}
+
 
+Doc.set_extension("mood_result", method=_mood_result, force=True)
 
-@Language.factory("mood_detector")
-def create_mood_detector(nlp: Language, name: str):
+
+@Language.factory("mood_detector", default_config={"lazy": True})
+def create_mood_detector(nlp: Language, name: str, lazy: bool):
     """Factory function to create the mood detector component."""
-    return MoodDetector(nlp)
+    return MoodDetector(nlp, lazy=lazy)
 
 
 class MoodDetector:
     """Custom spaCy component that detects mood and calculates vibe scores."""
     
-    def __init__(self, nlp: Language):
-        """Initialize the mood detector with patterns."""
-        self.nlp = nlp
-        self.matcher = Matcher(nlp.vocab)
-        
-        # Add all mood patterns to the matcher
-        for pattern in MOOD_PATTERNS:
-            self.matcher.add(pattern["label"], [pattern["pattern"]])
+    # Upper bound on memoized per-lexeme character counts
+    MAX_CACHED_ORTHS = 100_000
     
-    def __call__(self, doc: Doc) -> Doc:
-        """Process the document and add mood information."""
-        # Find matches (returns list of (match_id, start, end) tuples)
-        matches = self.matcher(doc)
-        
-        # Convert match IDs to labels
-        match_data = [
-            (self.nlp.vocab.strings[match_id], start, end)
-            for match_id, start, end in matches
-        ]
-        
-        # Compute mood
-        doc._.mood = self._compute_mood(match_data, doc)
-        
-        # Compute vibe score
-        doc._.vibe_score = self._compute_vibe_score(match_data, doc)
-        
-        # Extract emotional spans
-        doc._.emotional_spans = [
-            (doc[start:end].text, label) 
-            for label, start, end in match_data
-        ]
+    def __init__(self, nlp: Language, lazy: bool = True):
+        """Initialize the mood detector.
         
-        # Extract emotional triggers
-        doc._.emotional_triggers = self._extract_emotional_triggers(doc, match_data)
+        With ``lazy`` (the default) the extension attributes are computed
+        when first read; otherwise every attribute is computed in
+        ``__call__``, which is what ``nlp.pipe(n_process>1)`` needs.
         
-        return doc
+        The lexicon is compiled from patterns.py on first use, unless
+        ``from_disk``/``from_bytes`` load a saved one before that.
+        """
+        self.nlp = nlp
+        self.lazy = lazy
+        _DETECTORS[id(nlp.vocab)] = self
     
-    def _compute_mood(self, matches: List[Tuple[str, int, int]], doc: Doc) -> str:
-        """Determine the primary mood from matches."""
-        if not matches:
-            return "neutral"
-        
-        # Count occurrences of each mood label
-        mood_counts: Dict[str, int] = {}
-        for label, start, end in matches:
-            mood_counts[label] = mood_counts.get(label, 0) + 1
-        
-        # Find the most common mood
-        if not mood_counts:
-            return "neutral"
-        
-        # Check for combinations first
-        moods_present = set(mood_counts.keys())
-        
-        # Special combinations (order matters - more specific first)
-        if "TIRED" in moods_present and "STRESSED" in moods_present and "ANXIETY" in moods_present:
-            return "overwhelming exhaustion"
-        if "TIRED" in moods_present and "STRESSED" in moods_present:
-            return "chaotic tired"
-        if "ANGRY" in moods_present and "PROBLEM_AVOIDANCE" in moods_present:
-            return "chaotic frustration"
-        if "ANGRY" in moods_present and "SAD" in moods_present:
-            return "bitter sadness"
-        if "SAD" in moods_present and "LONGING" in moods_present:
-            return "melancholic longing"
-        if "ANXIETY" in moods_present and "STRESSED" in moods_present:
-            return "anxious stress"
-        if "SARCASTIC" in moods_present and "CONFUSED" in moods_present:
-            return "sarcastic confusion"
-        if "TIRED" in moods_present and "EXISTENTIAL" in moods_present:
-            return "existential tired"
-        if "SAD" in moods_present and "DESPAIR" in moods_present:
-            return "deep despair"
-        if "HAPPY" in moods_present and "EXCITED" in moods_present:
-            return "joyful excitement"
-        if "LOVE" in moods_present and "GRATITUDE" in moods_present:
-            return "grateful love"
-        if "RELIEF" in moods_present and "HAPPY" in moods_present:
-            return "relieved happiness"
-        if "SURPRISE" in moods_present and "HAPPY" in moods_present:
-            return "delighted surprise"
-        if "SURPRISE" in moods_present and "ANGRY" in moods_present:
-            return "shocked anger"
-        if "DISAPPOINTMENT" in moods_present and "SAD" in moods_present:
-            return "disappointed sadness"
-        if "REGRET" in moods_present and "SAD" in moods_present:
-            return "regretful sadness"
-        
-        # Find the most common mood
-        primary_mood = max(mood_counts.items(), key=lambda x: x[1])[0]
-        
-        # Return the human-readable mood label
-        return MOOD_LABELS.get(primary_mood, primary_mood.lower())
+    def __getattr__(self, name: str):
+        # Only reached while the lexicon tables are not set yet
+        if name in _LEXICON_ATTRS:
+            self._load(CompiledLexicon.build())
+            return getattr(self, name)
+        raise AttributeError(f"{type(self).__name__!r} object has no attribute {name!r}")
     
-    def _compute_vibe_score(self, matches: List[Tuple[str, int, int]], doc: Doc) -> int:
-        """Calculate the vibe score from -10 to +10."""
-        if not matches:
-            return 0
+    def _load(self, lexicon: CompiledLexicon, lexeme_ids: Optional[Dict[str, int]] = None) -> None:
+        """Set up matching and scoring from a compiled lexicon.
         
-        score = 0
-        mood_counts: Dict[str, int] = {}
+        ``lexeme_ids`` maps the lexicon's words to their lexeme IDs, as saved
+        by ``to_bytes``; words missing from it are added to the vocab.
+        """
+        self.lexicon = lexicon
+        self.patterns = lexicon.patterns
+        self.labels = self.patterns.labels
+        self.scorer = lexicon.scorer
         
-        # Count mood occurrences
-        for label, start, end in matches:
-            mood_counts[label] = mood_counts.get(label, 0) + 1
+        # IDs are string hashes (or spaCy's fixed symbol IDs), the same in
+        # every vocab, so saved ones are reused instead of interning the
+        # strings again
+        strings = self.nlp.vocab.strings
+        self.lexeme_ids = lexeme_ids = dict(lexeme_ids or ())
         
-        # Calculate weighted score
-        for label, count in mood_counts.items():
-            weight = VIBE_WEIGHTS.get(label, 0)
-            # Apply diminishing returns for multiple occurrences
-            score += weight * min(count, 3)  # Cap at 3x per mood type
+        def add_string(string: str) -> int:
+            lexeme_id = lexeme_ids.get(string)
+            if lexeme_id is None:
+                lexeme_id = lexeme_ids[string] = strings.add(string, **_PERMANENT)
+            return lexeme_id
         
-        # Adjust based on text characteristics
-        text_lower = doc.text.lower()
+        # Single-token patterns: lowercase lexeme ID -> ((pattern_id, label_id), ...)
+        self.lexeme_index = {
+            add_string(lower): entries
+            for lower, entries in self.patterns.token_index.items()
+        }
+        # Vibe modifier words as lowercase lexeme IDs, and ORTH ID ->
+        # (length, uppercase characters, "!" count, "?" count)
+        self.vibe_lexicon = VibeLexicon(add_string)
+        self._orth_features: Dict[int, Tuple[int, int, int, int]] = {}
         
-        # Intensity modifiers
-        intensity_words = ["very", "really", "extremely", "so", "incredibly", "absolutely", "completely", "totally", "utterly", "absolutely", "quite", "pretty", "super", "ultra", "mega", "insanely", "ridiculously"]
-        intensity_count = sum(1 for word in intensity_words if word in text_lower)
-        if intensity_count > 0:
-            score = int(score * (1.0 + (intensity_count * 0.15)))  # Scale with intensity
-        
-        # Exclamation marks increase intensity (positive or negative)
-        exclamation_count = doc.text.count("!")
-        if score > 0:
-            score += min(exclamation_count, 4)  # Positive intensity
-        else:
-            score -= min(exclamation_count, 4)  # Negative intensity
+        # Multi-token patterns by the lexeme ID of each value of their first
+        # token: lowercase lexeme ID -> ((pattern_id, label_id, rest), ...)
+        # with the remaining token specs as sets of lexeme IDs
+        self.phrase_index = {
+            add_string(first): tuple(
+                (pattern_id, label_id, tuple(frozenset(map(add_string, values)) for values in rest))
+                for pattern_id, label_id, rest in entries
+            )
+            for first, entries in self.patterns.phrase_index.items()
+        }
+    
+    def to_bytes(self, *, exclude: Iterable[str] = tuple()) -> bytes:
+        """Serialize the compiled lexicon and the lexeme IDs of its words."""
+        return srsly.msgpack_dumps({"lexicon": self.lexicon.to_dict(), "lexeme_ids": self.lexeme_ids})
+    
+    def from_bytes(self, bytes_data: bytes, *, exclude: Iterable[str] = tuple()) -> "MoodDetector":
+        """Load a lexicon saved with ``to_bytes`` instead of compiling patterns.py.
         
-        # Question marks (confusion/uncertainty)
-        question_count = doc.text.count("?")
-        score -= min(question_count, 3)
+        Raises ``ValueError`` if it was saved from different pattern tables.
+        """
+        msg = msgpack_loads(bytes_data)
+        self._load(CompiledLexicon.from_dict(msg["lexicon"]), msg["lexeme_ids"])
+        return self
+    
+    def to_disk(self, path: Union[str, Path], *, exclude: Iterable[str] = tuple()) -> None:
+        """Save the compiled lexicon into the component directory ``path``."""
+        path = Path(path)
+        path.mkdir(parents=True, exist_ok=True)
+        (path / LEXICON_FILE).write_bytes(self.to_bytes())
+    
+    def from_disk(self, path: Union[str, Path], *, exclude: Iterable[str] = tuple()) -> "MoodDetector":
+        """Load the lexicon saved by ``to_disk``, e.g. from ``spacy.load(path)``."""
+        return self.from_bytes((Path(path) / LEXICON_FILE).read_bytes())
+    
+    def _match(self, doc: Doc, lowers: Optional[List[int]] = None) -> List[Tuple[int, int, int, int]]:
+        """Return (end, start, pattern_id, label_id) matches in Matcher order.
         
-        # All caps detection (shouting - usually negative)
-        caps_ratio = sum(1 for c in doc.text if c.isupper()) / max(len(doc.text), 1)
-        if caps_ratio > 0.7 and len(doc.text) > 5:
-            score -= 4
+        ``lowers`` is the doc's LOWER column, if the caller already has it.
+        """
+        found = []
+        lexeme_index = self.lexeme_index
+        phrase_index = self.phrase_index
+        if lowers is None:
+            lowers = doc.to_array(LOWER).tolist()
+        n_tokens = len(lowers)
         
-        # Casual words boost (slightly positive)
-        casual_words = ["bro", "bruh", "dude", "lol", "haha", "lmao", "hehe"]
-        casual_count = sum(1 for word in casual_words if word in text_lower)
-        score += min(casual_count, 2)
+        # One pass over the lowercase lexeme IDs resolves every pattern, as
+        # CompiledPatterns.match does over lowercase strings
+        for i, lower in enumerate(lowers):
+            entries = lexeme_index.get(lower)
+            if entries:
+                for pattern_id, label_id in entries:
+                    found.append((i + 1, i, pattern_id, label_id))
+            phrases = phrase_index.get(lower)
+            if phrases:
+                for pattern_id, label_id, rest in phrases:
+                    end = i + 1
+                    for values in rest:
+                        if end == n_tokens or lowers[end] not in values:
+                            break
+                        end += 1
+                    else:
+                        found.append((end, i, pattern_id, label_id))
         
-        # Emoji-like words (positive)
-        emoji_words = ["<3", "❤️", "😊", "😄", "😁", "😍", "🥰", "😎", "🔥", "✨", "🌟"]
-        emoji_count = sum(1 for word in emoji_words if word in doc.text)
-        score += min(emoji_count, 3)
+        return sort_matches(found)
+    
+    def _vibe_features(
+        self, doc: Doc, lowers: List[int], orths: List[int], spaces: List[int]
+    ) -> VibeFeatures:
+        """Vibe features from the doc's LOWER, ORTH and SPACY columns."""
+        return self.vibe_lexicon.features(lowers, *self._char_counts(doc, orths, spaces))
+    
+    def _char_counts(self, doc: Doc, orths: List[int], spaces: List[int]) -> Tuple[int, int, int, int]:
+        """(text length, uppercase characters, "!" count, "?" count) of the doc.
         
-        # Negative intensifiers
-        negative_intensifiers = ["absolutely", "completely", "totally", "utterly"]
-        if any(word in text_lower for word in negative_intensifiers) and score < 0:
-            score = int(score * 1.3)  # Amplify negative emotions
+        Summed per token from a per-lexeme cache, so ``doc.text`` is never built.
+        """
+        cache = self._orth_features
+        strings = doc.vocab.strings
+        text_len = sum(spaces)
+        upper_chars = exclamations = questions = 0
+        for orth in orths:
+            counts = cache.get(orth)
+            if counts is None:
+                word = strings[orth]
+                counts = (len(word),) + char_features(word)
+                if len(cache) < self.MAX_CACHED_ORTHS:
+                    cache[orth] = counts
+            text_len += counts[0]
+            upper_chars += counts[1]
+            exclamations += counts[2]
+            questions += counts[3]
+        return text_len, upper_chars, exclamations, questions
+    
+    def mood_counts(self, doc: Doc) -> MoodCounts:
+        """The doc's mergeable ``MoodCounts``, reusing its match if it was processed."""
+        analysis = _ANALYSES.get(doc) or _DocAnalysis(self)
+        counts, _ = analysis.matches(doc)
+        lowers, orths, spaces = analysis.get_columns(doc)
+        return MoodCounts(counts, self.vibe_lexicon.modifiers(lowers), *self._char_counts(doc, orths, spaces))
+    
+    def __call__(self, doc: Doc) -> Doc:
+        """Attach mood information to the document.
         
-        # Positive intensifiers
-        positive_intensifiers = ["absolutely", "completely", "totally", "utterly"]
-        if any(word in text_lower for word in positive_intensifiers) and score > 0:
-            score = int(score * 1.3)  # Amplify positive emotions
+        Nothing is computed here in lazy mode: the first read of
+        ``doc._.mood``, ``vibe_score``, ``emotional_spans`` or
+        ``emotional_triggers`` runs the match once and each getter only does
+        its own remaining work.
+        """
+        self._register(doc)
+        if not self.lazy:
+            self._compute_all(doc)
+        return doc
+    
+    def pipe(self, docs: Iterable[Doc], batch_size: int = 128) -> Iterator[Doc]:
+        """Process docs in batches; in eager mode vibe scores are computed per batch."""
+        for batch in minibatch(docs, size=batch_size):
+            for doc in batch:
+                self._register(doc)
+            if not self.lazy:
+                self.score_vibes(batch)
+                for doc in batch:
+                    self._compute_all(doc)
+            yield from batch
+    
+    def score_vibes(self, docs: List[Doc]) -> None:
+        """Compute ``doc._.vibe_score`` for a batch of docs with one vectorized pass.
         
-        # Clamp to -10 to +10
-        score = max(-10, min(10, score))
+        Docs that already have a score, or that this component never
+        processed, are left alone; the others read the batch result.
+        """
+        key = _FIELD_KEYS["vibe_score"]
+        pending = []
+        for doc in docs:
+            if key not in doc.user_data:
+                analysis = _analysis_for(doc)
+                if analysis is not None:
+                    pending.append((doc, analysis))
+        if not pending:
+            return
         
-        return score
+        clock = STAGE_TIMINGS.clock()
+        counts = [analysis.matches(doc, clock)[0] for doc, analysis in pending]
+        features = [analysis.get_features(doc, clock) for doc, analysis in pending]
+        start = perf_counter() if clock else 0.0
+        scores = self.scorer.compute_vibe_scores(counts, features)
+        if clock:
+            STAGE_TIMINGS.record("detector.vibe_score", (perf_counter() - start) / len(pending), len(pending))
+        for (doc, _), score in zip(pending, scores):
+            doc.user_data[key] = score
+    
+    def _compute_all(self, doc: Doc) -> None:
+        """Compute every attribute and ``mood_result``'s offsets into ``doc.user_data``."""
+        for name in _FIELD_KEYS:
+            getattr(doc._, name)
+        analysis = _ANALYSES[doc]
+        doc.user_data[_SPAN_OFFSETS_KEY] = analysis.get_offsets(doc)
+        doc.user_data[_TRIGGER_OFFSETS_KEY] = find_triggers(analysis.scan(doc))
+    
+    def _register(self, doc: Doc) -> None:
+        user_data = doc.user_data
+        # Re-running the component starts from a clean slate
+        for key in (*_FIELD_KEYS.values(), _SPAN_OFFSETS_KEY, _TRIGGER_OFFSETS_KEY):
+            user_data.pop(key, None)
+        user_data[_PROCESSED_KEY] = True
+        _ANALYSES[doc] = _DocAnalysis(self)
+    
+    def _compute_mood(self, counts: LabelCounts, doc: Doc) -> str:
+        """Determine the primary mood from label counts."""
+        return self.scorer.compute_mood(counts)
+    
+    def _compute_vibe_score(self, counts: LabelCounts, doc: Doc) -> int:
+        """Calculate the vibe score from -10 to +10."""
+        lowers, orths, spaces = doc.to_array(_TOKEN_ATTRS).T.tolist()
+        return self.scorer.compute_vibe_score(counts, self._vibe_features(doc, lowers, orths, spaces))
     
     def _extract_emotional_triggers(
-        self, doc: Doc, matches: List[Tuple[str, int, int]]
+        self, doc: Doc, matches: List[Tuple[str, int, int]], hits: Optional[Dict[str, int]] = None
     ) -> List[Dict[str, Any]]:
         """Extract emotional triggers from the document."""
-        triggers = []
-        text_lower = doc.text.lower()
-        
-        # Check for trigger phrases
-        for trigger_type, trigger_words in EMOTIONAL_TRIGGERS.items():
-            for word in trigger_words:
-                if word in text_lower:
-                    # Find the span in the original text
-                    start_idx = text_lower.find(word)
-                    if start_idx != -1:
-                        end_idx = start_idx + len(word)
-                        triggers.append({
-                            "text": doc.text[start_idx:end_idx],
-                            "type": trigger_type
-                        })
-                        break  # Only add once per trigger type
-        
-        # Also add matched spans
-        for label, start, end in matches:
-            trigger_text = doc[start:end].text
-            trigger_type = label.lower().replace("_", " ")
-            triggers.append({
-                "text": trigger_text,
-                "type": trigger_type
-            })
-        
-        return triggers
-
+        spans = [(doc[start:end].text, label) for label, start, end in matches]
+        return extract_emotional_triggers(doc.text, spans, hits)
@@ -0,0 +1,77 @@
+"""
+Response body encoding for the API.
+
+Results are plain dicts built by ``MoodResult.to_json_dict``, so they are
+encoded directly: with orjson when it is installed (falling back to the
+standard library), or as msgpack for clients that ask for it with
+``Accept: application/msgpack``. JSON stays the default.
+"""
+
+import json
+from typing import Any, Optional
+
+try:
+    import orjson
+except ImportError:  # optional; the json module gives the same output, slower
+    orjson = None
+
+JSON = "application/json"
+MSGPACK = "application/msgpack"
+
+# Accept values that select each encoding; application/x-msgpack is the
+# older, still common name
+_MEDIA_TYPES = {
+    JSON: JSON,
+    "application/*": JSON,
+    "*/*": JSON,
+    MSGPACK: MSGPACK,
+    "application/x-msgpack": MSGPACK,
+}
+
+
+def dumps_json(content: Any) -> bytes:
+    """Compact UTF-8 JSON, the same bytes Starlette's JSONResponse produces."""
+    if orjson is not None:
+        return orjson.dumps(content)
+    return json.dumps(content, ensure_ascii=False, allow_nan=False, separators=(",", ":")).encode("utf-8")
+
+
+def dumps_msgpack(content: Any) -> bytes:
+    import srsly
+
+    return srsly.msgpack_dumps(content)
+
+
+def negotiate(accept: Optional[str]) -> str:
+    """The media type to answer an ``Accept`` header with.
+
+    msgpack only when the client ranks it above JSON; anything else
+    (no header, wildcards, types we don't produce) gets JSON.
+    """
+    if not accept:
+        return JSON
+    best, best_q = JSON, 0.0
+    for item in accept.split(","):
+        media_type, *params = item.strip().split(";")
+        selected = _MEDIA_TYPES.get(media_type.strip().lower())
+        if selected is None:
+            continue
+        q = 1.0
+        for param in params:
+            name, _, value = param.strip().partition("=")
+            if name.strip() == "q":
+                try:
+                    q = float(value)
+                except ValueError:
+                    q = 0.0
+        # Ties go to JSON
+        if q > best_q or (q == best_q and selected == JSON):
+            best, best_q = selected, q
+    return best
+
+
+def encode(content: Any, media_type: str = JSON) -> bytes:
+    """``content`` encoded as ``media_type`` (a ``negotiate`` result)."""
+    if media_type == MSGPACK:
+        return dumps_msgpack(content)
+    return dumps_json(content)
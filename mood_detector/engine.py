@@ -0,0 +1,148 @@
+"""
+spaCy-free fast-path analyzer for high-volume scoring.
+
+Tokenizes with a precompiled regex and looks tokens up in a lexicon
+compiled from MOOD_PATTERNS, without ever building a ``Doc``. Where the
+tokens are spaCy's, which they are for ordinary prose, ``analyze()``
+returns the same mood, vibe score and triggers as the ``mood_detector``
+spaCy component; tokenizer.py lists the cases where they are not.
+"""
+
+from typing import Any, Dict, Iterable, Iterator, List, Optional, Tuple
+
+from .lexicon import CompiledPatterns
+from .metrics import STAGE_TIMINGS
+from .pipeline import RESULT_FIELDS
+from .result import MoodResult
+from .scoring import MoodCounts, MoodScorer, VibeFeatures, VibeLexicon, find_triggers, scan_text
+from .tokenizer import tokenize
+
+_ALL_FIELDS = frozenset(RESULT_FIELDS)
+
+
+def _char_counts(text: str) -> Tuple[int, int, int, int]:
+    """(length, uppercase characters, "!" count, "?" count) of ``text``."""
+    return len(text), sum(map(str.isupper, text)), text.count("!"), text.count("?")
+
+
+class MoodEngine:
+    """Pure-Python mood analyzer with ``MoodDetector``'s output on ordinary prose."""
+
+    def __init__(self, patterns: Optional[CompiledPatterns] = None):
+        self.patterns = patterns or CompiledPatterns()
+        self.scorer = MoodScorer(self.patterns)
+        self.vibe_lexicon = VibeLexicon()
+
+    def tokenize(self, text: str) -> List[Tuple[str, int, int]]:
+        """Return ``(lower, start_char, end_char)`` for every token in ``text``."""
+        return [(word.lower(), start, start + len(word)) for word, start in tokenize(text)]
+
+    def vibe_features(
+        self, text: str, tokens: Optional[List[Tuple[str, int, int]]] = None
+    ) -> VibeFeatures:
+        """Vibe features of ``text``; ``tokens`` is ``tokenize(text)``, if already done."""
+        if tokens is None:
+            tokens = self.tokenize(text)
+        return self.vibe_lexicon.features([lower for lower, _, _ in tokens], *_char_counts(text))
+
+    def mood_counts(self, text: str) -> MoodCounts:
+        """The text's mergeable ``MoodCounts``."""
+        tokens = self.tokenize(text)
+        lowers = [lower for lower, _, _ in tokens]
+        counts = self.scorer.count(label_id for _, _, _, label_id in self.patterns.match(lowers))
+        return MoodCounts(counts, self.vibe_lexicon.modifiers(lowers), *_char_counts(text))
+
+    def analyze(self, text: str, fields: Optional[Iterable[str]] = None) -> Dict[str, Any]:
+        """Analyze ``text`` and return mood, vibe score, triggers and spans.
+
+        ``fields`` restricts the result to a subset of those keys (plus
+        "text") and skips the work only the other keys need.
+        """
+        fields = None if fields is None else tuple(fields)
+        return self.analyze_result(text, fields).to_dict(fields)
+
+    def analyze_result(self, text: str, fields: Optional[Iterable[str]] = None) -> MoodResult:
+        """Analyze ``text`` into a compact ``MoodResult``.
+
+        Fields left out of ``fields`` are not computed and stay None.
+        """
+        wanted = _ALL_FIELDS if fields is None else frozenset(fields)
+        # None unless stage timing is switched on
+        clock = STAGE_TIMINGS.clock()
+        result = MoodResult(text, self.patterns)
+
+        tokens = self.tokenize(text)
+        if clock:
+            clock.lap("engine.tokenize")
+
+        matched = self.patterns.match([lower for lower, _, _ in tokens])
+        counts = self.scorer.count(label_id for _, _, _, label_id in matched)
+        if clock:
+            clock.lap("engine.match")
+
+        if "emotional_triggers" in wanted:
+            hits = scan_text(text)
+            if clock:
+                clock.lap("engine.scan")
+
+        if "mood" in wanted:
+            result.mood = self.scorer.compute_mood(counts)
+            if clock:
+                clock.lap("engine.mood")
+
+        if "vibe_score" in wanted:
+            features = self.vibe_features(text, tokens)
+            result.vibe_score = self.scorer.compute_vibe_score(counts, features)
+            if clock:
+                clock.lap("engine.vibe_score")
+
+        if "emotional_triggers" in wanted or "emotional_spans" in wanted:
+            result.spans = [
+                (tokens[start][1], tokens[end - 1][2], label_id)
+                for end, start, _, label_id in matched
+            ]
+        if "emotional_triggers" in wanted:
+            result.triggers = find_triggers(hits)
+            if clock:
+                clock.lap("engine.triggers")
+
+        return result
+
+    def analyze_many(
+        self, texts: Iterable[str], fields: Optional[Iterable[str]] = None
+    ) -> Iterator[Dict[str, Any]]:
+        """Lazily analyze an iterable of texts, yielding one result per text."""
+        fields = None if fields is None else tuple(fields)
+        for text in texts:
+            yield self.analyze(text, fields)
+
+    def analyze_results(
+        self, texts: Iterable[str], fields: Optional[Iterable[str]] = None
+    ) -> Iterator[MoodResult]:
+        """Like ``analyze_many``, yielding compact ``MoodResult`` objects."""
+        fields = None if fields is None else tuple(fields)
+        for text in texts:
+            yield self.analyze_result(text, fields)
+
+
+_default_engine: Optional[MoodEngine] = None
+
+
+def get_engine() -> MoodEngine:
+    """Return the shared, lazily-built default engine."""
+    global _default_engine
+    if _default_engine is None:
+        _default_engine = MoodEngine()
+    return _default_engine
+
+
+def analyze(text: str, fields: Optional[Iterable[str]] = None) -> Dict[str, Any]:
+    """Analyze a single text with the shared fast-path engine."""
+    return get_engine().analyze(text, fields)
+
+
+def analyze_many(
+    texts: Iterable[str], fields: Optional[Iterable[str]] = None
+) -> Iterator[Dict[str, Any]]:
+    """Analyze many texts with the shared fast-path engine."""
+    return get_engine().analyze_many(texts, fields)
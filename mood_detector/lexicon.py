@@ -0,0 +1,162 @@
+"""
+Compiled lookup tables for MOOD_PATTERNS.
+
+Every pattern in MOOD_PATTERNS is a sequence of ``{"LOWER": ...}`` token specs,
+so it can be compiled into plain dictionaries keyed by the lowercase token.
+"""
+
+import hashlib
+import json
+from functools import lru_cache
+from typing import Any, Dict, FrozenSet, List, Tuple
+
+from . import patterns as _patterns
+from .patterns import MOOD_PATTERNS
+
+# Bump when mood/vibe/trigger computation changes without a table change,
+# so cached results from the old behaviour stop matching.
+SCORING_VERSION = 2
+
+# Every table in patterns.py that influences an analysis result
+_VERSIONED_TABLES = (
+    "MOOD_PATTERNS",
+    "MOOD_COMBINATIONS",
+    "EMOTIONAL_TRIGGERS",
+    "INTENSITY_WORDS",
+    "CASUAL_WORDS",
+    "EMOJI_WORDS",
+    "AMPLIFIER_WORDS",
+    "VIBE_WEIGHTS",
+    "MOOD_LABELS",
+)
+
+
+@lru_cache(maxsize=None)
+def pattern_set_version() -> str:
+    """Content hash of the pattern tables and scoring version."""
+    tables = {name: getattr(_patterns, name) for name in _VERSIONED_TABLES}
+    payload = json.dumps([SCORING_VERSION, tables], sort_keys=True, ensure_ascii=False)
+    return hashlib.sha256(payload.encode("utf-8")).hexdigest()[:16]
+
+
+def _token_values(spec: Dict) -> FrozenSet[str]:
+    """Return the set of lowercase strings a single token spec accepts."""
+    value = spec["LOWER"]
+    if isinstance(value, dict):
+        return frozenset(value["IN"])
+    return frozenset([value])
+
+
+class CompiledPatterns:
+    """MOOD_PATTERNS compiled into a token index and a phrase index.
+
+    Labels are interned as integer IDs (positions in ``labels``). Patterns keep
+    their position in MOOD_PATTERNS as ``pattern_id``, which is the order
+    spaCy's Matcher reports matches that share a span in.
+    """
+
+    def __init__(self, patterns: List[Dict] = MOOD_PATTERNS):
+        self._set_labels(list(dict.fromkeys(pattern["label"] for pattern in patterns)))
+
+        # Single-token patterns: lowercase token -> ((pattern_id, label_id), ...)
+        token_index: Dict[str, List[Tuple[int, int]]] = {}
+        # Multi-token patterns as (pattern_id, label_id, token specs)
+        self.phrase_patterns: List[Tuple[int, int, Tuple[FrozenSet[str], ...]]] = []
+
+        for pattern_id, pattern in enumerate(patterns):
+            label_id = self.label_ids[pattern["label"]]
+            specs = tuple(_token_values(spec) for spec in pattern["pattern"])
+            if len(specs) == 1:
+                for value in specs[0]:
+                    entries = token_index.setdefault(value, [])
+                    if all(existing != label_id for _, existing in entries):
+                        entries.append((pattern_id, label_id))
+            else:
+                self.phrase_patterns.append((pattern_id, label_id, specs))
+
+        self.token_index = {key: tuple(value) for key, value in token_index.items()}
+        self._index_phrases()
+
+    def _set_labels(self, labels: List[str]) -> None:
+        self.labels: List[str] = labels
+        self.label_ids: Dict[str, int] = {label: i for i, label in enumerate(labels)}
+        # Trigger type reported for a span of each label ("SARCASM_DETECTED" -> "sarcasm detected")
+        self.label_types: List[str] = [label.lower().replace("_", " ") for label in labels]
+
+    def _index_phrases(self) -> None:
+        # Multi-token patterns indexed by every value of their first token
+        phrase_index: Dict[str, List[Tuple[int, int, Tuple[FrozenSet[str], ...]]]] = {}
+        for pattern_id, label_id, specs in self.phrase_patterns:
+            for value in specs[0]:
+                phrase_index.setdefault(value, []).append((pattern_id, label_id, specs[1:]))
+        self.phrase_index = {key: tuple(value) for key, value in phrase_index.items()}
+
+    def to_dict(self) -> Dict[str, Any]:
+        """The compiled tables as plain lists and dicts (for msgpack/JSON)."""
+        return {
+            "labels": self.labels,
+            "token_index": self.token_index,
+            "phrase_patterns": [
+                [pattern_id, label_id, [sorted(values) for values in specs]]
+                for pattern_id, label_id, specs in self.phrase_patterns
+            ],
+        }
+
+    @classmethod
+    def from_dict(cls, data: Dict[str, Any]) -> "CompiledPatterns":
+        """Rebuild from ``to_dict`` output without recompiling MOOD_PATTERNS."""
+        compiled = cls.__new__(cls)
+        compiled._set_labels(list(data["labels"]))
+        compiled.token_index = {
+            key: tuple(map(tuple, entries)) for key, entries in data["token_index"].items()
+        }
+        compiled.phrase_patterns = [
+            (pattern_id, label_id, tuple(frozenset(values) for values in specs))
+            for pattern_id, label_id, specs in data["phrase_patterns"]
+        ]
+        compiled._index_phrases()
+        return compiled
+
+    def match(self, lowers: List[str]) -> List[Tuple[int, int, int, int]]:
+        """Match a sequence of lowercase tokens.
+
+        Returns ``(end, start, pattern_id, label_id)`` tuples in the order
+        spaCy's Matcher emits them.
+        """
+        token_index = self.token_index
+        phrase_index = self.phrase_index
+        found = []
+        n_tokens = len(lowers)
+
+        for i, lower in enumerate(lowers):
+            entries = token_index.get(lower)
+            if entries:
+                for pattern_id, label_id in entries:
+                    found.append((i + 1, i, pattern_id, label_id))
+            phrases = phrase_index.get(lower)
+            if phrases:
+                for pattern_id, label_id, rest in phrases:
+                    end = i + 1 + len(rest)
+                    if end > n_tokens:
+                        continue
+                    if all(lowers[i + 1 + k] in values for k, values in enumerate(rest)):
+                        found.append((end, i, pattern_id, label_id))
+
+        return sort_matches(found)
+
+
+def sort_matches(found: List[Tuple[int, int, int, int]]) -> List[Tuple[int, int, int, int]]:
+    """Sort ``(end, start, pattern_id, label_id)`` matches into Matcher order.
+
+    Duplicate (label, start, end) matches from different patterns are dropped,
+    as the Matcher does for patterns added under the same key.
+    """
+    found.sort()
+    seen = set()
+    matches = []
+    for match in found:
+        key = (match[3], match[1], match[0])
+        if key not in seen:
+            seen.add(key)
+            matches.append(match)
+    return matches
@@ -0,0 +1,117 @@
+"""
+Long-document analysis: a per-chunk mood timeline plus a document aggregate.
+
+Texts of any length (including ones past spaCy's ``max_length``) are split
+into chunks of at most ``max_chars`` characters, ending at a sentence
+boundary where the window has one. Chunks go through the pipeline a batch
+at a time, so memory is bounded by the batch rather than the document.
+Each chunk contributes a timeline entry and its ``MoodCounts``; the
+document's mood and vibe score come from the merged counts, without a
+second pass over the text.
+"""
+
+import re
+from contextlib import nullcontext
+from itertools import islice
+from typing import Any, Dict, Iterable, Iterator, Optional, Tuple
+
+from .scoring import MoodCounts
+
+# Characters per chunk: a few paragraphs, far below spaCy's max_length
+DEFAULT_CHUNK_CHARS = 2000
+
+# Sentence-final punctuation (plus closing quotes/brackets) followed by
+# whitespace, or a line break
+_SENTENCE_END = re.compile(r"[.!?…]+[\"'”’)\]]*\s+|\n\s*")
+_WHITESPACE = re.compile(r"\s+")
+
+
+def iter_chunks(text: str, max_chars: int = DEFAULT_CHUNK_CHARS) -> Iterator[Tuple[int, int]]:
+    """Yield ``(start, end)`` offsets of consecutive chunks covering ``text``.
+
+    Each chunk ends after the last sentence boundary in its window, else
+    after the last whitespace, else at ``max_chars``.
+    """
+    if max_chars < 1:
+        raise ValueError("max_chars must be >= 1")
+    start, length = 0, len(text)
+    while start < length:
+        if length - start <= max_chars:
+            yield start, length
+            return
+        window = text[start:start + max_chars]
+        cut = 0
+        for pattern in (_SENTENCE_END, _WHITESPACE):
+            for match in pattern.finditer(window):
+                cut = match.end()
+            if cut:
+                break
+        cut = cut or max_chars
+        yield start, start + cut
+        start += cut
+
+
+def _pipeline_counts(
+    nlp, text: str, spans: Iterable[Tuple[int, int]], batch_size: int, memory_zone=None
+) -> Iterator[Tuple[int, int, MoodCounts]]:
+    detector = nlp.get_pipe("mood_detector")
+    memory_zone = memory_zone or getattr(nlp, "memory_zone", nullcontext)
+    spans = iter(spans)
+    while True:
+        batch = list(islice(spans, batch_size))
+        if not batch:
+            return
+        # Strings interned for this batch's tokens are freed again (spaCy >= 3.8)
+        with memory_zone():
+            docs = nlp.pipe(text[start:end] for start, end in batch)
+            for (start, end), doc in zip(batch, docs):
+                yield start, end, detector.mood_counts(doc)
+
+
+def analyze_long(
+    text: str,
+    analyzer,
+    max_chars: int = DEFAULT_CHUNK_CHARS,
+    batch_size: int = 64,
+    memory_zone=None,
+) -> Dict[str, Any]:
+    """Analyze ``text`` chunk by chunk with a MoodEngine or a mood_detector pipeline.
+
+    Returns ``{"length", "mood", "vibe_score", "label_counts", "chunks"}``
+    where ``chunks`` is the timeline: ``{"start", "end", "mood",
+    "vibe_score"}`` per chunk, as character offsets into ``text``. A
+    pipeline's batches run in ``memory_zone`` (default ``nlp.memory_zone``).
+    """
+    if hasattr(analyzer, "mood_counts"):
+        scorer, lexicon = analyzer.scorer, analyzer.vibe_lexicon
+        chunk_counts = (
+            (start, end, analyzer.mood_counts(text[start:end]))
+            for start, end in iter_chunks(text, max_chars)
+        )
+    else:
+        detector = analyzer.get_pipe("mood_detector")
+        scorer, lexicon = detector.scorer, detector.vibe_lexicon
+        chunk_counts = _pipeline_counts(
+            analyzer, text, iter_chunks(text, max_chars), batch_size, memory_zone
+        )
+
+    chunks = []
+    total: Optional[MoodCounts] = None
+    for start, end, counts in chunk_counts:
+        chunks.append({
+            "start": start,
+            "end": end,
+            "mood": scorer.compute_mood(counts.labels),
+            "vibe_score": scorer.compute_vibe_score(counts.labels, counts.features(lexicon)),
+        })
+        total = counts if total is None else total.merge(counts)
+
+    if total is None:
+        return {"length": 0, "mood": "neutral", "vibe_score": 0, "label_counts": {}, "chunks": []}
+    return {
+        "length": len(text),
+        "mood": scorer.compute_mood(total.labels),
+        "vibe_score": scorer.compute_vibe_score(total.labels, total.features(lexicon)),
+        "label_counts": {scorer.labels[label_id]: total.labels.counts[label_id] for label_id in total.labels.order},
+        "chunks": chunks,
+    }
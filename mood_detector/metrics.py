@@ -0,0 +1,229 @@
+"""
+Lightweight metrics: counters, histograms, per-stage timings and
+Prometheus text rendering.
+
+Stage timing is off by default. When enabled (``STAGE_TIMINGS.enable()``
+or ``MOOD_TIMING=1``) MoodDetector, MoodEngine and instrumented pipelines
+record how long each stage took per document; when disabled the hooks cost
+one attribute check per document.
+"""
+
+import math
+import os
+import threading
+from bisect import bisect_left
+from time import perf_counter
+from typing import Dict, Iterable, List, Optional, Sequence, Tuple
+
+# Seconds; spans a regex pass over a tweet up to a parser run on a long doc
+STAGE_BUCKETS = tuple(
+    round(m * 10.0 ** e, 9) for e in range(-6, 0) for m in (1, 2.5, 5)
+) + (1.0,)
+LATENCY_BUCKETS = (0.001, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+LENGTH_BUCKETS = (16, 32, 64, 128, 256, 512, 1024, 2048, 4096, 16384, 65536)
+
+
+def _without_lock(obj) -> dict:
+    state = dict(vars(obj))
+    del state["_lock"]
+    return state
+
+
+def _restore_lock(obj, state: dict) -> None:
+    vars(obj).update(state)
+    obj._lock = threading.Lock()
+
+
+class Histogram:
+    """Fixed-bucket histogram (bucket upper bounds, plus an implicit +Inf)."""
+
+    __slots__ = ("bounds", "counts", "sum", "count", "_lock")
+
+    def __init__(self, bounds: Sequence[float]):
+        self.bounds = tuple(bounds)
+        self.counts = [0] * (len(self.bounds) + 1)
+        self.sum = 0.0
+        self.count = 0
+        self._lock = threading.Lock()
+
+    def observe(self, value: float, n: int = 1) -> None:
+        """Record ``n`` observations of ``value``."""
+        i = bisect_left(self.bounds, value)
+        with self._lock:
+            self.counts[i] += n
+            self.sum += value * n
+            self.count += n
+
+    # Locks can't be pickled (e.g. into nlp.pipe(n_process>1) workers
+    # started with spawn); the copy gets its own
+
+    def __getstate__(self):
+        return self.bounds, self.counts, self.sum, self.count
+
+    def __setstate__(self, state) -> None:
+        self.bounds, self.counts, self.sum, self.count = state
+        self._lock = threading.Lock()
+
+    def quantile(self, q: float) -> float:
+        """Estimate a quantile as the upper bound of the bucket holding it."""
+        if not self.count:
+            return 0.0
+        rank = q * self.count
+        seen = 0
+        for bound, n in zip(self.bounds, self.counts):
+            seen += n
+            if seen >= rank:
+                return bound
+        return math.inf
+
+    def cumulative(self) -> List[Tuple[float, int]]:
+        """(upper bound, cumulative count) pairs, ending with +Inf."""
+        pairs = []
+        total = 0
+        for bound, n in zip(self.bounds + (math.inf,), self.counts):
+            total += n
+            pairs.append((bound, total))
+        return pairs
+
+
+class HistogramVec:
+    """Histograms sharing bucket bounds, keyed by a tuple of label values."""
+
+    def __init__(self, label_names: Sequence[str], bounds: Sequence[float]):
+        self.label_names = tuple(label_names)
+        self.bounds = tuple(bounds)
+        self.children: Dict[Tuple[str, ...], Histogram] = {}
+        self._lock = threading.Lock()
+
+    def __getstate__(self):
+        return _without_lock(self)
+
+    def __setstate__(self, state) -> None:
+        _restore_lock(self, state)
+
+    def labels(self, *values: str) -> Histogram:
+        child = self.children.get(values)
+        if child is None:
+            with self._lock:
+                child = self.children.setdefault(values, Histogram(self.bounds))
+        return child
+
+    def clear(self) -> None:
+        with self._lock:
+            self.children.clear()
+
+
+class CounterVec:
+    """Monotonic counters keyed by a tuple of label values."""
+
+    def __init__(self, label_names: Sequence[str] = ()):
+        self.label_names = tuple(label_names)
+        self.values: Dict[Tuple[str, ...], float] = {}
+        self._lock = threading.Lock()
+
+    def __getstate__(self):
+        return _without_lock(self)
+
+    def __setstate__(self, state) -> None:
+        _restore_lock(self, state)
+
+    def inc(self, *values: str, amount: float = 1) -> None:
+        with self._lock:
+            self.values[values] = self.values.get(values, 0) + amount
+
+
+class StageClock:
+    """Records the time since the previous lap under a stage name."""
+
+    __slots__ = ("timings", "last")
+
+    def __init__(self, timings: "StageTimings"):
+        self.timings = timings
+        self.last = perf_counter()
+
+    def lap(self, stage: str) -> None:
+        now = perf_counter()
+        self.timings.record(stage, now - self.last)
+        self.last = now
+
+
+class StageTimings:
+    """Per-stage duration histograms behind an on/off switch."""
+
+    def __init__(self, enabled: bool = False):
+        self.enabled = enabled
+        self.histograms = HistogramVec(("stage",), STAGE_BUCKETS)
+
+    def enable(self, enabled: bool = True) -> None:
+        self.enabled = enabled
+
+    def clock(self) -> Optional[StageClock]:
+        """A StageClock started now, or None while timing is disabled."""
+        return StageClock(self) if self.enabled else None
+
+    def record(self, stage: str, seconds: float, n: int = 1) -> None:
+        self.histograms.labels(stage).observe(seconds, n)
+
+    def reset(self) -> None:
+        self.histograms.clear()
+
+    def summary(self) -> List[Dict]:
+        """Per-stage count, total, mean and p50/p95 bucket estimates, slowest first."""
+        rows = []
+        for (stage,), hist in self.histograms.children.items():
+            rows.append({
+                "stage": stage,
+                "count": hist.count,
+                "total_seconds": hist.sum,
+                "mean_seconds": hist.sum / hist.count if hist.count else 0.0,
+                "p50_seconds": hist.quantile(0.5),
+                "p95_seconds": hist.quantile(0.95),
+            })
+        rows.sort(key=lambda row: row["total_seconds"], reverse=True)
+        return rows
+
+
+STAGE_TIMINGS = StageTimings(enabled=os.environ.get("MOOD_TIMING", "") not in ("", "0"))
+
+
+# -- Prometheus text exposition --------------------------------------------
+
+def _escape(value) -> str:
+    return str(value).replace("\\", "\\\\").replace("\n", "\\n").replace('"', '\\"')
+
+
+def _labels(names: Iterable[str], values: Iterable) -> str:
+    pairs = [f'{name}="{_escape(value)}"' for name, value in zip(names, values)]
+    return "{" + ",".join(pairs) + "}" if pairs else ""
+
+
+def _number(value: float) -> str:
+    if value == math.inf:
+        return "+Inf"
+    if isinstance(value, float) and value.is_integer():
+        return str(int(value))
+    return repr(value)
+
+
+def render_counter(name: str, help_text: str, counter: CounterVec) -> List[str]:
+    lines = [f"# HELP {name} {help_text}", f"# TYPE {name} counter"]
+    for values, value in sorted(counter.values.items()):
+        lines.append(f"{name}{_labels(counter.label_names, values)} {_number(value)}")
+    return lines
+
+
+def render_gauge(name: str, help_text: str, value: float, kind: str = "gauge") -> List[str]:
+    return [f"# HELP {name} {help_text}", f"# TYPE {name} {kind}", f"{name} {_number(value)}"]
+
+
+def render_histogram(name: str, help_text: str, histograms: HistogramVec) -> List[str]:
+    lines = [f"# HELP {name} {help_text}", f"# TYPE {name} histogram"]
+    names = histograms.label_names
+    for values, hist in sorted(histograms.children.items()):
+        for bound, count in hist.cumulative():
+            labels = _labels(names + ("le",), values + (_number(bound),))
+            lines.append(f"{name}_bucket{labels} {count}")
+        labels = _labels(names, values)
+        lines.append(f"{name}_sum{labels} {_number(hist.sum)}")
+        lines.append(f"{name}_count{labels} {hist.count}")
+    return lines
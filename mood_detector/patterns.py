@@ -187,6 +187,27 @@ MOOD_PATTERNS = [
     },
 ]
 
+# Combination moods, checked in priority order (more specific first). A rule
+# fires when every one of its labels was matched at least once.
+MOOD_COMBINATIONS = [
+    {"labels": ["TIRED", "STRESSED", "ANXIETY"], "mood": "overwhelming exhaustion"},
+    {"labels": ["TIRED", "STRESSED"], "mood": "chaotic tired"},
+    {"labels": ["ANGRY", "PROBLEM_AVOIDANCE"], "mood": "chaotic frustration"},
+    {"labels": ["ANGRY", "SAD"], "mood": "bitter sadness"},
+    {"labels": ["SAD", "LONGING"], "mood": "melancholic longing"},
+    {"labels": ["ANXIETY", "STRESSED"], "mood": "anxious stress"},
+    {"labels": ["SARCASTIC", "CONFUSED"], "mood": "sarcastic confusion"},
+    {"labels": ["TIRED", "EXISTENTIAL"], "mood": "existential tired"},
+    {"labels": ["SAD", "DESPAIR"], "mood": "deep despair"},
+    {"labels": ["HAPPY", "EXCITED"], "mood": "joyful excitement"},
+    {"labels": ["LOVE", "GRATITUDE"], "mood": "grateful love"},
+    {"labels": ["RELIEF", "HAPPY"], "mood": "relieved happiness"},
+    {"labels": ["SURPRISE", "HAPPY"], "mood": "delighted surprise"},
+    {"labels": ["SURPRISE", "ANGRY"], "mood": "shocked anger"},
+    {"labels": ["DISAPPOINTMENT", "SAD"], "mood": "disappointed sadness"},
+    {"labels": ["REGRET", "SAD"], "mood": "regretful sadness"},
+]
+
 # Emotional trigger phrases (for highlighting)
 EMOTIONAL_TRIGGERS = {
     "sarcasm": ["lol", "sure", "okay", "right", "totally", "obviously", "of course", "absolutely", "sarcastic"],
@@ -210,6 +231,13 @@ EMOTIONAL_TRIGGERS = {
     "calm": ["calm", "peaceful", "relaxed", "chill", "zen", "serene"],
 }
 
+# Vibe score modifiers (matched as whole tokens, by lowercase form)
+INTENSITY_WORDS = ["very", "really", "extremely", "so", "incredibly", "absolutely", "completely", "totally", "utterly", "absolutely", "quite", "pretty", "super", "ultra", "mega", "insanely", "ridiculously"]
+CASUAL_WORDS = ["bro", "bruh", "dude", "lol", "haha", "lmao", "hehe"]
+EMOJI_WORDS = ["<3", "❤️", "😊", "😄", "😁", "😍", "🥰", "😎", "🔥", "✨", "🌟"]
+# Amplify the score by 1.3x in whichever direction it already points
+AMPLIFIER_WORDS = ["absolutely", "completely", "totally", "utterly"]
+
 # Vibe score weights (comprehensive)
 VIBE_WEIGHTS = {
     "ECSTATIC": 9,
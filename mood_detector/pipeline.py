@@ -0,0 +1,269 @@
+"""
+Shared pipeline loader for the SpaCy Mood Detective.
+"""
+
+import threading
+from contextlib import nullcontext
+from itertools import islice
+from time import perf_counter
+
+DEFAULT_MODEL = "en_core_web_sm"
+
+# "full" runs the statistical model (tagger, parser, NER, ...) before the
+# mood detector. "lite" only tokenizes, which is all MoodDetector needs since
+# it matches on LOWER and the raw text.
+PIPELINE_MODES = ("full", "lite")
+
+# "spacy" runs the pipeline above; "fast" is the spaCy-free MoodEngine
+ENGINES = ("spacy", "fast")
+
+# Keys of a result dict besides "text"; callers may ask for a subset
+RESULT_FIELDS = ("mood", "vibe_score", "emotional_triggers", "emotional_spans")
+
+
+def load_pipeline(mode: str = "lite", model: str = DEFAULT_MODEL, lazy: bool = True):
+    """Load a spaCy pipeline with the mood detector appended last.
+
+    Both modes produce the same ``doc._.mood``, ``doc._.vibe_score`` and
+    triggers. With ``lazy`` the extension attributes are computed when first
+    read; pass ``lazy=False`` to compute them in the pipeline, e.g. in
+    ``nlp.pipe`` worker processes. Raises ``OSError`` if ``mode="full"`` and
+    the model is missing.
+    """
+    if mode not in PIPELINE_MODES:
+        raise ValueError(f"Unknown pipeline mode {mode!r}, expected one of {PIPELINE_MODES}")
+
+    # spaCy is imported here so the fast engine never pays for it
+    import spacy
+    # Importing the detector module registers the "mood_detector" factory
+    from . import detector  # noqa: F401
+
+    if mode == "full":
+        nlp = spacy.load(model)
+    else:
+        nlp = spacy.blank("en")
+
+    if "mood_detector" not in nlp.pipe_names:
+        nlp.add_pipe("mood_detector", last=True, config={"lazy": lazy})
+
+    return nlp
+
+
+def doc_to_result(doc, fields=None) -> dict:
+    """Collect the mood detector's extension attributes into a result dict.
+
+    ``fields`` restricts the result to a subset of RESULT_FIELDS (plus
+    "text"); the attributes left out are never computed.
+    """
+    result = {"text": doc.text}
+    for field in fields or RESULT_FIELDS:
+        result[field] = getattr(doc._, field)
+    return result
+
+
+class SharedMemoryZone:
+    """``nlp.memory_zone()`` for pipelines shared between threads.
+
+    Memory zones are per vocab: leaving one frees every transient string,
+    including those of docs another thread is still processing. Threads
+    entering a SharedMemoryZone join the zone that is already open instead,
+    and the last one out closes it. Once ``max_entries`` callers have
+    joined, new ones wait for the zone to close, so its strings are freed
+    even under constant load. Call it in place of ``nlp.memory_zone``.
+
+    Memory zones are the only thing threads have to coordinate on: the
+    tokenizer and the lazy mood detector keep their state per doc, so the
+    API workers and the daemon call one shared pipeline concurrently.
+    """
+
+    def __init__(self, nlp, max_entries: int = 64):
+        self._memory_zone = getattr(nlp, "memory_zone", nullcontext)
+        self.max_entries = max_entries
+        self._cond = threading.Condition()
+        self._zone = None
+        self._users = 0
+        self._entries = 0
+
+    def __call__(self):
+        return self
+
+    def __enter__(self):
+        with self._cond:
+            while self._entries >= self.max_entries:
+                self._cond.wait()
+            if self._users == 0:
+                self._zone = self._memory_zone()
+                self._zone.__enter__()
+            self._users += 1
+            self._entries += 1
+
+    def __exit__(self, *exc_info):
+        with self._cond:
+            self._users -= 1
+            if self._users == 0:
+                zone, self._zone = self._zone, None
+                self._entries = 0
+                self._cond.notify_all()
+                zone.__exit__(None, None, None)
+
+
+def _pipe_processes(nlp, texts, batch_size: int, n_process: int):
+    """``nlp.pipe(n_process>1)`` with its workers forked from a thread of their own.
+
+    spaCy starts the workers on the first ``next()``, from the calling
+    thread. A child forked from a concurrent.futures pool thread (an API
+    worker) would try to join that thread at exit and fail, so the first
+    doc is fetched from a plain thread; the rest is read from the caller.
+    """
+    docs = nlp.pipe(texts, batch_size=batch_size, n_process=n_process)
+    first: list = []
+    errors: list = []
+
+    def start():
+        try:
+            first.extend(islice(docs, 1))
+        except BaseException as e:
+            errors.append(e)
+
+    thread = threading.Thread(target=start, name="pipe-processes")
+    thread.start()
+    thread.join()
+    if errors:
+        raise errors[0]
+    yield from first
+    yield from docs
+
+
+def pipe_results(
+    nlp,
+    texts,
+    batch_size: int = 256,
+    n_process: int = 1,
+    fields=None,
+    compact: bool = False,
+    memory_zone=None,
+):
+    """Lazily yield a result dict per text, batching through ``nlp.pipe``.
+
+    Each batch runs inside ``nlp.memory_zone()`` (spaCy >= 3.8), so strings
+    for tokens seen only in that batch are freed again and memory stays flat
+    on arbitrarily long inputs of unique text. With ``n_process > 1`` the
+    texts go through a single ``nlp.pipe`` call instead, since every call
+    starts its own worker processes. ``fields`` is passed to
+    ``doc_to_result``; with ``compact`` the results are ``MoodResult``
+    objects (``doc._.mood_result``) instead of dicts. Vibe scores are
+    computed per batch with the mood detector's vectorized scorer. Pass a
+    SharedMemoryZone as ``memory_zone`` when other threads use ``nlp`` too.
+    """
+    def convert(doc):
+        return doc._.mood_result(fields) if compact else doc_to_result(doc, fields)
+
+    # Vibe scores for a whole batch in one vectorized pass
+    score_vibes = None
+    if "mood_detector" in nlp.pipe_names and (fields is None or "vibe_score" in fields):
+        score_vibes = getattr(nlp.get_pipe("mood_detector"), "score_vibes", None)
+
+    if n_process > 1:
+        for doc in _pipe_processes(nlp, texts, batch_size, n_process):
+            yield convert(doc)
+        return
+
+    memory_zone = memory_zone or getattr(nlp, "memory_zone", nullcontext)
+    texts = iter(texts)
+    while True:
+        chunk = list(islice(texts, batch_size))
+        if not chunk:
+            return
+        with memory_zone():
+            docs = list(nlp.pipe(chunk, batch_size=batch_size, n_process=n_process))
+            if score_vibes is not None:
+                score_vibes(docs)
+            results = [convert(doc) for doc in docs]
+        yield from results
+
+
+class _TimedTokenizer:
+    """Wraps ``nlp.tokenizer`` to record its time under "tokenizer"."""
+
+    def __init__(self, tokenizer, timings):
+        self._inner = tokenizer
+        self._timings = timings
+
+    def __call__(self, text):
+        if not self._timings.enabled:
+            return self._inner(text)
+        start = perf_counter()
+        doc = self._inner(text)
+        self._timings.record("tokenizer", perf_counter() - start)
+        return doc
+
+    def __getattr__(self, name):
+        # "_inner" itself is missing while a pickled copy is being restored
+        if name == "_inner":
+            raise AttributeError(name)
+        return getattr(self._inner, name)
+
+
+class _TimedComponent:
+    """Wraps a pipeline component to record its time under its name."""
+
+    def __init__(self, name, component, timings):
+        self._name = name
+        self._inner = component
+        self._timings = timings
+
+    def __call__(self, doc, **kwargs):
+        if not self._timings.enabled:
+            return self._inner(doc, **kwargs)
+        start = perf_counter()
+        doc = self._inner(doc, **kwargs)
+        self._timings.record(self._name, perf_counter() - start)
+        return doc
+
+    def __getattr__(self, name):
+        # "_inner" itself is missing while a pickled copy is being restored
+        if name == "_inner":
+            raise AttributeError(name)
+        return getattr(self._inner, name)
+
+
+class _TimedBatchComponent(_TimedComponent):
+    """A _TimedComponent for components with their own batched ``pipe``."""
+
+    def pipe(self, docs, batch_size: int = 128, **kwargs):
+        if not self._timings.enabled:
+            yield from self._inner.pipe(docs, batch_size=batch_size, **kwargs)
+            return
+        docs = iter(docs)
+        while True:
+            # Upstream components run while the batch is collected, so only
+            # this component's own work falls inside the timed region
+            batch = list(islice(docs, batch_size))
+            if not batch:
+                return
+            start = perf_counter()
+            done = list(self._inner.pipe(batch, batch_size=batch_size, **kwargs))
+            self._timings.record(self._name, (perf_counter() - start) / len(batch), len(batch))
+            yield from done
+
+
+def instrument_pipeline(nlp, timings=None):
+    """Record per-document time for the tokenizer and each component.
+
+    Timings go to ``timings`` (default: ``metrics.STAGE_TIMINGS``) and are
+    only taken while it is enabled. Batched components are timed per batch
+    and the time is spread evenly over its docs. Returns ``nlp``.
+    """
+    from .metrics import STAGE_TIMINGS
+
+    timings = timings or STAGE_TIMINGS
+    if not isinstance(nlp.tokenizer, _TimedTokenizer):
+        nlp.tokenizer = _TimedTokenizer(nlp.tokenizer, timings)
+    # spaCy keeps (name, component) pairs here; there is no public API for
+    # wrapping a component in place
+    for i, (name, component) in enumerate(nlp._components):
+        if isinstance(component, _TimedComponent):
+            continue
+        wrapper = _TimedBatchComponent if hasattr(component, "pipe") else _TimedComponent
+        nlp._components[i] = (name, wrapper(name, component, timings))
+    return nlp
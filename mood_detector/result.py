@@ -0,0 +1,103 @@
+"""
+Compact analysis results.
+
+A ``MoodResult`` keeps the text it was computed from plus integer offsets
+and interned IDs: trigger phrases as ``(start, end, trigger_type_id)`` into
+``TRIGGER_TYPES`` and spans as ``(start, end, label_id)`` into the pattern
+labels, both as character offsets into ``text``. Strings, dicts and lists
+are only built when the result is serialized, with ``to_dict`` (the result
+dict every other API returns) or ``to_json_dict`` (the REST response shape).
+"""
+
+from typing import Any, Dict, List, Optional, Sequence, Tuple
+
+from .lexicon import CompiledPatterns
+from .pipeline import RESULT_FIELDS
+from .scoring import TRIGGER_TYPES
+
+Offsets = List[Tuple[int, int, int]]
+
+
+class MoodResult:
+    """Mood, vibe score, trigger and span offsets for one text.
+
+    Fields that were not requested from the engine are None.
+    """
+
+    __slots__ = ("text", "patterns", "mood", "vibe_score", "triggers", "spans")
+
+    def __init__(
+        self,
+        text: str,
+        patterns: CompiledPatterns,
+        mood: Optional[str] = None,
+        vibe_score: Optional[int] = None,
+        triggers: Optional[Offsets] = None,
+        spans: Optional[Offsets] = None,
+    ):
+        self.text = text
+        # Shared label tables, not a copy
+        self.patterns = patterns
+        self.mood = mood
+        self.vibe_score = vibe_score
+        self.triggers = triggers
+        self.spans = spans
+
+    def emotional_spans(self) -> List[Tuple[str, str]]:
+        """(span text, label) per matched span."""
+        text, labels = self.text, self.patterns.labels
+        return [(text[start:end], labels[label_id]) for start, end, label_id in self.spans]
+
+    def emotional_triggers(self) -> List[Dict[str, str]]:
+        """Trigger phrases followed by the matched spans, as {"text", "type"} dicts."""
+        text, label_types = self.text, self.patterns.label_types
+        triggers = [
+            {"text": text[start:end], "type": TRIGGER_TYPES[type_id]}
+            for start, end, type_id in self.triggers
+        ]
+        triggers += [
+            {"text": text[start:end], "type": label_types[label_id]}
+            for start, end, label_id in self.spans
+        ]
+        return triggers
+
+    def to_dict(self, fields: Optional[Sequence[str]] = None) -> Dict[str, Any]:
+        """The plain result dict, limited to ``fields`` if given."""
+        result: Dict[str, Any] = {"text": self.text}
+        for field in fields or RESULT_FIELDS:
+            if field == "emotional_triggers":
+                result[field] = self.emotional_triggers()
+            elif field == "emotional_spans":
+                result[field] = self.emotional_spans()
+            else:
+                result[field] = getattr(self, field)
+        return result
+
+    def to_json_dict(self, fields: Optional[Sequence[str]] = None) -> Dict[str, Any]:
+        """Like ``to_dict``, with spans as {"text", "label"} objects."""
+        result = self.to_dict(fields)
+        if "emotional_spans" in result:
+            result["emotional_spans"] = [
+                {"text": span, "label": label} for span, label in result["emotional_spans"]
+            ]
+        return result
+
+    def nbytes(self) -> int:
+        """Rough memory footprint in bytes."""
+        n_offsets = len(self.triggers or ()) + len(self.spans or ())
+        return 200 + 2 * len(self.text) + 80 * n_offsets
+
+    def __eq__(self, other) -> bool:
+        if not isinstance(other, MoodResult):
+            return NotImplemented
+        return (
+            self.text == other.text
+            and self.mood == other.mood
+            and self.vibe_score == other.vibe_score
+            and self.triggers == other.triggers
+            and self.spans == other.spans
+            and self.patterns.labels == other.patterns.labels
+        )
+
+    def __repr__(self) -> str:
+        return f"MoodResult(mood={self.mood!r}, vibe_score={self.vibe_score!r}, text={self.text[:40]!r})"
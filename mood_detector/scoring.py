@@ -0,0 +1,414 @@
+"""
+Mood, vibe score and trigger computation shared by every engine.
+
+Scoring only needs the matched label IDs and the raw text, so the spaCy
+component and the spaCy-free fast path produce identical results.
+"""
+
+from array import array
+from functools import lru_cache
+from typing import Any, Callable, Dict, FrozenSet, Hashable, Iterable, List, Optional, Sequence, Tuple
+
+from .automaton import PhraseAutomaton
+from .lexicon import CompiledPatterns
+from .patterns import (
+    MOOD_COMBINATIONS,
+    EMOTIONAL_TRIGGERS,
+    VIBE_WEIGHTS,
+    MOOD_LABELS,
+    INTENSITY_WORDS,
+    CASUAL_WORDS,
+    EMOJI_WORDS,
+    AMPLIFIER_WORDS,
+)
+
+
+# Every trigger phrase, in EMOTIONAL_TRIGGERS order
+TRIGGER_PHRASES: Tuple[str, ...] = tuple(word for words in EMOTIONAL_TRIGGERS.values() for word in words)
+
+# Trigger types by ID, and each type's phrases in priority order
+TRIGGER_TYPES: Tuple[str, ...] = tuple(EMOTIONAL_TRIGGERS)
+_TRIGGER_WORDS = tuple(EMOTIONAL_TRIGGERS.values())
+
+# (intensity, exclamations, questions, shouting, casual, emoji, amplified)
+VibeFeatures = Tuple[int, int, int, int, int, int, int]
+
+
+def char_features(word: str) -> Tuple[int, int, int]:
+    """(uppercase characters, "!" count, "?" count) of a token's text."""
+    return sum(1 for c in word if c.isupper()), word.count("!"), word.count("?")
+
+
+class VibeLexicon:
+    """The vibe modifier words as sets of token keys.
+
+    Modifiers count when a token's lowercase form is one of the words, so
+    "so" no longer fires inside "also" or "bro" inside "broken". ``key``
+    maps a lowercase word to whatever tokens are looked up by: the word
+    itself (the default) or a spaCy lexeme ID.
+    """
+
+    def __init__(self, key: Optional[Callable[[str], Hashable]] = None):
+        key = key or (lambda word: word)
+        # INTENSITY_WORDS lists "absolutely" twice, and it counts twice
+        self.intensity: Dict[Hashable, int] = {}
+        for word in INTENSITY_WORDS:
+            self.intensity[key(word)] = self.intensity.get(key(word), 0) + 1
+        self.casual = frozenset(key(word) for word in CASUAL_WORDS)
+        # spaCy splits the emoji variation selector off ("❤️" -> "❤", "\ufe0f")
+        self.emoji = frozenset(
+            key(form) for word in EMOJI_WORDS for form in {word, word.replace("\ufe0f", "")}
+        )
+        self.amplifiers = frozenset(key(word) for word in AMPLIFIER_WORDS)
+        self.modifier_keys = frozenset(self.intensity).union(self.casual, self.emoji, self.amplifiers)
+
+    def modifiers(self, lowers: Iterable[Hashable]) -> FrozenSet[Hashable]:
+        """The distinct modifier keys among a doc's lowercase token keys."""
+        return self.modifier_keys.intersection(lowers)
+
+    def features(
+        self,
+        lowers: Iterable[Hashable],
+        text_len: int,
+        upper_chars: int,
+        exclamations: int,
+        questions: int,
+    ) -> VibeFeatures:
+        """Vibe features from a doc's lowercase token keys and character counts.
+
+        Each distinct modifier word counts once however often it occurs.
+        """
+        present = set(lowers)
+        intensity = self.intensity
+        # All caps detection (shouting - usually negative)
+        shouting = upper_chars / max(text_len, 1) > 0.7 and text_len > 5
+        return (
+            sum(intensity[key] for key in present.intersection(intensity)),
+            exclamations,
+            questions,
+            int(shouting),
+            len(present & self.casual),
+            len(present & self.emoji),
+            int(not present.isdisjoint(self.amplifiers)),
+        )
+
+
+@lru_cache(maxsize=None)
+def trigger_automaton() -> PhraseAutomaton:
+    """TRIGGER_PHRASES compiled once, so a document needs a single pass to find all of them."""
+    return PhraseAutomaton(TRIGGER_PHRASES)
+
+
+def scan_text(text: str, automaton: Optional[PhraseAutomaton] = None) -> Dict[str, int]:
+    """Find every trigger phrase in ``text`` in one pass.
+
+    Returns ``{phrase: index of its first occurrence in text.lower()}``.
+    ``automaton`` defaults to ``trigger_automaton()``.
+    """
+    return (automaton or trigger_automaton()).first_occurrences(text.lower())
+
+
+class LabelCounts:
+    """Per-document label counts, built in one pass over the matches.
+
+    ``counts`` is indexed by label ID, ``mask`` has bit ``label_id`` set for
+    every label present and ``order`` lists the present labels by first match.
+    """
+
+    __slots__ = ("counts", "mask", "order")
+
+    def __init__(self, n_labels: int, label_ids: Iterable[int]):
+        counts = array("I", bytes(4 * n_labels))
+        order = []
+        mask = 0
+        for label_id in label_ids:
+            if not counts[label_id]:
+                order.append(label_id)
+                mask |= 1 << label_id
+            counts[label_id] += 1
+        self.counts = counts
+        self.mask = mask
+        self.order = order
+
+    def merge(self, other: "LabelCounts") -> "LabelCounts":
+        """Counts of this text followed by ``other``'s."""
+        merged = LabelCounts(len(self.counts), ())
+        merged.counts = array("I", (a + b for a, b in zip(self.counts, other.counts)))
+        merged.mask = self.mask | other.mask
+        merged.order = self.order + [label_id for label_id in other.order if not self.mask >> label_id & 1]
+        return merged
+
+
+class MoodCounts:
+    """Everything the mood and vibe score of a text are computed from.
+
+    Label counts, the distinct vibe modifier keys and character counts. The
+    counts of consecutive chunks ``merge`` into those of the whole text, so
+    a long document's aggregate never has to scan it again.
+    """
+
+    __slots__ = ("labels", "modifiers", "text_len", "upper_chars", "exclamations", "questions")
+
+    def __init__(
+        self,
+        labels: LabelCounts,
+        modifiers: FrozenSet[Hashable],
+        text_len: int,
+        upper_chars: int,
+        exclamations: int,
+        questions: int,
+    ):
+        self.labels = labels
+        self.modifiers = modifiers
+        self.text_len = text_len
+        self.upper_chars = upper_chars
+        self.exclamations = exclamations
+        self.questions = questions
+
+    def merge(self, other: "MoodCounts") -> "MoodCounts":
+        """Counts of this text followed by ``other``'s."""
+        return MoodCounts(
+            self.labels.merge(other.labels),
+            self.modifiers | other.modifiers,
+            self.text_len + other.text_len,
+            self.upper_chars + other.upper_chars,
+            self.exclamations + other.exclamations,
+            self.questions + other.questions,
+        )
+
+    def features(self, lexicon: VibeLexicon) -> VibeFeatures:
+        """Vibe features, with modifier keys resolved by ``lexicon``."""
+        return lexicon.features(
+            self.modifiers, self.text_len, self.upper_chars, self.exclamations, self.questions
+        )
+
+
+class MoodScorer:
+    """Mood and vibe scoring over interned label IDs.
+
+    Built once from a ``CompiledPatterns``; the per-label weights, mood names
+    and combination rules are all precompiled into lists and bitmasks.
+    """
+
+    # Upper bound on memoized label sets for the combination lookup
+    MAX_CACHED_MASKS = 4096
+
+    def __init__(self, patterns: CompiledPatterns, combinations: List[Dict] = MOOD_COMBINATIONS):
+        self.labels = patterns.labels
+        self.n_labels = len(self.labels)
+        self.weights = [VIBE_WEIGHTS.get(label, 0) for label in self.labels]
+        self.mood_names = [MOOD_LABELS.get(label, label.lower()) for label in self.labels]
+
+        # (bitmask, mood) in priority order. Rules that mention a label no
+        # pattern produces can never fire, so they're left out.
+        self.combinations: List[Tuple[int, str]] = []
+        for rule in combinations:
+            if all(label in patterns.label_ids for label in rule["labels"]):
+                mask = 0
+                for label in rule["labels"]:
+                    mask |= 1 << patterns.label_ids[label]
+                self.combinations.append((mask, rule["mood"]))
+
+        # Present-label mask -> winning combination mood (or None). Documents
+        # repeat the same few label sets, so this keeps the rule walk off the
+        # per-doc path however many rules there are.
+        self._combination_cache: Dict[int, Optional[str]] = {}
+
+    def to_dict(self) -> Dict[str, Any]:
+        """The weight, mood name and combination tables (for msgpack/JSON)."""
+        return {
+            "weights": self.weights,
+            "mood_names": self.mood_names,
+            "combinations": [list(rule) for rule in self.combinations],
+        }
+
+    @classmethod
+    def from_dict(cls, patterns: CompiledPatterns, data: Dict[str, Any]) -> "MoodScorer":
+        """Rebuild from ``to_dict`` output; ``patterns`` must be the ones it was built with."""
+        scorer = cls.__new__(cls)
+        scorer.labels = patterns.labels
+        scorer.n_labels = len(scorer.labels)
+        scorer.weights = list(data["weights"])
+        scorer.mood_names = list(data["mood_names"])
+        scorer.combinations = [(mask, mood) for mask, mood in data["combinations"]]
+        scorer._combination_cache = {}
+        return scorer
+
+    def count(self, label_ids: Iterable[int]) -> LabelCounts:
+        """Count matched label IDs."""
+        return LabelCounts(self.n_labels, label_ids)
+
+    def combination_mood(self, mask: int) -> Optional[str]:
+        """Return the highest-priority combination mood for a label mask."""
+        cache = self._combination_cache
+        if mask in cache:
+            return cache[mask]
+        mood = None
+        for rule_mask, rule_mood in self.combinations:
+            if mask & rule_mask == rule_mask:
+                mood = rule_mood
+                break
+        if len(cache) < self.MAX_CACHED_MASKS:
+            cache[mask] = mood
+        return mood
+
+    def compute_mood(self, counts: LabelCounts) -> str:
+        """Determine the primary mood from label counts."""
+        if not counts.order:
+            return "neutral"
+        
+        # Check for combinations first
+        mood = self.combination_mood(counts.mask)
+        if mood is not None:
+            return mood
+        
+        # Find the most common mood (ties go to the label matched first)
+        primary = max(counts.order, key=counts.counts.__getitem__)
+        
+        # Return the human-readable mood label
+        return self.mood_names[primary]
+
+    def compute_vibe_score(self, counts: LabelCounts, features: VibeFeatures) -> int:
+        """Calculate the vibe score from -10 to +10.
+
+        ``features`` come from ``VibeLexicon.features`` for the same document.
+        """
+        if not counts.order:
+            return 0
+        
+        # Calculate weighted score, with diminishing returns for multiple
+        # occurrences (capped at 3x per mood type)
+        weights = self.weights
+        label_counts = counts.counts
+        score = sum(weights[label_id] * min(label_counts[label_id], 3) for label_id in counts.order)
+        
+        return apply_vibe_modifiers(score, features)
+
+    def compute_vibe_scores(
+        self, counts: Sequence[LabelCounts], features: Sequence[VibeFeatures]
+    ) -> List[int]:
+        """Vibe scores for a batch of documents in one vectorized pass.
+
+        Same results as calling ``compute_vibe_score`` per document. Needs NumPy.
+        """
+        if not counts:
+            return []
+        label_counts = [doc_counts.counts for doc_counts in counts]
+        return vectorized_vibe_scores(self.weights, label_counts, features)
+
+
+def apply_vibe_modifiers(score: int, features: VibeFeatures) -> int:
+    """Adjust a weighted label score by the text's modifiers and clamp it."""
+    intensity_count, exclamation_count, question_count, shouting, casual_count, emoji_count, amplified = features
+    
+    # Intensity modifiers
+    if intensity_count > 0:
+        score = int(score * (1.0 + (intensity_count * 0.15)))  # Scale with intensity
+    
+    # Exclamation marks increase intensity (positive or negative)
+    if score > 0:
+        score += min(exclamation_count, 4)  # Positive intensity
+    else:
+        score -= min(exclamation_count, 4)  # Negative intensity
+    
+    # Question marks (confusion/uncertainty)
+    score -= min(question_count, 3)
+    
+    # Shouting
+    if shouting:
+        score -= 4
+    
+    # Casual words boost (slightly positive)
+    score += min(casual_count, 2)
+    
+    # Emoji-like words (positive)
+    score += min(emoji_count, 3)
+    
+    # Intensifiers amplify negative and positive emotions alike
+    if score != 0 and amplified:
+        score = int(score * 1.3)
+    
+    # Clamp to -10 to +10
+    score = max(-10, min(10, score))
+    
+    return score
+
+
+def vectorized_vibe_scores(weights, label_counts, features) -> List[int]:
+    """Vibe scores for a batch from a docs x labels count matrix and a docs x 7
+    ``VibeFeatures`` matrix, computed with NumPy array operations.
+
+    Gives exactly ``MoodScorer.compute_vibe_score`` per row, including the
+    truncating ``int()`` after each float multiplication.
+    """
+    import numpy as np
+
+    counts = np.asarray(label_counts, dtype=np.int64)
+    intensity, exclamations, questions, shouting, casual, emoji, amplified = (
+        np.asarray(features, dtype=np.int64).reshape(-1, 7).T
+    )
+    
+    # Weighted label score, each label capped at 3 occurrences
+    score = np.minimum(counts, 3) @ np.asarray(weights, dtype=np.int64)
+    has_labels = counts.any(axis=1)
+    
+    scaled = np.trunc(score * (1.0 + intensity * 0.15)).astype(np.int64)
+    score = np.where(intensity > 0, scaled, score)
+    score += np.where(score > 0, 1, -1) * np.minimum(exclamations, 4)
+    score -= np.minimum(questions, 3)
+    score -= 4 * shouting
+    score += np.minimum(casual, 2) + np.minimum(emoji, 3)
+    amplified_score = np.trunc(score * 1.3).astype(np.int64)
+    score = np.where((score != 0) & (amplified != 0), amplified_score, score)
+    score = np.clip(score, -10, 10)
+    
+    # Docs without a single matched label score 0 whatever their modifiers
+    return np.where(has_labels, score, 0).tolist()
+
+
+def find_triggers(hits: Dict[str, int]) -> List[Tuple[int, int, int]]:
+    """Return ``(start, end, trigger_type_id)`` for the first phrase of each trigger type.
+
+    ``hits`` is the result of ``scan_text``; offsets index the scanned text.
+    """
+    found = []
+    for type_id, trigger_words in enumerate(_TRIGGER_WORDS):
+        for word in trigger_words:
+            start_idx = hits.get(word)
+            if start_idx is not None:
+                found.append((start_idx, start_idx + len(word), type_id))
+                break  # Only add once per trigger type
+    return found
+
+
+# Span label -> trigger type, filled in as labels are seen
+_LABEL_TYPES: Dict[str, str] = {}
+
+
+def extract_emotional_triggers(
+    text: str, spans: List[Tuple[str, str]], hits: Optional[Dict[str, int]] = None
+) -> List[Dict[str, Any]]:
+    """Extract emotional triggers from the text and its (span text, label) matches.
+
+    ``hits`` is the result of ``scan_text(text)``, if the caller already has it.
+    """
+    if hits is None:
+        hits = scan_text(text)
+    
+    # Slice the first occurrence of each trigger phrase out of the original text
+    triggers = [
+        {"text": text[start:end], "type": TRIGGER_TYPES[type_id]}
+        for start, end, type_id in find_triggers(hits)
+    ]
+    
+    # Also add matched spans
+    for trigger_text, label in spans:
+        trigger_type = _LABEL_TYPES.get(label)
+        if trigger_type is None:
+            trigger_type = _LABEL_TYPES[label] = label.lower().replace("_", " ")
+        triggers.append({
+            "text": trigger_text,
+            "type": trigger_type
+        })
+    
+    return triggers
@@ -0,0 +1,72 @@
+"""
+Regex tokenizer for the spaCy-free fast engine.
+
+``tokenize`` splits text into roughly the tokens ``spacy.blank("en")``
+produces, with one precompiled regex instead of spaCy's affix rules and
+tokenizer exceptions. Whitespace is handled exactly like spaCy: a single
+space after a token is that token's trailing whitespace, any other
+whitespace run is a token of its own. Within a run of non-space text:
+
+- URLs ("http://...", "www....") stay whole, minus trailing punctuation.
+- "<3" and the common ":)" / ";-(" / ":D" style emoticons stay whole.
+- "n't" and the clitics "'s", "'m", "'re", "'ve", "'ll", "'d" (straight or
+  curly apostrophe) are split off the word before them, and so is "'S";
+  like in spaCy, other all-caps contractions ("DON'T") stay whole.
+- Letters and digits form a word; an apostrophe or dot between them stays
+  in the word ("o'clock", "love.hate"), except a dot before an uppercase
+  letter ("sad.I" -> "sad", ".", "I").
+- ".." or longer and "--" or longer are one token; any other character is
+  a token of its own.
+
+Where that differs from spaCy, tokens can differ too, and with them the
+lexicon matches. The known cases:
+
+- Punctuation is always split off. spaCy leaves some of it inside a token
+  ("sad;happy", "--sad", "@sad", "what's…"), so a lexicon word there only
+  matches here.
+- spaCy's other tokenizer exceptions are not applied: abbreviations and
+  initials split at their dots ("e.g." -> "e.g", "."; "I." -> "I", "."),
+  contractions written without an apostrophe stay whole ("dont", "im",
+  "cannot", "gonna"), and so do "c'mon" and "y'all".
+- Emoticons spaCy keeps whole beyond the ones above ("(-_-)", "^_^") are
+  split into characters.
+
+tests/test_tokenizer.py pins these down, and checks that ordinary prose
+tokenizes exactly like spaCy.
+"""
+
+import re
+from typing import List, Tuple
+
+_TOKEN_RE = re.compile(
+    r"""
+    # Whitespace, with the trailing space of a token in front of it
+    (?:(?<=\S)\ )?(?P<space>\s+)
+    # URLs, without trailing punctuation
+    | (?:[A-Za-z][\w+.-]*://|www\.)\S*?(?=[.,;:!?)\]'"]*(?:\s|$))
+    # Hearts and emoticons
+    | <3 | [:;=8]['-]?[()\[\]DPpOo3*/|]
+    # "do" + "n't", "it" + "'s"
+    | [^\W_]+?(?=n['’]t\b) | n['’]t\b
+    | ['’](?:[sS]|m|re|ve|ll|d)\b
+    # Words, with inner apostrophes and dots
+    | [^\W_]+(?:(?:['’](?!(?:[sS]|m|re|ve|ll|d)\b)|\.(?![A-Z]))[^\W_]+)*
+    # Ellipses and dashes
+    | \.\.+ | --+
+    | \S
+    """,
+    re.VERBOSE,
+)
+
+
+def tokenize(text: str) -> List[Tuple[str, int]]:
+    """``(token text, start_char)`` for every token in ``text``."""
+    tokens = []
+    for match in _TOKEN_RE.finditer(text):
+        start = match.start("space")
+        if start < 0:
+            tokens.append((match.group(), match.start()))
+        # A lone space after a token is its trailing whitespace
+        elif not (start and start == match.start() and match.group() == " "):
+            tokens.append((match.group("space"), start))
+    return tokens
@@ -0,0 +1,165 @@
+"""
+Bounded worker pool for running mood analysis off the event loop.
+
+Inference is CPU-bound, so the async API hands it to a thread or process
+executor. The pool caps the number of requests in flight (running plus
+queued); once that limit is reached new work is rejected immediately
+instead of piling up, which lets the service answer with a fast 503.
+"""
+
+import asyncio
+import threading
+import time
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+from typing import Any, Callable, Dict, Optional
+
+WORKER_KINDS = ("thread", "process")
+
+
+class PoolSaturated(RuntimeError):
+    """Raised when the pool's queue is full and the work was not accepted."""
+
+
+def _timed_call(fn: Callable, args: tuple, enqueued_at: float):
+    # Runs inside the worker; wall-clock time is comparable across processes
+    started_at = time.time()
+    return started_at - enqueued_at, fn(*args)
+
+
+class WorkerPool:
+    """
+    A thread or process executor with a bounded queue and per-call timeouts.
+
+    At most ``max_workers`` calls run at once and at most ``max_queue``
+    more wait for a worker. Functions submitted to a process pool must be
+    picklable (i.e. defined at module level).
+    """
+
+    def __init__(
+        self,
+        kind: str = "thread",
+        max_workers: int = 4,
+        max_queue: int = 64,
+        timeout: Optional[float] = 30.0,
+    ):
+        if kind not in WORKER_KINDS:
+            raise ValueError(f"Unknown worker kind {kind!r}; expected one of {WORKER_KINDS}")
+        if max_workers < 1 or max_queue < 0:
+            raise ValueError("max_workers must be >= 1 and max_queue >= 0")
+
+        self.kind = kind
+        self.max_workers = max_workers
+        self.max_queue = max_queue
+        self.timeout = timeout
+
+        executor_cls = ThreadPoolExecutor if kind == "thread" else ProcessPoolExecutor
+        self._executor = executor_cls(max_workers=max_workers)
+        self._lock = threading.Lock()
+        # Submitted executor futures that haven't finished, for shutdown()
+        self._pending = set()
+        self._in_flight = 0
+        self._completed = 0
+        self._rejected = 0
+        self._timed_out = 0
+        self._failed = 0
+        self._wait_total = 0.0
+        self._wait_max = 0.0
+        self._wait_last = 0.0
+
+    @property
+    def capacity(self) -> int:
+        return self.max_workers + self.max_queue
+
+    def _acquire(self) -> None:
+        with self._lock:
+            if self._in_flight >= self.capacity:
+                self._rejected += 1
+                raise PoolSaturated(
+                    f"Worker pool saturated ({self._in_flight} requests in flight)"
+                )
+            self._in_flight += 1
+
+    def _release(self, future) -> None:
+        # The slot is held until the work really finishes, even if the caller
+        # already gave up waiting; a timed-out call still occupies a worker.
+        with self._lock:
+            self._in_flight -= 1
+            self._pending.discard(future)
+            if future.cancelled() or future.exception() is not None:
+                self._failed += 1
+                return
+            waited = future.result()[0]
+            self._completed += 1
+            self._wait_total += waited
+            self._wait_last = waited
+            self._wait_max = max(self._wait_max, waited)
+
+    async def run(self, fn: Callable, *args, timeout: Optional[float] = None) -> Any:
+        """
+        Run ``fn(*args)`` in the pool and return its result.
+
+        Raises PoolSaturated straight away when the queue is full and
+        asyncio.TimeoutError if the call takes longer than ``timeout``
+        (defaults to the pool's timeout).
+        """
+        self._acquire()
+        try:
+            future = self._executor.submit(_timed_call, fn, args, time.time())
+        except BaseException:
+            with self._lock:
+                self._in_flight -= 1
+            raise
+        with self._lock:
+            self._pending.add(future)
+        future.add_done_callback(self._release)
+
+        timeout = self.timeout if timeout is None else timeout
+        try:
+            # shield() keeps wait_for from cancelling the executor future, so
+            # the done callback above always sees how the work ended
+            _, result = await asyncio.wait_for(
+                asyncio.shield(asyncio.wrap_future(future)), timeout
+            )
+        except asyncio.TimeoutError:
+            with self._lock:
+                self._timed_out += 1
+            # Drop it if it never started; running work cannot be interrupted
+            future.cancel()
+            raise
+        return result
+
+    def stats(self) -> Dict[str, Any]:
+        """Snapshot of pool load, for health checks and sizing."""
+        with self._lock:
+            in_flight = self._in_flight
+            completed = self._completed
+            return {
+                "kind": self.kind,
+                "max_workers": self.max_workers,
+                "max_queue": self.max_queue,
+                "timeout": self.timeout,
+                "in_flight": in_flight,
+                "active_workers": min(in_flight, self.max_workers),
+                "queue_depth": max(0, in_flight - self.max_workers),
+                "completed": completed,
+                "failed": self._failed,
+                "rejected": self._rejected,
+                "timed_out": self._timed_out,
+                "wait_time": {
+                    "last": self._wait_last,
+                    "avg": self._wait_total / completed if completed else 0.0,
+                    "max": self._wait_max,
+                },
+            }
+
+    def shutdown(self, wait: bool = True) -> None:
+        """Drop queued calls that haven't started, then stop the executor.
+
+        Cancels the pending futures itself, as ``cancel_futures`` is
+        Python 3.9+.
+        """
+        with self._lock:
+            pending = list(self._pending)
+        for future in pending:
+            future.cancel()
+        self._executor.shutdown(wait=wait)
@@ -0,0 +1,14 @@
+"""
+Shared test fixtures
+"""
+
+import pytest
+
+
+@pytest.fixture
+def spawn(monkeypatch):
+    """Make nlp.pipe(n_process>1) start its workers with spawn, as on macOS and Windows."""
+    import multiprocessing
+    import spacy.language
+    
+    monkeypatch.setattr(spacy.language, "mp", multiprocessing.get_context("spawn"))
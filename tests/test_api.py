@@ -0,0 +1,201 @@
+"""
+Tests for the FastAPI endpoints
+"""
+
+import json
+
+import pytest
+from fastapi.testclient import TestClient
+
+import api
+
+
+@pytest.fixture(scope="module")
+def client():
+    return TestClient(api.app)
+
+
+def test_batch_matches_single(client):
+    """Batched results equal single-text results, in input order."""
+    texts = ["I'm so happy and excited!", "ugh this is broken", "wow lol", "meh"] * 5
+    response = client.post("/analyze/batch", json={"texts": texts, "batch_size": 3})
+    assert response.status_code == 200
+    
+    body = response.json()
+    assert body["total_analyzed"] == len(texts)
+    for text, result in zip(texts, body["results"]):
+        assert result == client.post("/analyze", json={"text": text}).json()
+
+
+def test_batch_skips_empty_texts(client):
+    response = client.post("/analyze/batch", json={"texts": ["", "so sad", "   ", "yay"]})
+    body = response.json()
+    assert [r["text"] for r in body["results"]] == ["so sad", "yay"]
+    assert body["total_analyzed"] == 2
+
+
+def test_batch_rejects_bad_input(client):
+    assert client.post("/analyze/batch", json={"texts": []}).status_code == 400
+    assert client.post("/analyze/batch", json={"texts": ["x"], "batch_size": 0}).status_code == 422
+
+
+def test_repeated_texts_hit_the_cache(client):
+    if api.cache is None:
+        pytest.skip("result cache disabled")
+    text = "templated alert: disk almost full lol"
+    before = client.get("/cache").json()["hits"]
+    first = client.post("/analyze", json={"text": text}).json()
+    # Without dedup every copy is looked up in the cache
+    second = client.post("/analyze/batch", json={"texts": [text, text], "dedup": "off"}).json()
+    assert second["results"] == [first, first]
+    assert client.get("/cache").json()["hits"] == before + 2
+
+
+def test_sqlite_cache_lookups_run_off_the_event_loop(client, monkeypatch, tmp_path):
+    """Test that /analyze and /analyze/batch query a SQLite-backed cache from a thread."""
+    import asyncio
+
+    from mood_detector.cache import ResultCache, SQLiteStore
+
+    store = SQLiteStore(str(tmp_path / "cache.sqlite"))
+    on_loop = []
+
+    def get(key, ttl=None):
+        try:
+            on_loop.append(asyncio.get_running_loop() is not None)
+        except RuntimeError:
+            on_loop.append(False)
+        return None
+
+    monkeypatch.setattr(store, "get", get)
+    monkeypatch.setattr(api, "cache", ResultCache(store=store))
+    assert client.post("/analyze", json={"text": "so happy lol"}).status_code == 200
+    assert client.post("/analyze/batch", json={"texts": ["ugh", "meh"]}).status_code == 200
+    assert on_loop == [False, False, False]
+
+
+def test_batch_analyzes_duplicates_once(client):
+    texts = ["ugh so broken", "yay love it", "ugh so broken", "  ugh so   broken ", "ugh so broken"]
+    single = [client.post("/analyze", json={"text": text}).json() for text in texts]
+
+    exact = client.post("/analyze/batch", json={"texts": texts}).json()
+    assert exact["results"] == single
+    assert (exact["total_analyzed"], exact["unique_analyzed"], exact["dedup_ratio"]) == (5, 3, 0.4)
+
+    normalized = client.post("/analyze/batch", json={"texts": texts, "dedup": "normalized"}).json()
+    assert [r["text"] for r in normalized["results"]] == texts
+    assert normalized["results"][3] == dict(single[0], text=texts[3])
+    assert (normalized["unique_analyzed"], normalized["dedup_ratio"]) == (2, 0.6)
+
+    # Case is not normalized away: shouting changes the vibe score and the span texts
+    shouted = ["Happy day", "HAPPY DAY"]
+    normalized = client.post("/analyze/batch", json={"texts": shouted, "dedup": "normalized"}).json()
+    assert normalized["results"] == [client.post("/analyze", json={"text": text}).json() for text in shouted]
+
+    off = client.post("/analyze/batch", json={"texts": texts, "dedup": "off"}).json()
+    assert (off["unique_analyzed"], off["dedup_ratio"]) == (5, 0.0)
+    assert client.post("/analyze/batch", json={"texts": texts, "dedup": "fuzzy"}).status_code == 422
+
+    body = client.get("/metrics").text
+    assert "mood_dedup_texts_total" in body
+    assert "mood_dedup_ratio" in body
+
+
+def test_stream_returns_one_line_per_text_in_order(client):
+    texts = [f"message {i}: so happy lol" if i % 3 else f"ugh {i} broken" for i in range(25)]
+    body = "\n".join(json.dumps(text if i % 2 else {"text": text}) for i, text in enumerate(texts))
+    response = client.post("/analyze/stream", params={"chunk_size": 4}, content=body)
+    assert response.status_code == 200
+    assert response.headers["content-type"] == "application/x-ndjson"
+    
+    lines = [json.loads(line) for line in response.text.splitlines()]
+    assert [line["text"] for line in lines] == texts
+    assert lines[0] == client.post("/analyze", json={"text": texts[0]}).json()
+
+
+def test_stream_reports_bad_lines_in_place(client):
+    body = '"so sad"\nnot json\n""\n{"id": 3}\n"yay"\n'
+    lines = [json.loads(line) for line in client.post("/analyze/stream", content=body).text.splitlines()]
+    assert lines[0]["text"] == "so sad"
+    assert lines[1]["line"] == 2 and "error" in lines[1]
+    assert lines[2]["line"] == 4 and "error" in lines[2]
+    assert lines[3]["text"] == "yay"
+
+
+def test_metrics_endpoint(client):
+    client.post("/analyze", json={"text": "so happy lol"})
+    client.post("/analyze", json={"text": ""})
+    body = client.get("/metrics").text
+    assert 'mood_requests_total{path="/analyze",method="POST",status="200"}' in body
+    assert 'mood_errors_total{path="/analyze",status="400"}' in body
+    assert "mood_doc_length_chars_count" in body
+    assert "# TYPE mood_stage_seconds histogram" in body
+
+
+def test_fields_select_what_is_computed(client):
+    text = "fields test: so happy and excited lol"
+    response = client.post("/analyze", json={"text": text, "fields": ["mood"]})
+    assert response.json().keys() == {"text", "mood"}
+    
+    full = client.post("/analyze", json={"text": text}).json()
+    assert full["mood"] == response.json()["mood"]
+    
+    batch = client.post("/analyze/batch", json={"texts": [text], "fields": ["vibe_score"]}).json()
+    assert batch["results"] == [{"text": text, "vibe_score": full["vibe_score"]}]
+    
+    stream = client.post("/analyze/stream?fields=emotional_spans", content=json.dumps(text))
+    assert json.loads(stream.text) == {"text": text, "emotional_spans": full["emotional_spans"]}
+    
+    assert client.post("/analyze", json={"text": text, "fields": ["nope"]}).status_code == 422
+
+
+def test_long_document_timeline(client):
+    text = "I am so happy today! " * 50 + "ugh this is broken and I'm so tired. " * 50
+    response = client.post("/analyze/long", json={"text": text, "chunk_chars": 500})
+    assert response.status_code == 200
+    body = response.json()
+    assert body["length"] == len(text) and body["chunks"][0]["start"] == 0
+    assert body["chunks"][-1]["end"] == len(text)
+    assert body["chunks"][0]["vibe_score"] > body["chunks"][-1]["vibe_score"]
+    assert client.post("/analyze/long", json={"text": "  "}).status_code == 400
+    assert client.post("/analyze/long", json={"text": text, "chunk_chars": 10}).status_code == 422
+
+
+def test_websocket_results_in_order(client, monkeypatch):
+    # A tiny window: the server must stop reading rather than drop or reorder
+    monkeypatch.setattr(api, "WS_MAX_PENDING", 2)
+    texts = ["so happy lol", "ugh this is broken", "wow", "I'M SO ANGRY!!!"] * 10
+    with client.websocket_connect("/ws/analyze") as websocket:
+        for i, text in enumerate(texts):
+            websocket.send_text(json.dumps({"text": text, "id": i}))
+        websocket.send_text("not json")
+        websocket.send_text(json.dumps({"text": " ", "id": "blank"}))
+        websocket.send_text(json.dumps("yay"))
+        results = [websocket.receive_json() for _ in range(len(texts) + 3)]
+    
+    assert [result["id"] for result in results[:len(texts)]] == list(range(len(texts)))
+    assert results[1] == dict(client.post("/analyze", json={"text": texts[1]}).json(), id=1)
+    assert "error" in results[-3] and results[-2] == {"error": "Text cannot be empty", "id": "blank"}
+    assert results[-1]["text"] == "yay" and "id" not in results[-1]
+    
+    with client.websocket_connect("/ws/analyze?fields=mood") as websocket:
+        websocket.send_text(json.dumps("so sad"))
+        assert websocket.receive_json() == {"text": "so sad", "mood": "sad"}
+
+
+def test_accept_headers_choose_the_encoding(client):
+    srsly = pytest.importorskip("srsly")
+    body = {"texts": ["so happy lol", "ugh this is broken"] * 50}
+    expected = client.post("/analyze/batch", json=body, headers={"Accept-Encoding": "identity"})
+    assert "content-encoding" not in expected.headers
+    
+    gzipped = client.post("/analyze/batch", json=body, headers={"Accept-Encoding": "gzip"})
+    assert gzipped.headers["content-encoding"] == "gzip"
+    assert gzipped.json() == expected.json()
+    
+    packed = client.post("/analyze/batch", json=body, headers={"Accept": "application/msgpack"})
+    assert packed.headers["content-type"] == "application/msgpack"
+    assert srsly.msgpack_loads(packed.content) == expected.json()
+    
+    small = client.post("/analyze", json={"text": "yay"}, headers={"Accept-Encoding": "gzip"})
+    assert "content-encoding" not in small.headers
@@ -0,0 +1,28 @@
+"""
+Tests for the multi-phrase automaton
+"""
+
+import random
+
+from mood_detector.automaton import PhraseAutomaton
+
+
+def test_first_occurrences_match_str_find():
+    """Test that every phrase is found at the same index as str.find."""
+    rng = random.Random(0)
+    for _ in range(500):
+        phrases = ["".join(rng.choice("ab ") for _ in range(rng.randint(1, 4))) for _ in range(6)]
+        text = "".join(rng.choice("ab ") for _ in range(rng.randint(0, 30)))
+        
+        expected = {p: text.find(p) for p in phrases if p in text}
+        assert PhraseAutomaton(phrases).first_occurrences(text) == expected
+
+
+def test_overlapping_and_nested_phrases():
+    """Test phrases that overlap or contain each other."""
+    automaton = PhraseAutomaton(["so", "also", "lol", "lo", "no way"])
+    
+    assert automaton.first_occurrences("also lol, no way") == {
+        "also": 0, "so": 2, "lo": 5, "lol": 5, "no way": 10,
+    }
+    assert automaton.first_occurrences("nothing here") == {}
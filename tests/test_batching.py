@@ -0,0 +1,53 @@
+"""
+Tests for the micro-batcher
+"""
+
+import asyncio
+
+from mood_detector.batching import MicroBatcher
+
+
+def run_concurrently(batcher, items):
+    async def main():
+        return await asyncio.gather(*(batcher.submit(item) for item in items))
+
+    return asyncio.run(main())
+
+
+def test_groups_concurrent_items_and_keeps_results_per_caller():
+    seen = []
+
+    async def process(items):
+        seen.append(list(items))
+        return [item * 10 for item in items]
+
+    batcher = MicroBatcher(process, max_batch_size=4, max_wait=0.01, adaptive=False)
+    assert run_concurrently(batcher, range(10)) == [n * 10 for n in range(10)]
+    assert seen == [[0, 1, 2, 3], [4, 5, 6, 7], [8, 9]]
+    assert batcher.stats()["largest_batch"] == 4
+
+
+def test_adaptive_dispatches_first_item_immediately():
+    seen = []
+
+    async def process(items):
+        seen.append(list(items))
+        await asyncio.sleep(0.01)
+        return items
+
+    batcher = MicroBatcher(process, max_batch_size=8, max_wait=0.005)
+    assert run_concurrently(batcher, "abcde") == list("abcde")
+    assert seen == [["a"], ["b", "c", "d", "e"]]
+
+
+def test_errors_reach_every_caller_in_the_batch():
+    async def process(items):
+        raise RuntimeError("boom")
+
+    batcher = MicroBatcher(process, max_batch_size=2, adaptive=False)
+
+    async def main():
+        return await asyncio.gather(*(batcher.submit(n) for n in range(2)), return_exceptions=True)
+
+    assert [str(r) for r in asyncio.run(main())] == ["boom", "boom"]
+    assert batcher.stats()["running_batches"] == 0
@@ -0,0 +1,98 @@
+"""
+Tests for the result cache
+"""
+
+import time
+
+from mood_detector import MoodEngine
+from mood_detector.cache import ResultCache, SQLiteStore, cache_key, cache_from_env
+
+engine = MoodEngine()
+
+
+def test_key_depends_on_text_and_version():
+    assert cache_key("Café") == cache_key("Café")
+    assert cache_key("Café") != cache_key("Café")
+    assert cache_key("lol") != cache_key("LOL")
+    assert cache_key("lol", "v1") != cache_key("lol", "v2")
+
+
+def test_hits_misses_and_copies():
+    cache = ResultCache()
+    assert cache.get("so happy") is None
+    cache.put("so happy", engine.analyze("so happy"))
+    
+    result = cache.get("so happy")
+    assert result == engine.analyze("so happy")
+    del result["emotional_spans"]
+    assert "emotional_spans" in cache.get("so happy")
+    
+    stats = cache.stats()
+    assert (stats["hits"], stats["misses"], stats["entries"]) == (2, 1, 1)
+
+
+
+def test_hit_returns_the_callers_own_text():
+    nfc, nfd = "Caf\u00e9 so happy", "Cafe\u0301 so happy"
+    cache = ResultCache()
+    cache.put(nfc, engine.analyze(nfc))
+    
+    assert cache.get(nfd) is None
+    cache.put(nfd, engine.analyze(nfd))
+    assert cache.get(nfd) == engine.analyze(nfd)
+    assert cache.get(nfd)["text"] == nfd
+    assert cache.get(nfc)["text"] == nfc
+
+def test_map_computes_only_misses_in_order():
+    cache = ResultCache()
+    cache.put("b", engine.analyze("b"))
+    calls = []
+    
+    def compute_many(texts):
+        calls.append(texts)
+        return [engine.analyze(text) for text in texts]
+    
+    results = cache.map(["a", "b", "c"], compute_many)
+    assert [r["text"] for r in results] == ["a", "b", "c"]
+    assert calls == [["a", "c"]]
+
+
+def test_lru_and_memory_budget_eviction():
+    cache = ResultCache(max_entries=2)
+    for text in ("one", "two"):
+        cache.put(text, engine.analyze(text))
+    cache.get("one")
+    cache.put("three", engine.analyze("three"))
+    assert cache.get("two") is None
+    assert cache.get("one") is not None
+    assert cache.stats()["evictions"] == 1
+    
+    small = ResultCache(max_bytes=2000)
+    for i in range(20):
+        small.put(f"text {i}", engine.analyze(f"text {i}"))
+    assert 0 < len(small) < 20
+    assert small.stats()["bytes"] <= 2000
+
+
+def test_ttl_expiry():
+    cache = ResultCache(ttl=0.01)
+    cache.put("meh", engine.analyze("meh"))
+    time.sleep(0.02)
+    assert cache.get("meh") is None
+    assert cache.stats()["expirations"] == 1
+
+
+def test_sqlite_store_survives_restart(tmp_path):
+    path = str(tmp_path / "cache.sqlite")
+    text = "I love this so much!! lol"
+    ResultCache(store=SQLiteStore(path)).put(text, engine.analyze(text))
+    
+    cache = ResultCache(store=SQLiteStore(path))
+    assert cache.get(text) == engine.analyze(text)
+    assert cache.stats()["store_hits"] == 1
+
+
+def test_cache_from_env():
+    assert cache_from_env({"MOOD_CACHE_SIZE": "0"}) is None
+    cache = cache_from_env({"MOOD_CACHE_SIZE": "5", "MOOD_CACHE_TTL": "60"})
+    assert (cache.max_entries, cache.ttl) == (5, 60.0)
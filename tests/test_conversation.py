@@ -0,0 +1,44 @@
+"""
+Tests for incremental conversation analysis
+"""
+
+import random
+from pathlib import Path
+
+import pytest
+
+from mood_detector import ConversationMood, MoodEngine, load_pipeline
+from mood_detector.pipeline import doc_to_result
+
+MESSAGES = (Path(__file__).resolve().parent.parent / "examples" / "sample_texts.txt").read_text().splitlines()
+MESSAGES += ["", "HI!!", "lol", "so", "happy", "WTF??", "ugh 😭", "<3"]
+
+
+@pytest.mark.parametrize("window", [None, 1, 4])
+def test_matches_full_reanalysis(window):
+    rng = random.Random(window)
+    nlp, engine = load_pipeline("lite"), MoodEngine()
+    spacy_conversation = ConversationMood(nlp, window=window)
+    fast_conversation = ConversationMood(engine, window=window)
+    messages = []
+    for _ in range(60):
+        messages.append(rng.choice(MESSAGES))
+        result = spacy_conversation.append(messages[-1])
+        assert fast_conversation.append(messages[-1]) == result
+        
+        recent = messages if window is None else messages[-window:]
+        full = doc_to_result(nlp("\n".join(recent)))
+        assert (result["mood"], result["vibe_score"]) == (full["mood"], full["vibe_score"])
+        assert result["messages"] == len(spacy_conversation) == len(recent)
+
+
+def test_window_evicts_old_messages():
+    conversation = ConversationMood(MoodEngine(), window=2)
+    assert conversation.result() == {"messages": 0, "mood": "neutral", "vibe_score": 0, "label_counts": {}}
+    conversation.append("I'm so happy!")
+    conversation.append("lol")
+    assert "HAPPY" in conversation.result()["label_counts"]
+    result = conversation.append("ugh so tired")
+    assert "HAPPY" not in result["label_counts"] and result["messages"] == 2
+    with pytest.raises(ValueError):
+        ConversationMood(MoodEngine(), window=0)
@@ -0,0 +1,94 @@
+"""
+Tests for the warm analysis daemon and the CLI's light startup
+"""
+
+import os
+import stat
+import subprocess
+import sys
+import threading
+from pathlib import Path
+
+import pytest
+
+from mood_detector import MoodEngine, load_pipeline
+from mood_detector.daemon import MoodDaemon, remote_analyze, request
+from mood_detector.pipeline import doc_to_result
+
+
+@pytest.fixture
+def daemon(tmp_path):
+    """A daemon serving on a temporary socket in a background thread."""
+    daemon = MoodDaemon(str(tmp_path / "mood.sock"))
+    daemon.bind()
+    thread = threading.Thread(target=daemon.serve_forever, daemon=True)
+    thread.start()
+    yield daemon
+    request({"op": "shutdown"}, daemon.socket_path)
+    thread.join(5)
+
+
+def test_daemon_results_match_in_process(daemon):
+    text = "I'M SO ANGRY!!! ugh wtf bro, also tired 😭"
+    path = daemon.socket_path
+
+    result = remote_analyze(text, "spacy", "lite", path)
+    expected = doc_to_result(load_pipeline("lite")(text))
+    expected["emotional_spans"] = [list(span) for span in expected["emotional_spans"]]
+    assert result == expected
+
+    fast = remote_analyze(text, "fast", socket_path=path)
+    assert fast == {**MoodEngine().analyze(text), "emotional_spans": result["emotional_spans"]}
+
+
+def test_concurrent_requests_share_the_pipeline(daemon):
+    """Test that connections analyzed at the same time get the same results as one at a time."""
+    from concurrent.futures import ThreadPoolExecutor
+
+    texts = [f"ugh so tired {i} lol" if i % 2 else f"SO HAPPY and excited {i}!!" for i in range(64)]
+    nlp = load_pipeline("lite")
+    expected = [doc_to_result(nlp(text))["vibe_score"] for text in texts]
+
+    with ThreadPoolExecutor(8) as pool:
+        results = list(pool.map(lambda text: remote_analyze(text, socket_path=daemon.socket_path), texts))
+    assert [result["vibe_score"] for result in results] == expected
+    assert [result["text"] for result in results] == texts
+
+
+def test_socket_is_private_to_the_owner(daemon):
+    assert stat.S_IMODE(os.stat(daemon.socket_path).st_mode) == 0o600
+
+
+def test_bad_requests_get_errors(daemon):
+    path = daemon.socket_path
+    assert "error" in request({"text": 42}, path)
+    assert "error" in request({"text": "hi", "engine": "nope"}, path)
+    assert "error" in request({"op": "reload"}, path)
+    assert request({"op": "ping"}, path)["ok"]
+    assert remote_analyze("hi", engine="nope", socket_path=path) is None
+
+
+def test_no_daemon_falls_back(tmp_path):
+    stale = tmp_path / "stale.sock"
+    assert remote_analyze("so happy", socket_path=str(tmp_path / "missing.sock")) is None
+    stale.touch()
+    assert remote_analyze("so happy", socket_path=str(stale)) is None
+
+    # A new daemon replaces the stale socket, and stops cleanly
+    daemon = MoodDaemon(str(stale))
+    daemon.bind()
+    thread = threading.Thread(target=daemon.serve_forever, daemon=True)
+    thread.start()
+    with pytest.raises(RuntimeError):
+        MoodDaemon(str(stale)).bind()
+    assert request({"op": "shutdown"}, str(stale)) == {"ok": True}
+    thread.join(5)
+    assert not thread.is_alive()
+    assert not stale.exists()
+
+
+def test_cli_help_does_not_import_spacy():
+    code = "import sys, detective; print(sorted(m for m in ('spacy', 'mood_detector.engine') if m in sys.modules))"
+    root = Path(__file__).resolve().parent.parent
+    output = subprocess.run([sys.executable, "-c", code], capture_output=True, text=True, check=True, cwd=root)
+    assert output.stdout.strip() == "[]"
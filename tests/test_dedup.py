@@ -0,0 +1,57 @@
+"""
+Tests for in-batch deduplication
+"""
+
+import pytest
+
+from mood_detector.dedup import DedupCounter, Deduplicated, dedup_key
+
+TEXTS = ["so happy", "ugh", "so happy", "  so\thappy ", "ugh", "SO HAPPY", "so  happy"]
+
+
+def test_dedup_key():
+    assert dedup_key("  so\thappy\n lol ") == "so happy lol"
+    # Case changes the vibe score (shouting), so it is kept
+    assert dedup_key("SO HAPPY") == "SO HAPPY"
+
+
+@pytest.mark.parametrize("mode, unique", [
+    ("off", TEXTS),
+    ("exact", ["so happy", "ugh", "  so\thappy ", "SO HAPPY", "so  happy"]),
+    ("normalized", ["so happy", "ugh", "SO HAPPY"]),
+])
+def test_modes(mode, unique):
+    batch = Deduplicated(TEXTS, mode)
+    assert batch.unique == unique
+    assert batch.expand(batch.unique) == [batch.unique[i] for i in batch.index]
+    assert batch.duplicates == len(TEXTS) - len(unique)
+    assert batch.ratio == pytest.approx(batch.duplicates / len(TEXTS))
+
+
+def test_expand_dicts_fans_out_in_order():
+    batch = Deduplicated(TEXTS, "normalized")
+    # The normalized texts are what gets analyzed
+    results = [{"text": text, "mood": text} for text in batch.unique]
+    expanded = batch.expand_dicts(results)
+    
+    assert [result["text"] for result in expanded] == TEXTS
+    assert [result["mood"] for result in expanded] == ["so happy", "ugh", "so happy", "so happy", "ugh", "SO HAPPY", "so happy"]
+    # The first occurrence keeps its dict; every repeat is its own copy
+    assert expanded[0] is results[0]
+    assert len({id(result) for result in expanded}) == len(TEXTS)
+
+
+def test_empty_batch_and_unknown_mode():
+    batch = Deduplicated([])
+    assert (batch.unique, batch.ratio, batch.expand_dicts([])) == ([], 0.0, [])
+    with pytest.raises(ValueError):
+        Deduplicated(TEXTS, "fuzzy")
+
+
+def test_counter_accumulates():
+    counter = DedupCounter()
+    assert counter.ratio == 0.0
+    counter.add(Deduplicated(["a", "a", "b"]))
+    counter.add(Deduplicated(["c"]))
+    assert (counter.texts, counter.unique) == (4, 3)
+    assert counter.ratio == 0.25
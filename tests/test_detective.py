@@ -0,0 +1,70 @@
+"""
+Tests for the CLI batch mode
+"""
+
+import io
+
+import pytest
+
+from detective import analyze_parallel, analyze_stream, read_texts
+from mood_detector import MoodEngine, load_pipeline
+from mood_detector.dedup import DedupCounter
+
+
+def test_read_lines_skips_blanks():
+    stream = io.StringIO("so happy\n\n   \nugh broken\r\nlast line")
+    assert list(read_texts(stream)) == ["so happy", "ugh broken", "last line"]
+
+
+def test_read_jsonl_with_custom_field(capsys):
+    stream = io.StringIO('{"msg": "yay!"}\n{"other": 1}\nnot json\n"plain string"\n{"msg": "so sad"}\n')
+    assert list(read_texts(stream, "jsonl", "msg")) == ["yay!", "plain string", "so sad"]
+    err = capsys.readouterr().err
+    assert "line 2: no 'msg' text" in err
+    assert "line 3: invalid JSON" in err
+
+
+def test_read_csv_column():
+    stream = io.StringIO('id,body\n1,"hello, world lol"\n2,"multi\nline sad"\n')
+    assert list(read_texts(stream, "csv", "body")) == ["hello, world lol", "multi\nline sad"]
+    with pytest.raises(ValueError):
+        list(read_texts(io.StringIO("id,body\n1,x\n"), "csv", "text"))
+
+
+def test_analyze_stream_is_lazy_and_matches_engine():
+    texts = ["so happy lol", "ugh this is broken", "wow"] * 10
+    expected = [MoodEngine().analyze(text) for text in texts]
+    
+    results = analyze_stream(iter(texts), load_pipeline("lite"), batch_size=4)
+    assert next(results) == expected[0]
+    assert [expected[0]] + list(results) == expected
+    
+    assert list(analyze_stream(texts, MoodEngine(), batch_size=4)) == expected
+
+
+def test_duplicates_are_analyzed_once_per_chunk():
+    texts = ["so happy lol", "ugh broken", "so  happy lol", "so happy lol"] * 4
+    expected = [MoodEngine().analyze(text) for text in texts]
+    counter = DedupCounter()
+    
+    assert list(analyze_stream(texts, MoodEngine(), batch_size=8, dedup_counter=counter)) == expected
+    assert (counter.texts, counter.unique) == (16, 6)
+    
+    stats = {}
+    results = list(analyze_parallel(texts, 2, engine="fast", batch_size=8, stats=stats, dedup="normalized"))
+    assert [index for index, _ in results] == list(range(len(texts)))
+    assert [result["text"] for _, result in results] == texts
+    assert results[2][1] == dict(expected[0], text=texts[2])
+    assert sum(docs for docs, _ in stats.values()) == 4
+
+def test_parallel_keeps_order_and_collects_stats():
+    texts = [f"message {i}: so happy lol" if i % 2 else f"ugh {i} broken" for i in range(50)]
+    expected = [MoodEngine().analyze(text) for text in texts]
+    stats = {}
+    
+    results = list(analyze_parallel(texts, 2, engine="fast", batch_size=8, stats=stats))
+    assert results == list(enumerate(expected))
+    assert sum(docs for docs, _ in stats.values()) == len(texts)
+    
+    unordered = analyze_parallel(texts, 2, engine="fast", batch_size=8, ordered=False)
+    assert sorted(unordered, key=lambda pair: pair[0]) == list(enumerate(expected))
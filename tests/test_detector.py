@@ -3,17 +3,13 @@ Tests for the Mood Detective
 """
 
 import pytest
-import spacy
-from mood_detector import create_mood_detector
+from mood_detector import load_pipeline
 
 
-@pytest.fixture
-def nlp():
-    """Load spaCy model with mood detector."""
-    nlp = spacy.load("en_core_web_sm")
-    if "mood_detector" not in nlp.pipe_names:
-        nlp.add_pipe("mood_detector", last=True)
-    return nlp
+@pytest.fixture(params=["full", "lite"])
+def nlp(request):
+    """Load spaCy pipeline with mood detector in each mode."""
+    return load_pipeline(request.param)
 
 
 def test_happy_text(nlp):
@@ -78,3 +74,186 @@ def test_emotional_triggers_format(nlp):
         assert isinstance(trigger["text"], str)
         assert isinstance(trigger["type"], str)
 
+
+
+def test_lite_mode_matches_full():
+    """Test that the tokenizer-only pipeline gives the same results as the full model."""
+    full = load_pipeline("full")
+    lite = load_pipeline("lite")
+    texts = [
+        "I told him to deploy the backend yesterday but he said 'lol okay' and disappeared.",
+        "Thank god, a sigh of relief! This is fine.",
+        "WTF is happening? Seriously, this is confusing.",
+    ]
+
+    for text in texts:
+        full_doc, lite_doc = full(text), lite(text)
+        assert full_doc._.mood == lite_doc._.mood
+        assert full_doc._.vibe_score == lite_doc._.vibe_score
+        assert full_doc._.emotional_triggers == lite_doc._.emotional_triggers
+
+
+def test_attributes_are_computed_lazily():
+    """Test that reading one attribute doesn't compute the others, and values are memoized."""
+    from mood_detector.metrics import STAGE_TIMINGS
+    
+    nlp = load_pipeline("lite")
+    doc = nlp("I'm so happy and excited! lol")
+    assert ("mood_detector", "emotional_triggers") not in doc.user_data
+    
+    STAGE_TIMINGS.reset()
+    STAGE_TIMINGS.enable()
+    try:
+        assert doc._.mood is not None
+        assert doc._.mood is doc._.mood
+    finally:
+        STAGE_TIMINGS.enable(False)
+    stages = {row["stage"]: row["count"] for row in STAGE_TIMINGS.summary()}
+    STAGE_TIMINGS.reset()
+    
+    assert stages == {"detector.match": 1, "detector.mood": 1}
+    assert ("mood_detector", "emotional_triggers") not in doc.user_data
+
+
+def test_lazy_and_eager_agree():
+    """Test that lazy attributes equal eagerly computed ones and survive serialization."""
+    from spacy.tokens import Doc
+    
+    lazy, eager = load_pipeline("lite"), load_pipeline("lite", lazy=False)
+    text = "WTF is happening? Seriously, this is confusing 😭"
+    lazy_doc, eager_doc = lazy(text), eager(text)
+    restored = Doc(eager.vocab).from_bytes(eager_doc.to_bytes())
+    
+    for name in ("mood", "vibe_score", "emotional_triggers", "emotional_spans"):
+        assert getattr(lazy_doc._, name) == getattr(eager_doc._, name)
+        assert getattr(restored._, name) == getattr(eager_doc._, name)
+
+
+def test_attributes_can_be_overridden():
+    """Test that assigning an attribute replaces the computed value."""
+    nlp = load_pipeline("lite")
+    doc = nlp("I'm so sad.")
+    doc._.mood = "custom"
+    assert doc._.mood == "custom"
+    
+    assert nlp.make_doc("I'm so sad.")._.mood is None
+
+
+def test_pipeline_round_trips_through_disk(tmp_path):
+    """Test that a saved pipeline loads the compiled lexicon instead of recompiling."""
+    import spacy
+    from mood_detector.pipeline import doc_to_result
+    
+    nlp = load_pipeline("lite")
+    text = "I'm so happy and excited! but also tired lol <3"
+    nlp.to_disk(tmp_path)
+    assert (tmp_path / "mood_detector" / "lexicon.msgpack").exists()
+    
+    loaded = spacy.load(tmp_path)
+    assert doc_to_result(loaded(text)) == doc_to_result(nlp(text))
+    
+    blank = spacy.blank("en")
+    detector = blank.add_pipe("mood_detector")
+    assert "lexicon" not in vars(detector)
+    n_strings = len(blank.vocab.strings)
+    compiled = nlp.get_pipe("mood_detector")
+    detector.from_bytes(compiled.to_bytes())
+    # The saved lexeme IDs are reused rather than interned again
+    assert len(blank.vocab.strings) == n_strings
+    assert (detector.lexeme_index, detector.phrase_index) == (compiled.lexeme_index, compiled.phrase_index)
+    assert doc_to_result(blank(text)) == doc_to_result(nlp(text))
+
+
+def test_stale_lexicon_is_rejected(monkeypatch):
+    """Test that a lexicon saved from other pattern tables doesn't load."""
+    from mood_detector import compiled
+    
+    data = load_pipeline("lite").get_pipe("mood_detector").to_bytes()
+    monkeypatch.setattr(compiled, "pattern_set_version", lambda: "0" * 16)
+    with pytest.raises(ValueError, match="re-save"):
+        load_pipeline("lite").get_pipe("mood_detector").from_bytes(data)
+
+
+def test_lexicon_compiled_inside_memory_zone():
+    """Test that a lexicon first built inside nlp.memory_zone() survives the zone."""
+    from mood_detector.pipeline import doc_to_result, pipe_results
+    
+    nlp = load_pipeline("lite")
+    text = "I need sleep. I'm burned out."
+    expected = doc_to_result(load_pipeline("lite")(text))
+    # The first use compiles the lexicon inside pipe_results' memory zone
+    assert list(pipe_results(nlp, ["so happy"]))[0]["mood"] == "happy"
+    assert list(pipe_results(nlp, [text])) == [expected]
+
+
+
+def test_shared_memory_zone_closes_with_its_last_user():
+    """Test that threads share one memory zone, freed when the last leaves or after max_entries."""
+    from mood_detector.pipeline import SharedMemoryZone
+    
+    nlp = load_pipeline("lite")
+    strings = nlp.vocab.strings
+    zone = SharedMemoryZone(nlp)
+    with zone:
+        with zone():
+            strings.add("zqxjk")
+        assert "zqxjk" in strings
+    assert "zqxjk" not in strings
+    
+    zone.max_entries = 1
+    with zone:
+        assert zone._entries == 1
+    assert zone._entries == 0
+
+
+def test_concurrent_pipe_results_share_a_memory_zone():
+    """Test that threads piping through one pipeline don't free each other's strings."""
+    import random
+    import string
+    from concurrent.futures import ThreadPoolExecutor
+    from mood_detector.pipeline import SharedMemoryZone, pipe_results
+    
+    rng = random.Random(0)
+    words = ["sad", "happy", "lol", "ugh", "burned out", "so excited"]
+    texts = [
+        " ".join(rng.choice(words + ["".join(rng.choices(string.ascii_lowercase, k=6))]) for _ in range(8))
+        for _ in range(400)
+    ]
+    expected = list(pipe_results(load_pipeline("lite"), texts))
+    nlp = load_pipeline("lite")
+    zone = SharedMemoryZone(nlp, max_entries=4)
+    
+    def run(i):
+        return list(pipe_results(nlp, texts[i::8], batch_size=5, memory_zone=zone))
+    
+    with ThreadPoolExecutor(8) as pool:
+        results = list(pool.map(run, range(8)))
+    assert [results[i % 8][i // 8] for i in range(len(texts))] == expected
+
+
+def test_pipe_in_spawned_processes(spawn):
+    """Test that the pipeline pickles into spawned nlp.pipe workers."""
+    from mood_detector.pipeline import pipe_results
+    
+    nlp = load_pipeline("lite")
+    texts = ["ugh so sad", "I'm so happy and excited! lol", "nothing much"]
+    expected = list(pipe_results(nlp, texts))
+    assert list(pipe_results(nlp, texts, n_process=2)) == expected
+
+
+def test_worker_docs_are_not_matched_again(monkeypatch):
+    """Test that compact results of docs from nlp.pipe workers only read what the workers computed."""
+    from mood_detector import detector
+    from mood_detector.pipeline import pipe_results
+    
+    texts = [f"ticket {i}: ugh so sad, lol" if i % 2 else f"{i} I'm SO happy!! <3" for i in range(20)]
+    expected = list(pipe_results(load_pipeline("lite"), texts, compact=True))
+    nlp = load_pipeline("lite", lazy=False)
+    
+    calls = []
+    match, scan = detector.MoodDetector._match, detector.scan_text
+    monkeypatch.setattr(detector.MoodDetector, "_match", lambda *args: calls.append("match") or match(*args))
+    monkeypatch.setattr(detector, "scan_text", lambda *args: calls.append("scan") or scan(*args))
+    # Forked workers count in their own memory; only this process's calls land here
+    assert list(pipe_results(nlp, texts, n_process=2, compact=True)) == expected
+    assert calls == []
@@ -0,0 +1,36 @@
+"""
+Tests for API response encoding and content negotiation
+"""
+
+import json
+
+import pytest
+
+from mood_detector import MoodEngine, encoding
+from mood_detector.encoding import JSON, MSGPACK, negotiate
+
+
+@pytest.mark.parametrize("accept, expected", [
+    (None, JSON),
+    ("*/*", JSON),
+    ("text/html", JSON),
+    ("application/msgpack", MSGPACK),
+    ("application/x-msgpack, application/json;q=0.5", MSGPACK),
+    ("application/json, application/msgpack", JSON),
+    ("application/msgpack;q=0.2, */*;q=0.8", JSON),
+    ("application/msgpack;q=0", JSON),
+])
+def test_negotiate(accept, expected):
+    assert negotiate(accept) == expected
+
+
+def test_encoders_round_trip(monkeypatch):
+    srsly = pytest.importorskip("srsly")
+    content = {"results": [MoodEngine().analyze_result("I'm SO happy 😊 lol").to_json_dict()], "total_analyzed": 1}
+    expected = json.dumps(content, ensure_ascii=False, separators=(",", ":")).encode("utf-8")
+    
+    assert encoding.encode(content) == expected
+    assert srsly.msgpack_loads(encoding.encode(content, MSGPACK)) == content
+    # Without orjson the standard library writes the same bytes
+    monkeypatch.setattr(encoding, "orjson", None)
+    assert encoding.encode(content) == expected
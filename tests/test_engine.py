@@ -0,0 +1,120 @@
+"""
+Tests for the spaCy-free fast-path engine
+"""
+
+import random
+import subprocess
+import sys
+from pathlib import Path
+
+import pytest
+from mood_detector import MoodEngine, analyze, analyze_many, load_pipeline
+
+
+SAMPLES = Path(__file__).resolve().parent.parent / "examples" / "sample_texts.txt"
+
+TRICKY_TEXTS = [
+    "I can't even. DON'T care, LET'S go!",
+    "i'm freaking out... what's the meaning of life?",
+    "Thank god!! a sigh of relief\nat last",
+    "Are you kidding me?! x-love, love.hate, sad.I",
+    "Jones, I miss you ❤️ <3 😊",
+    "this is fine http://happy.example.com (so relieved) — \"defeated\"",
+]
+
+# Punctuation and whitespace that the engine's tokenizer splits like spaCy
+SEPARATORS = [
+    " ", ", ", ". ", "! ", "? ", "?! ", "!!! ", "... ", "; ", ": ", " - ", " — ", " (", ") ",
+    ' "', '" ', "'s ", " :) ", " <3 ", " ❤️ ", " 😊 ", "\n", "  ", " http://x.com/a ",
+]
+
+
+@pytest.fixture(scope="module")
+def nlp():
+    """Load the tokenizer-only spaCy pipeline to compare against."""
+    return load_pipeline("lite")
+
+
+def sample_texts():
+    return [line.strip() for line in SAMPLES.read_text().splitlines() if line.strip()]
+
+
+@pytest.mark.parametrize("text", sample_texts() + TRICKY_TEXTS)
+def test_matches_spacy_component(nlp, text):
+    """Test that the fast engine gives the same output as the spaCy component."""
+    doc = nlp(text)
+    result = analyze(text)
+    
+    assert result["mood"] == doc._.mood
+    assert result["vibe_score"] == doc._.vibe_score
+    assert result["emotional_triggers"] == doc._.emotional_triggers
+    assert result["emotional_spans"] == doc._.emotional_spans
+
+
+def test_matches_spacy_on_generated_text(nlp):
+    """Test parity on generated lexicon words separated by everyday punctuation."""
+    from mood_detector.patterns import EMOTIONAL_TRIGGERS, MOOD_PATTERNS
+    
+    words = []
+    for pattern in MOOD_PATTERNS:
+        for token in pattern["pattern"]:
+            value = token["LOWER"]
+            words += value["IN"] if isinstance(value, dict) else [value]
+    words += [word for phrases in EMOTIONAL_TRIGGERS.values() for word in phrases]
+    # Contractions, and "im" and "i" which spaCy splits or keeps in ways the tokenizer doesn't
+    words = [word for word in words if word.replace(" ", "").isalpha() and word not in ("im", "i")]
+    rng = random.Random(0)
+    engine = MoodEngine()
+    for _ in range(2000):
+        parts = []
+        for _ in range(rng.randint(1, 8)):
+            parts.append(rng.choice([str.lower, str.upper, str.title])(rng.choice(words)))
+            parts.append(rng.choice(SEPARATORS))
+        text = "".join(parts)
+        doc = nlp(text)
+        result = engine.analyze(text)
+        
+        assert (result["mood"], result["vibe_score"]) == (doc._.mood, doc._.vibe_score), text
+        assert result["emotional_spans"] == doc._.emotional_spans, text
+        assert result["emotional_triggers"] == doc._.emotional_triggers, text
+
+
+def test_glued_punctuation_differs_from_spacy(nlp):
+    """Test that words glued by punctuation match in the engine, where spaCy keeps one token."""
+    text = "defeated sad;happy"
+    
+    assert [span for span, _ in analyze(text)["emotional_spans"]] == ["defeated", "sad", "happy"]
+    assert [span for span, _ in nlp(text)._.emotional_spans] == ["defeated"]
+
+
+def test_analyze_many_is_lazy_and_ordered():
+    """Test that analyze_many yields one result per text, in order."""
+    texts = ["I'm so happy!", "", "I'm so sad."]
+    results = analyze_many(iter(texts))
+    
+    assert not isinstance(results, list)
+    assert [r["text"] for r in results] == texts
+
+
+def test_empty_text():
+    """Test that empty text is neutral."""
+    result = MoodEngine().analyze("")
+    
+    assert result["mood"] == "neutral"
+    assert result["vibe_score"] == 0
+    assert result["emotional_triggers"] == []
+
+
+def test_import_does_not_load_spacy():
+    """Test that the fast engine can be imported without spaCy."""
+    code = "import sys, mood_detector.engine; assert 'spacy' not in sys.modules"
+    subprocess.run([sys.executable, "-c", code], check=True, cwd=SAMPLES.parent.parent)
+
+
+def test_fields_limit_the_result():
+    """Test that analyze(fields=...) returns just those keys, with the full values."""
+    text = "I'm so happy and excited! lol"
+    full = MoodEngine().analyze(text)
+    partial = MoodEngine().analyze(text, fields=["vibe_score", "emotional_spans"])
+    
+    assert partial == {key: full[key] for key in ("text", "vibe_score", "emotional_spans")}
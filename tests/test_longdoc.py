@@ -0,0 +1,50 @@
+"""
+Tests for long-document (chunked) analysis
+"""
+
+import random
+from pathlib import Path
+
+import pytest
+
+from mood_detector import MoodEngine, load_pipeline
+from mood_detector.longdoc import analyze_long, iter_chunks
+from mood_detector.pipeline import doc_to_result
+
+SAMPLES = (Path(__file__).resolve().parent.parent / "examples" / "sample_texts.txt").read_text().splitlines()
+
+
+def test_chunks_cover_the_text_at_sentence_boundaries():
+    text = "I love this. So much! Really? " * 20 + "nospacesatallforalongwhile" * 5
+    chunks = list(iter_chunks(text, 50))
+    assert "".join(text[start:end] for start, end in chunks) == text
+    assert all(0 < end - start <= 50 for start, end in chunks)
+    # Cuts land after sentence-final punctuation when the window has one
+    assert all(text[end - 2] in ".!?" for _, end in chunks[:-4])
+    assert list(iter_chunks("", 50)) == []
+    with pytest.raises(ValueError):
+        list(iter_chunks(text, 0))
+
+
+def test_aggregate_matches_whole_text_analysis():
+    rng = random.Random(0)
+    text = " ".join(rng.choice(SAMPLES) for _ in range(40))
+    nlp = load_pipeline("lite")
+    whole = doc_to_result(nlp(text))
+    
+    result = analyze_long(text, nlp, max_chars=200, batch_size=3)
+    assert len(result["chunks"]) > 1
+    assert (result["mood"], result["vibe_score"]) == (whole["mood"], whole["vibe_score"])
+    assert result == analyze_long(text, MoodEngine(), max_chars=200)
+    
+    first = result["chunks"][0]
+    chunk = doc_to_result(nlp(text[first["start"]:first["end"]]))
+    assert (first["mood"], first["vibe_score"]) == (chunk["mood"], chunk["vibe_score"])
+
+
+def test_text_longer_than_spacy_max_length():
+    nlp = load_pipeline("lite")
+    nlp.max_length = 1000
+    result = analyze_long("ugh so tired of this. " * 200, nlp, max_chars=500)
+    assert result["length"] == 4400 and len(result["chunks"]) == 10
+    assert analyze_long("", nlp) == {"length": 0, "mood": "neutral", "vibe_score": 0, "label_counts": {}, "chunks": []}
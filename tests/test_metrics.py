@@ -0,0 +1,87 @@
+"""
+Tests for stage timings, histograms and Prometheus rendering
+"""
+
+import pickle
+
+from mood_detector import MoodEngine, load_pipeline
+from mood_detector.metrics import (
+    CounterVec,
+    Histogram,
+    HistogramVec,
+    StageTimings,
+    STAGE_TIMINGS,
+    render_counter,
+    render_histogram,
+)
+from mood_detector.pipeline import doc_to_result, instrument_pipeline, pipe_results
+
+
+def test_histogram_buckets_and_quantiles():
+    hist = Histogram((1, 5, 10))
+    for value in (0.5, 2, 3, 7, 20):
+        hist.observe(value)
+    hist.observe(4, n=5)
+    assert hist.count == 10
+    assert hist.cumulative()[-1][1] == 10
+    assert [count for _, count in hist.cumulative()] == [1, 8, 9, 10]
+    assert hist.quantile(0.5) == 5
+
+
+def test_prometheus_rendering():
+    counter = CounterVec(("path", "status"))
+    counter.inc("/analyze", "200")
+    counter.inc("/analyze", "200")
+    lines = render_counter("mood_requests_total", "Requests.", counter)
+    assert lines[1] == "# TYPE mood_requests_total counter"
+    assert lines[2] == 'mood_requests_total{path="/analyze",status="200"} 2'
+    
+    hists = HistogramVec(("stage",), (0.001, 0.01))
+    hists.labels('we"ird').observe(0.005)
+    lines = render_histogram("mood_stage_seconds", "Stages.", hists)
+    assert 'mood_stage_seconds_bucket{stage="we\\"ird",le="0.001"} 0' in lines
+    assert 'mood_stage_seconds_bucket{stage="we\\"ird",le="+Inf"} 1' in lines
+    assert 'mood_stage_seconds_count{stage="we\\"ird"} 1' in lines
+
+
+def test_timings_only_recorded_when_enabled():
+    timings = StageTimings()
+    assert timings.clock() is None
+    timings.enable()
+    timings.clock().lap("stage")
+    assert [row["stage"] for row in timings.summary()] == ["stage"]
+
+
+def test_instrumented_pipeline_records_stages_and_keeps_results():
+    texts = ["so happy lol", "ugh this is broken", "wow!!"]
+    plain = [doc_to_result(doc) for doc in load_pipeline("lite").pipe(texts)]
+    nlp = instrument_pipeline(load_pipeline("lite"))
+    
+    STAGE_TIMINGS.reset()
+    STAGE_TIMINGS.enable()
+    try:
+        timed = [doc_to_result(doc) for doc in nlp.pipe(texts)]
+        MoodEngine().analyze(texts[0])
+    finally:
+        STAGE_TIMINGS.enable(False)
+    
+    assert timed == plain
+    counts = {row["stage"]: row["count"] for row in STAGE_TIMINGS.summary()}
+    for stage in ("tokenizer", "mood_detector", "detector.match", "detector.triggers"):
+        assert counts[stage] == len(texts)
+    assert counts["engine.tokenize"] == 1
+    STAGE_TIMINGS.reset()
+
+
+def test_timings_and_instrumented_pipelines_pickle(spawn):
+    timings = StageTimings(enabled=True)
+    timings.record("stage", 0.002)
+    copy = pickle.loads(pickle.dumps(timings))
+    copy.record("stage", 0.003)
+    assert [row["count"] for row in copy.summary()] == [2]
+    assert [row["count"] for row in timings.summary()] == [1]
+    
+    # nlp.pipe pickles the pipeline into each spawned worker
+    texts = ["so happy lol", "ugh this is broken", "wow!!"]
+    expected = list(pipe_results(load_pipeline("lite"), texts))
+    assert list(pipe_results(instrument_pipeline(load_pipeline("lite")), texts, n_process=2)) == expected
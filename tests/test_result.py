@@ -0,0 +1,47 @@
+"""
+Tests for compact MoodResult objects
+"""
+
+from mood_detector import MoodEngine, load_pipeline
+from mood_detector.cache import ResultCache, SQLiteStore
+from mood_detector.result import MoodResult
+
+engine = MoodEngine()
+
+TEXTS = [
+    "I'm so happy and excited! This is amazing!",
+    "ugh wtf, I'm not happy at all... so tired lol",
+    "",
+]
+
+
+def test_serializes_to_the_plain_result():
+    """Test that MoodResult offsets serialize to exactly the dict analyze() returns."""
+    for text in TEXTS:
+        result = engine.analyze_result(text)
+        assert isinstance(result, MoodResult)
+        assert result.to_dict() == engine.analyze(text)
+        assert all(isinstance(offset, tuple) for offset in result.spans + result.triggers)
+
+
+def test_detector_and_engine_agree():
+    """Test that doc._.mood_result equals the fast engine's result."""
+    nlp = load_pipeline("lite")
+    for text in TEXTS:
+        doc = nlp(text)
+        assert doc._.mood_result() == engine.analyze_result(text)
+        assert doc._.mood_result(["mood"]).to_dict(["mood"]) == {"text": text, "mood": doc._.mood}
+    assert nlp.make_doc("meh")._.mood_result() is None
+
+
+def test_cache_keeps_compact_results(tmp_path):
+    """Test that the cache holds MoodResults as is and stores them as dicts."""
+    text = TEXTS[1]
+    cache = ResultCache(store=SQLiteStore(str(tmp_path / "cache.db")))
+    cache.put(text, engine.analyze_result(text))
+    
+    assert cache.get(text) == engine.analyze_result(text)
+    assert cache.stats()["bytes"] == engine.analyze_result(text).nbytes()
+    
+    cache.clear()
+    assert cache.get(text) == engine.analyze(text)
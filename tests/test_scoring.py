@@ -0,0 +1,123 @@
+"""
+Tests for label counting, table-driven combination moods and batch vibe scoring
+"""
+
+import pytest
+
+from mood_detector import MoodEngine, load_pipeline
+from mood_detector.lexicon import CompiledPatterns
+from mood_detector.pipeline import doc_to_result, pipe_results
+from mood_detector.scoring import MoodScorer
+
+TEXTS = [
+    "",
+    "meh",
+    "!!!???",
+    "I'm so happy and excited! This is amazing!!!",
+    "I'M SO ANGRY RIGHT NOW!!!",
+    "ugh, really really tired and sad... why?? lol",
+    "not happy at all, extremely frustrated tbh 😭",
+    "absolutely incredible, so so happy haha :) lol bro",
+    "what? huh?? I'm confused and worried and anxious",
+    "love love love love this, super happy!!!! yay",
+]
+
+
+def ids(patterns, *labels):
+    return [patterns.label_ids[label] for label in labels]
+
+
+def test_counts_shared_by_mood_and_vibe():
+    """Test that one count pass drives both mood and vibe score."""
+    patterns = CompiledPatterns()
+    scorer = MoodScorer(patterns)
+    counts = scorer.count(ids(patterns, "SAD", "SAD", "SAD", "SAD", "HOPE"))
+    
+    assert scorer.compute_mood(counts) == "sad"
+    features = MoodEngine().vibe_features("plain text")
+    # SAD is capped at 3x: -7 * 3 + 4
+    assert scorer.compute_vibe_score(counts, features) == -10
+    assert scorer.compute_vibe_score(scorer.count([]), features) == 0
+
+
+def test_combination_priority():
+    """Test that the most specific combination wins."""
+    patterns = CompiledPatterns()
+    scorer = MoodScorer(patterns)
+    
+    assert scorer.compute_mood(scorer.count(ids(patterns, "STRESSED", "TIRED"))) == "chaotic tired"
+    assert scorer.compute_mood(
+        scorer.count(ids(patterns, "ANXIETY", "STRESSED", "TIRED"))
+    ) == "overwhelming exhaustion"
+
+
+def test_custom_combination_rules():
+    """Test that combination moods are plain data."""
+    patterns = CompiledPatterns()
+    rules = [
+        {"labels": ["CASUAL", "WE_BALL"], "mood": "hype"},
+        {"labels": ["NOT_A_LABEL", "HAPPY"], "mood": "never"},
+    ]
+    scorer = MoodScorer(patterns, rules)
+    
+    assert scorer.compute_mood(scorer.count(ids(patterns, "WE_BALL", "CASUAL"))) == "hype"
+    assert scorer.compute_mood(scorer.count(ids(patterns, "HAPPY"))) == "happy"
+
+
+def test_ties_go_to_first_matched_label():
+    """Test that equal counts resolve to the label seen first."""
+    patterns = CompiledPatterns()
+    scorer = MoodScorer(patterns)
+    
+    assert scorer.compute_mood(scorer.count(ids(patterns, "HOPE", "CALM"))) == "hopeful"
+    assert scorer.compute_mood(scorer.count(ids(patterns, "CALM", "HOPE"))) == "calm"
+
+
+def test_batch_scores_match_per_doc_scores():
+    """Test that the vectorized batch scorer gives the per-doc scores."""
+    pytest.importorskip("numpy")
+    engine = MoodEngine()
+    scorer = engine.scorer
+    counts = [
+        scorer.count(label_id for *_, label_id in engine.patterns.match([t for t, _, _ in engine.tokenize(text)]))
+        for text in TEXTS
+    ]
+    features = [engine.vibe_features(text) for text in TEXTS]
+    
+    expected = [scorer.compute_vibe_score(c, f) for c, f in zip(counts, features)]
+    assert scorer.compute_vibe_scores(counts, features) == expected
+    assert scorer.compute_vibe_scores([], []) == []
+
+
+def test_pipe_paths_use_batch_scores():
+    """Test that pipe_results and eager nlp.pipe give the per-doc results."""
+    nlp = load_pipeline("lite")
+    expected = [doc_to_result(nlp(text)) for text in TEXTS]
+    
+    assert list(pipe_results(nlp, TEXTS, batch_size=4)) == expected
+    eager = load_pipeline("lite", lazy=False)
+    assert [doc_to_result(doc) for doc in eager.pipe(TEXTS, batch_size=4)] == expected
+
+
+def test_modifiers_match_whole_tokens():
+    """Test that modifier words only count as tokens, not inside other words."""
+    engine = MoodEngine()
+    
+    # (intensity, exclamations, questions, shouting, casual, emoji, amplified)
+    assert engine.vibe_features("also broken, lolly") == (0, 0, 0, 0, 0, 0, 0)
+    assert engine.vibe_features("so sad bro lol") == (1, 0, 0, 0, 2, 0, 0)
+    assert engine.vibe_features("absolutely ❤️ <3 HAPPY!!?") == (2, 2, 1, 0, 0, 2, 1)
+    assert engine.vibe_features("I'M SO ANGRY")[3] == 1
+
+
+def test_detector_features_match_engine():
+    """Test that the spaCy token-level features equal the fast engine's."""
+    nlp = load_pipeline("lite")
+    detector = nlp.get_pipe("mood_detector")
+    engine = MoodEngine()
+    texts = TEXTS + ["also broken", "luv u❤️ (<3)", "  SO\tTIRED  ", "HAHA  bro?!"]
+    
+    for text in texts:
+        doc = nlp.make_doc(text)
+        lowers, orths, spaces = doc.to_array(["LOWER", "ORTH", "SPACY"]).T.tolist()
+        assert detector._vibe_features(doc, lowers, orths, spaces) == engine.vibe_features(text), text
@@ -0,0 +1,44 @@
+"""
+Tests for the fast engine's regex tokenizer
+"""
+
+import pytest
+from mood_detector.tokenizer import tokenize
+
+
+@pytest.fixture(scope="module")
+def spacy_tokenizer():
+    import spacy
+
+    return spacy.blank("en").tokenizer
+
+
+@pytest.mark.parametrize("text", [
+    "I can't even. DON'T care, LET'S go!",
+    "Thank god!! a sigh of relief\nat last",
+    "Are you kidding me?! x-love, love.hate, sad.I",
+    "I'm so tired... what's the point? It's fine :) <3 ❤️ 😭🔥",
+    "she said \"we'll see\" (maybe) — see http://x.com/a?b, www.foo.org:80.",
+    " leading, and  trailing \n\t",
+    "",
+])
+def test_matches_spacy_on_prose(spacy_tokenizer, text):
+    """Test tokens and offsets on ordinary prose, emoticons, emoji and URLs."""
+    assert tokenize(text) == [(token.text, token.idx) for token in spacy_tokenizer(text)]
+
+
+@pytest.mark.parametrize("text,expected", [
+    ("sad;happy", ["sad", ";", "happy"]),
+    ("--overwhelmed @sad", ["--", "overwhelmed", "@", "sad"]),
+    ("e.g. I.", ["e.g", ".", "I", "."]),
+    ("im dont gonna c'mon y'all", ["im", "dont", "gonna", "c'mon", "y'all"]),
+    ("(-_-)", ["(", "-", "_", "-", ")"]),
+])
+def test_documented_differences(text, expected):
+    """Test the cases where the tokens knowingly differ from spaCy's."""
+    assert [word for word, _ in tokenize(text)] == expected
+
+
+def test_whitespace_like_spacy():
+    """Test that one space after a token is its trailing whitespace and other runs are tokens."""
+    assert tokenize("a b  c\n d ") == [("a", 0), ("b", 2), (" ", 4), ("c", 5), ("\n ", 6), ("d", 8)]
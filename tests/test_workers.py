@@ -0,0 +1,110 @@
+"""
+Tests for the bounded worker pool
+"""
+
+import asyncio
+import os
+import threading
+import time
+
+import pytest
+
+from mood_detector.workers import WorkerPool, PoolSaturated
+
+
+def test_runs_calls_and_records_stats():
+    pool = WorkerPool(max_workers=2, max_queue=2)
+
+    async def main():
+        return await asyncio.gather(*(pool.run(pow, n, 2) for n in range(4)))
+
+    assert asyncio.run(main()) == [0, 1, 4, 9]
+    stats = pool.stats()
+    assert stats["completed"] == 4
+    assert stats["in_flight"] == stats["queue_depth"] == stats["active_workers"] == 0
+    assert stats["wait_time"]["max"] >= stats["wait_time"]["avg"] >= 0
+    pool.shutdown()
+
+
+def test_rejects_when_saturated():
+    pool = WorkerPool(max_workers=1, max_queue=1)
+    gate = threading.Event()
+
+    async def main():
+        running = [asyncio.ensure_future(pool.run(gate.wait)) for _ in range(2)]
+        await asyncio.sleep(0.05)
+        stats = pool.stats()
+        assert (stats["active_workers"], stats["queue_depth"]) == (1, 1)
+        with pytest.raises(PoolSaturated):
+            await pool.run(gate.wait)
+        gate.set()
+        await asyncio.gather(*running)
+
+    asyncio.run(main())
+    assert pool.stats()["rejected"] == 1
+    pool.shutdown()
+
+
+def test_timeout_keeps_slot_until_work_finishes():
+    pool = WorkerPool(max_workers=1, max_queue=0, timeout=0.05)
+
+    async def main():
+        with pytest.raises(asyncio.TimeoutError):
+            await pool.run(time.sleep, 0.3)
+        # The sleep is still running, so there is no room for more work
+        with pytest.raises(PoolSaturated):
+            await pool.run(time.sleep, 0)
+        await asyncio.sleep(0.4)
+        assert await pool.run(abs, -3) == 3
+
+    asyncio.run(main())
+    assert pool.stats()["timed_out"] == 1
+    pool.shutdown()
+
+
+def test_shutdown_cancels_queued_calls():
+    pool = WorkerPool(max_workers=1, max_queue=1)
+    gate = threading.Event()
+
+    async def main():
+        running = asyncio.ensure_future(pool.run(gate.wait))
+        queued = asyncio.ensure_future(pool.run(abs, -1))
+        await asyncio.sleep(0.05)
+        pool.shutdown(wait=False)
+        gate.set()
+        assert await running is True
+        with pytest.raises(asyncio.CancelledError):
+            await queued
+
+    asyncio.run(main())
+    assert pool.stats()["in_flight"] == 0
+
+def test_process_pool():
+    pool = WorkerPool(kind="process", max_workers=1)
+    assert asyncio.run(pool.run(divmod, 7, 2)) == (3, 1)
+    pool.shutdown()
+
+
+def test_unknown_kind():
+    with pytest.raises(ValueError):
+        WorkerPool(kind="fiber")
+
+
+def _pipe_in_processes() -> list:
+    import warnings
+    from mood_detector import load_pipeline
+    from mood_detector.pipeline import pipe_results
+
+    nlp = load_pipeline("lite", lazy=False)
+    # spaCy warns (W127) when a worker process exits with an error
+    with warnings.catch_warnings():
+        warnings.simplefilter("error")
+        return [result["mood"] for result in pipe_results(nlp, ["so happy", "meh"], n_process=2)]
+
+
+@pytest.mark.skipif(not hasattr(os, "fork"), reason="needs fork")
+def test_pipe_processes_started_from_pool_threads_exit_cleanly():
+    # As nlp.pipe(n_process>1) does when an API request runs it in the pool
+    pool = WorkerPool(max_workers=1)
+    assert asyncio.run(pool.run(_pipe_in_processes)) == ["happy", "unbothered"]
+    pool.shutdown()